@@ -0,0 +1,46 @@
+import tkinter as Tkinter #for the frame around the table
+from tkinter import ttk #Treeview only draws the rows that are on screen
+
+ROSTER_REFRESH_MS = 250 #roster changes are coalesced and drawn at most this often
+
+#attendance table that redraws only the rows that changed
+class RosterView:
+    #initialization
+    def __init__(self, parent, height=10):
+        self.frame = Tkinter.Frame(parent)
+        self.tree = ttk.Treeview(self.frame, columns=("port", "id", "name"), show="headings", height=height)
+        for column, heading, width in (("port", "PORT", 80), ("id", "ID", 80), ("name", "NAME", 260)):
+            self.tree.heading(column, text=heading)
+            self.tree.column(column, width=width, anchor="w")
+        scrollbar = ttk.Scrollbar(self.frame, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        self.tree.pack(side="left", fill="both", expand=True)
+        scrollbar.pack(side="right", fill="y")
+        self.rows = {}  #{student_id: (port, name)} as currently drawn
+
+    #function that places the table in its parent
+    def pack(self, **options):
+        self.frame.pack(**options)
+
+    #function that brings the given rows in line with students ({student_id: (port, name)}); ids missing from students are removed
+    def update_rows(self, students, student_ids):
+        for student_id in student_ids:
+            row = students.get(student_id)
+            drawn = self.rows.get(student_id)
+            if row == drawn:
+                continue
+            if row is None:
+                self.tree.delete(student_id)
+                del self.rows[student_id]
+            elif drawn is None:
+                self.tree.insert("", "end", iid=student_id, values=(row[0], student_id, row[1]))
+                self.rows[student_id] = row
+            else:
+                self.tree.item(student_id, values=(row[0], student_id, row[1]))
+                self.rows[student_id] = row
+
+    #function that shows a full roster, touching only the rows that differ from what is drawn
+    def show(self, students):
+        changed = [student_id for student_id in self.rows if student_id not in students]
+        changed += [student_id for student_id, row in students.items() if self.rows.get(student_id) != row]
+        self.update_rows(students, changed)
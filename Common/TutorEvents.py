@@ -0,0 +1,40 @@
+import queue #hand-off from the server threads to the Tk main thread
+
+#events both tutor servers publish to their subscribers (the Tk GUI, the headless console, ...)
+#subscribers are called as callback(event, data) from whichever server thread changed the state
+EVENT_ATTENDANCE = "attendance" #data: {student_id: (student_name, port)} snapshot
+EVENT_SESSION_STARTED = "session_started" #data: None
+EVENT_TIMER = "timer" #data: (seconds remaining, paused), on start, pause, resume, extend and every resync
+EVENT_WARNING = "warning" #data: None, the 5-minute warning went out
+EVENT_SESSION_ENDED = "session_ended" #data: None
+
+#server events buffered for a thread that must not be called from the server threads (Tk is not thread-safe)
+class EventQueue:
+    #initialization, subscribes to the server at once
+    def __init__(self, server):
+        self.events = queue.Queue()
+        server.subscribe(self.put)
+
+    #function that queues one event (any server thread)
+    def put(self, event, data=None):
+        self.events.put((event, data))
+
+    #function that returns every queued (event, data), oldest first, without blocking (the consuming thread)
+    def drain(self):
+        events = []
+        while True:
+            try:
+                events.append(self.events.get_nowait())
+            except queue.Empty:
+                return events
+
+#function that prints server events on the console (the headless daemons' only console output)
+def print_event(event, data):
+    if event == EVENT_ATTENDANCE:
+        print(f"[{event}] {len(data)} student(s) checked in")
+    elif event == EVENT_TIMER:
+        remaining, paused = data
+        minutes, seconds = divmod(int(max(remaining, 0)), 60)
+        print(f"[{event}] {minutes:02}:{seconds:02} remaining{' (paused)' if paused else ''}")
+    else:
+        print(f"[{event}]")
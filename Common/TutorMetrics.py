@@ -0,0 +1,152 @@
+import json #the trace is served as JSON
+import threading #counters are bumped from every server thread, the endpoint reads them from its own
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer #loopback-only endpoint in the Prometheus text format
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0) #seconds
+JITTER_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0) #seconds
+
+COUNTER = "counter"
+GAUGE = "gauge"
+HISTOGRAM = "histogram"
+
+#cumulative histogram of observed values
+class Histogram:
+    #initialization
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    #function that records one value (caller holds the registry lock)
+    def observe(self, value):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        self.sum += value
+        self.count += 1
+
+    #function that returns the sample lines of one labelled histogram
+    def samples(self, name, labels):
+        lines = []
+        total = 0
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            lines.append(f"{name}_bucket{format_labels(labels + (('le', repr(float(bound))),))} {total}")
+        lines.append(f"{name}_bucket{format_labels(labels + (('le', '+Inf'),))} {self.count}")
+        lines.append(f"{name}_sum{format_labels(labels)} {self.sum}")
+        lines.append(f"{name}_count{format_labels(labels)} {self.count}")
+        return lines
+
+#function that formats a label tuple as {name="value",...}
+def format_labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{value}"' for key, value in labels) + "}"
+
+#registry of counters, histograms and gauges; gauges are read from callbacks when scraped so they cost nothing in between
+class Metrics:
+    #initialization
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.families = {}  #{name: [kind, help, buckets, {label tuple: value or Histogram}]}, in registration order
+        self.gauges = {}  #{name: callback returning a number or {label tuple: number}}
+
+    #function that declares a counter
+    def counter(self, name, help_text):
+        self.families[name] = [COUNTER, help_text, None, {}]
+
+    #function that declares a histogram
+    def histogram(self, name, help_text, buckets=LATENCY_BUCKETS):
+        self.families[name] = [HISTOGRAM, help_text, buckets, {}]
+
+    #function that declares a gauge read from callback() on every scrape
+    def gauge(self, name, help_text, callback):
+        self.families[name] = [GAUGE, help_text, None, {}]
+        self.gauges[name] = callback
+
+    #function that adds amount to a counter
+    def inc(self, name, amount=1, **labels):
+        key = tuple(sorted(labels.items()))
+        with self.lock:
+            values = self.families[name][3]
+            values[key] = values.get(key, 0) + amount
+
+    #function that records one value in a histogram
+    def observe(self, name, value, **labels):
+        key = tuple(sorted(labels.items()))
+        with self.lock:
+            kind, help_text, buckets, values = self.families[name]
+            histogram = values.get(key)
+            if histogram is None:
+                histogram = values[key] = Histogram(buckets)
+            histogram.observe(value)
+
+    #function that returns every metric in the Prometheus text exposition format
+    def render(self):
+        gauge_values = {}
+        for name, callback in self.gauges.items():
+            try:
+                value = callback()
+            except Exception as e:
+                print(f"Metrics gauge {name} failed: {e}")
+                continue
+            gauge_values[name] = value if isinstance(value, dict) else {(): value}
+
+        lines = []
+        with self.lock:
+            for name, (kind, help_text, buckets, values) in self.families.items():
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                if kind == GAUGE:
+                    values = gauge_values.get(name, {})
+                for labels, value in values.items():
+                    if kind == HISTOGRAM:
+                        lines.extend(value.samples(name, labels))
+                    else:
+                        lines.append(f"{name}{format_labels(labels)} {value}")
+        return "\n".join(lines) + "\n"
+
+#function that builds the request handler serving one registry (and the tracer's spans at /trace, if given)
+def metrics_handler(metrics, tracer=None):
+    class MetricsHandler(BaseHTTPRequestHandler):
+        #function that answers GET /metrics and GET /trace
+        def do_GET(self):
+            path = self.path.split("?")[0]
+            if path in ("/", "/metrics"):
+                body, content_type = metrics.render(), "text/plain; version=0.0.4; charset=utf-8"
+            elif path == "/trace" and tracer is not None:
+                body, content_type = json.dumps(tracer.chrome_trace()), "application/json"
+            else:
+                self.send_error(404)
+                return
+            body = body.encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        #function that keeps scrapes out of the console
+        def log_message(self, format, *args):
+            pass
+    return MetricsHandler
+
+#HTTP endpoint for a registry; binds to loopback only, so nothing is exposed beyond the machine
+class MetricsServer:
+    #initialization
+    def __init__(self, metrics, port, host="127.0.0.1", tracer=None):
+        self.httpd = ThreadingHTTPServer((host, port), metrics_handler(metrics, tracer))
+        self.httpd.daemon_threads = True
+
+    #function that serves scrapes from a background thread
+    def start(self):
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        host, port = self.httpd.server_address[:2]
+        print(f"Metrics on http://{host}:{port}/metrics")
+
+    #function that stops the endpoint
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
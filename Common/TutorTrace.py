@@ -0,0 +1,138 @@
+import cProfile #profiles the traced hot paths while profiling is switched on
+import io #collects the profile summary for the console
+import json #trace dumps are JSON (Chrome trace or plain span records)
+import os #for the pid in dump file names
+import pstats #merges the per-thread profiles into one report
+import signal #runtime toggles without restarting the session
+import threading #spans are recorded from every server thread
+import time #for span timestamps and dump file names
+from collections import deque #ring buffer of recent spans
+from contextlib import contextmanager #spans are used as with-blocks
+
+TRACE_CAPACITY = 8192 #spans kept; older ones are overwritten
+PROFILE_REPORT_LINES = 20 #functions printed when profiling stops
+
+#records timed spans of the hot paths into a ring buffer, and optionally runs cProfile inside them
+#cProfile only sees the thread that enabled it, so each thread enables its own profiler for the duration of a span
+#Python 3.12+ allows one active profiler per process (and it sees every thread); a span that cannot enable its own just runs unprofiled
+class Tracer:
+    #initialization
+    def __init__(self, capacity=TRACE_CAPACITY):
+        self.spans = deque(maxlen=capacity)  #(name, start ns, duration ns, thread id, args), appends are thread-safe
+        self.enabled = True
+        self.profiling = False
+        self.profile_generation = 0  #bumped on every start/stop so threads drop profilers of an earlier run
+        self.profilers = []  #profilers created by the threads during the current run
+        self.local = threading.local()
+        self.lock = threading.Lock()
+
+    #function that times the with-block as one span (and profiles it while profiling is on)
+    @contextmanager
+    def span(self, name, **args):
+        if not self.enabled:
+            yield
+            return
+        profiler = self.thread_profiler() if self.profiling else None
+        if profiler and not self.enable_profiler(profiler):
+            profiler = None
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            if profiler:
+                self.disable_profiler(profiler)
+            self.spans.append((name, start, time.perf_counter_ns() - start, threading.get_ident(), args))
+
+    #function that returns this thread's profiler for the current run, or None inside an already profiled span
+    def thread_profiler(self):
+        local = self.local
+        if getattr(local, "active", False):
+            return None
+        if getattr(local, "generation", None) != self.profile_generation:
+            with self.lock:
+                local.profiler = cProfile.Profile()
+                local.generation = self.profile_generation
+                self.profilers.append(local.profiler)
+        return local.profiler
+
+    #function that enables this thread's profiler for a span; False if it could not be (profiling must never break the traced code)
+    def enable_profiler(self, profiler):
+        try:
+            profiler.enable()
+        except Exception:
+            return False #another thread's profiler is active (Python 3.12+)
+        self.local.active = True
+        return True
+
+    #function that disables this thread's profiler at the end of a span
+    def disable_profiler(self, profiler):
+        self.local.active = False
+        try:
+            profiler.disable()
+        except Exception:
+            pass
+
+    #function that starts profiling the spans
+    def start_profiling(self):
+        with self.lock:
+            self.profile_generation += 1
+            self.profilers = []
+            self.profiling = True
+        print("Profiling started.")
+
+    #function that stops profiling, saves the merged stats (pstats format) and prints the top functions; returns the file or None
+    def stop_profiling(self, path=None):
+        with self.lock:
+            self.profiling = False
+            self.profile_generation += 1
+            profilers, self.profilers = self.profilers, []
+        profilers = [profiler for profiler in profilers if profiler.getstats()] #pstats refuses profilers that never ran
+        if not profilers:
+            print("Profiling stopped, no spans ran.")
+            return None
+        stats = pstats.Stats(*profilers)
+        path = path or f"profile_{os.getpid()}_{time.strftime('%Y%m%d-%H%M%S')}.prof"
+        stats.dump_stats(path)
+        report = io.StringIO()
+        stats.stream = report
+        stats.sort_stats("cumulative").print_stats(PROFILE_REPORT_LINES)
+        print(report.getvalue())
+        print(f"Profiling stopped, stats saved to {path}")
+        return path
+
+    #function that switches profiling on or off
+    def toggle_profiling(self):
+        if self.profiling:
+            self.stop_profiling()
+        else:
+            self.start_profiling()
+
+    #function that returns the buffered spans as plain records, oldest first
+    def records(self):
+        return [{"name": name, "start_ms": start / 1e6, "duration_ms": duration / 1e6, "thread": thread, "args": args}
+                for name, start, duration, thread, args in list(self.spans)]
+
+    #function that returns the buffered spans in the Chrome trace event format (chrome://tracing, Perfetto)
+    def chrome_trace(self):
+        pid = os.getpid()
+        events = [{"name": name, "ph": "X", "ts": start / 1000, "dur": duration / 1000, "pid": pid, "tid": thread, "args": args}
+                  for name, start, duration, thread, args in list(self.spans)]
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    #function that writes the buffered spans to a file, as a Chrome trace or as plain records; returns the file
+    def dump(self, path=None, chrome=True):
+        path = path or f"trace_{os.getpid()}_{time.strftime('%Y%m%d-%H%M%S')}.json"
+        with open(path, "w") as f:
+            json.dump(self.chrome_trace() if chrome else self.records(), f)
+        print(f"Trace of {len(self.spans)} spans saved to {path}")
+        return path
+
+#the process-wide tracer, shared by the server, the log writer and the window
+tracer = Tracer()
+
+#function that installs SIGUSR1 (profiling on/off) and SIGUSR2 (dump the trace); call from the main thread, no-op where the signals do not exist
+def install_trace_signals():
+    if not hasattr(signal, "SIGUSR1"):
+        return
+    signal.signal(signal.SIGUSR1, lambda signum, frame: tracer.toggle_profiling())
+    signal.signal(signal.SIGUSR2, lambda signum, frame: tracer.dump())
@@ -0,0 +1,88 @@
+import time #for refilling the rate-limit buckets
+from collections import deque #first come, first served waitlist
+
+#per-source token buckets: each address may open `rate` connections a second, with bursts of up to `burst`
+class ConnectionRateLimiter:
+    #initialization
+    def __init__(self, rate, burst=10, idle_timeout=60.0):
+        self.rate = rate
+        self.burst = burst
+        self.idle_timeout = idle_timeout #buckets untouched this long are forgotten
+        self.buckets = {}  # {host: (tokens, last refill)}
+        self.next_prune = time.monotonic() + idle_timeout
+
+    #function that takes one token for this source; False means the connection should be dropped
+    def allow(self, host):
+        now = time.monotonic()
+        tokens, last = self.buckets.get(host, (self.burst, now))
+        tokens = min(self.burst, tokens + (now - last) * self.rate)
+        allowed = tokens >= 1
+        self.buckets[host] = (tokens - 1 if allowed else tokens, now)
+        if now >= self.next_prune:
+            self.prune(now)
+        return allowed
+
+    #function that forgets sources that have been quiet, so a storm from many addresses does not grow the table forever
+    def prune(self, now):
+        self.buckets = {host: bucket for host, bucket in self.buckets.items() if now - bucket[1] < self.idle_timeout}
+        self.next_prune = now + self.idle_timeout
+
+#students waiting for a seat, admitted in arrival order (caller holds the server's lock)
+class Waitlist:
+    #initialization
+    def __init__(self, limit=0):
+        self.limit = limit #0 turns the waitlist off
+        self.entries = deque()  #(student_id, student_name, port, socket)
+        self.ids = set()  #student ids in entries, so contains() is one lookup on every check-in
+        self.sockets = {}  #{socket: student_id} in entries, so a disconnect only rebuilds the deque when the student was waiting
+
+    def __len__(self):
+        return len(self.entries)
+
+    #function that checks whether another student can wait
+    def has_room(self):
+        return len(self.entries) < self.limit
+
+    #function that adds a student; returns their position, or None if the waitlist is full
+    def add(self, student_id, student_name, port, client_socket):
+        if not self.has_room():
+            return None
+        self.push_back((student_id, student_name, port, client_socket))
+        return len(self.entries)
+
+    #function that checks whether a student id is already waiting
+    def contains(self, student_id):
+        return student_id in self.ids
+
+    #function that checks whether a student is waiting on this socket
+    def holds(self, client_socket):
+        return client_socket in self.sockets
+
+    #function that takes the next student to admit, or None
+    def pop(self):
+        if not self.entries:
+            return None
+        entry = self.entries.popleft()
+        self.ids.discard(entry[0])
+        self.sockets.pop(entry[3], None)
+        return entry
+
+    #function that appends an entry and indexes it
+    def push_back(self, entry):
+        self.entries.append(entry)
+        self.ids.add(entry[0])
+        self.sockets[entry[3]] = entry[0]
+
+    #function that puts a student back at the front when no seat was free after all
+    def push_front(self, entry):
+        self.entries.appendleft(entry)
+        self.ids.add(entry[0])
+        self.sockets[entry[3]] = entry[0]
+
+    #function that removes whoever is waiting on this socket (they disconnected)
+    def discard(self, client_socket):
+        student_id = self.sockets.pop(client_socket, None)
+        if student_id is None:
+            return
+        self.ids.discard(student_id)
+        self.entries = deque(entry for entry in self.entries if entry[3] is not client_socket)
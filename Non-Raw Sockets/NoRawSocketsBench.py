@@ -0,0 +1,277 @@
+import argparse #for choosing which benchmark to run
+import multiprocessing #runs the simulated students in their own process
+import os #for the core count and a scratch directory
+import selectors #drives every simulated student socket from one loop
+import socket #for connecting the simulated students
+import threading #runs the tutor server in the background
+import tempfile #scratch directory for the servers' logs and the cluster's database
+import time #for measuring latency and throughput
+from NoRawSocketsTut import TutorServer, run_cluster_worker
+from NoRawSocketsCluster import SharedRoster
+from NoRawSocketsProtocol import encode_frame, FrameDecoder, CHECK_IN, TEXT, ROUTED_PORT
+
+#function that returns the p-th percentile of a sorted list
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(len(sorted_values) * p / 100))
+    return sorted_values[index]
+
+#function that runs in a separate process: fills the seats, then every other client keeps sending check-ins (waitlisted or rejected round trips)
+#the servers are given a waitlist as big as the load, otherwise the load clients would be turned away at accept
+def drive_students(port, clients, rounds, results):
+    address = ('127.0.0.1', port)
+
+    #the seat holders check in first and then stay silent, so the load clients only ever get rejection replies
+    seats = []
+    for i in range(3):
+        s = socket.create_connection(address)
+        s.sendall(encode_frame(CHECK_IN, f"ID: {90000 + i}; Name: Seat Holder; Port: {7000 + i}"))
+        s.recv(1024)
+        seats.append(s)
+
+    selector = selectors.DefaultSelector()
+    sent_at = {}
+    remaining = {}
+    latencies = []
+    for i in range(clients):
+        s = socket.create_connection(address)
+        s.setblocking(False)
+        selector.register(s, selectors.EVENT_READ, (i, FrameDecoder()))
+        remaining[s] = rounds
+
+    start = time.perf_counter()
+    for s in remaining:
+        sent_at[s] = time.perf_counter()
+        s.sendall(encode_frame(CHECK_IN, f"ID: {10000 + selector.get_key(s).data[0]}; Name: Load Test; Port: 7100"))
+
+    pending = len(remaining)
+    while pending:
+        for key, _ in selector.select(timeout=10):
+            s, (i, decoder) = key.fileobj, key.data
+            data = s.recv(4096)
+            if not data:
+                selector.unregister(s)
+                pending -= 1
+                continue
+            if not decoder.feed(data):
+                continue #partial reply
+            latencies.append(time.perf_counter() - sent_at[s])
+            remaining[s] -= 1
+            if remaining[s] == 0:
+                selector.unregister(s)
+                pending -= 1
+                continue
+            sent_at[s] = time.perf_counter()
+            s.sendall(encode_frame(CHECK_IN, f"ID: {10000 + i}; Name: Load Test; Port: 7100"))
+    elapsed = time.perf_counter() - start
+
+    for s in list(remaining) + seats:
+        s.close()
+    latencies.sort()
+    results.put((elapsed, len(latencies), percentile(latencies, 50), percentile(latencies, 99)))
+
+#function that benchmarks one server mode and returns its numbers
+def bench_server_mode(event_loop, clients, rounds):
+    server = TutorServer(port=0, event_loop=event_loop, backlog=clients + 8, waitlist_limit=clients)
+    port = server.server_socket.getsockname()[1]
+    threading.Thread(target=server.start, daemon=True).start()
+
+    results = multiprocessing.Queue()
+    driver = multiprocessing.Process(target=drive_students, args=(port, clients, rounds, results))
+    cpu_start = time.process_time()
+    driver.start()
+
+    #samples the tutor's thread count while the students are connected
+    peak_threads = threading.active_count()
+    while driver.is_alive() and results.empty():
+        peak_threads = max(peak_threads, threading.active_count())
+        time.sleep(0.05)
+    elapsed, replies, p50, p99 = results.get()
+    driver.join()
+    cpu = time.process_time() - cpu_start
+
+    server.session_active = False
+    server.server_socket.close()
+    return {
+        "mode": "event-loop" if event_loop else "thread-per-client",
+        "replies/s": replies / elapsed,
+        "p50 ms": p50 * 1000,
+        "p99 ms": p99 * 1000,
+        "server cpu s": cpu,
+        "peak threads": peak_threads,
+    }
+
+#function that compares the thread-per-client server with the event-loop server
+def bench_event_loop(args):
+    rows = [bench_server_mode(False, args.clients, args.rounds), bench_server_mode(True, args.clients, args.rounds)]
+    print(f"{args.clients} students x {args.rounds} check-in round trips")
+    print(f"{'mode':<20} {'replies/s':>10} {'p50 ms':>8} {'p99 ms':>8} {'cpu s':>7} {'threads':>8}")
+    for row in rows:
+        print(f"{row['mode']:<20} {row['replies/s']:>10.0f} {row['p50 ms']:>8.2f} {row['p99 ms']:>8.2f} {row['server cpu s']:>7.2f} {row['peak threads']:>8}")
+
+#function that returns a free TCP port on localhost
+def free_port():
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+#function that benchmarks a cluster of worker processes sharing one port and returns its numbers
+def bench_cluster_size(workers, args):
+    port = free_port()
+    db_path = os.path.join(os.getcwd(), f"bench_cluster_{workers}.db")
+    SharedRoster(db_path).reset()
+    processes = [multiprocessing.Process(target=run_cluster_worker, args=(worker_id, workers, args.event_loop),
+                                         kwargs={"port": port, "db_path": db_path, "bus_port": args.bus_port, "admission": {"backlog": args.clients + 8, "waitlist_limit": args.clients}}, daemon=True)
+                 for worker_id in range(workers)]
+    for process in processes:
+        process.start()
+
+    #waits until the port accepts, then a little longer so every worker has bound it
+    while True:
+        try:
+            socket.create_connection(('127.0.0.1', port)).close()
+            break
+        except ConnectionRefusedError:
+            time.sleep(0.05)
+    time.sleep(0.3)
+
+    #several driver processes, so the simulated students are not the bottleneck
+    results = multiprocessing.Queue()
+    drivers = [multiprocessing.Process(target=drive_students, args=(port, args.clients // args.drivers, args.rounds, results)) for _ in range(args.drivers)]
+    for driver in drivers:
+        driver.start()
+    rows = [results.get() for _ in drivers]
+    for driver in drivers:
+        driver.join()
+    for process in processes:
+        process.terminate()
+        process.join()
+
+    elapsed = max(row[0] for row in rows)
+    return {
+        "workers": workers,
+        "replies/s": sum(row[1] for row in rows) / elapsed,
+        "p50 ms": max(row[2] for row in rows) * 1000,
+        "p99 ms": max(row[3] for row in rows) * 1000,
+    }
+
+#function that shows how check-in throughput scales with the number of worker processes
+def bench_cluster(args):
+    sizes = sorted({1, *(2 ** i for i in range(1, args.workers.bit_length())), args.workers})
+    print(f"{args.clients} students x {args.rounds} check-in round trips, {args.drivers} driver processes, {os.cpu_count()} cores")
+    print(f"{'workers':>8} {'replies/s':>10} {'speedup':>8} {'p50 ms':>8} {'p99 ms':>8}")
+    baseline = None
+    for workers in sizes:
+        row = bench_cluster_size(workers, args)
+        baseline = baseline or row["replies/s"]
+        print(f"{row['workers']:>8} {row['replies/s']:>10.0f} {row['replies/s'] / baseline:>7.2f}x {row['p50 ms']:>8.2f} {row['p99 ms']:>8.2f}")
+
+#function that runs in a separate process: checks every student in, waits for the check-in traffic to end, then times the broadcasts
+def receive_broadcasts(port, clients, expected_bytes, ready, results):
+    sockets = []
+    for i in range(clients):
+        s = socket.create_connection(('127.0.0.1', port))
+        s.sendall(encode_frame(CHECK_IN, f"ID: {20000 + i}; Name: Fan Out; Port: {ROUTED_PORT}"))
+        sockets.append(s)
+    selector = selectors.DefaultSelector()
+    for s in sockets:
+        s.setblocking(False)
+        selector.register(s, selectors.EVENT_READ)
+
+    #acks, snapshots and roster deltas are discarded until the sockets have been quiet for half a second
+    while True:
+        events = selector.select(timeout=0.5)
+        if not events:
+            break
+        for key, _ in events:
+            key.fileobj.recv(1 << 16)
+    ready.put(True)
+
+    #only bytes are counted, so decoding does not slow the receiving side down
+    remaining = {s: expected_bytes for s in sockets}
+    while remaining:
+        events = selector.select(timeout=10)
+        if not events:
+            break #the server stopped sending
+        for key, _ in events:
+            s = key.fileobj
+            remaining[s] -= len(s.recv(1 << 16))
+            if remaining[s] <= 0:
+                selector.unregister(s)
+                del remaining[s]
+    results.put((time.monotonic(), len(remaining)))
+    for s in sockets:
+        s.close()
+
+#function that measures broadcast fan-out for one server mode and send path and returns its numbers
+def bench_fanout_mode(event_loop, vectored, args):
+    server = TutorServer(port=0, event_loop=event_loop, student_limit=args.clients, backlog=args.clients + 8,
+                         max_queued_frames=args.rounds + 64, slow_consumer_timeout=60, vectored_send=vectored)
+    server.timer_resync_interval = 3600 #no deadline resyncs in the middle of the measurement
+    port = server.server_socket.getsockname()[1]
+    threading.Thread(target=server.start, daemon=True).start()
+
+    frame = encode_frame(TEXT, "x" * args.payload) #encoded once, the same bytes go to every student
+    ready, results = multiprocessing.Queue(), multiprocessing.Queue()
+    driver = multiprocessing.Process(target=receive_broadcasts, args=(port, args.clients, len(frame) * args.rounds, ready, results))
+    driver.start()
+    ready.get()
+
+    cpu_start = time.process_time()
+    start = time.monotonic()
+    for _ in range(args.rounds):
+        server.broadcast_frame(frame, TEXT)
+    end, incomplete = results.get()
+    cpu = time.process_time() - cpu_start
+    driver.join()
+    server.session_active = False
+    server.server_socket.close()
+
+    elapsed = end - start
+    frames = args.clients * args.rounds
+    return {
+        "mode": f"{'event-loop' if event_loop else 'thread-per-client'}, {'sendmsg' if vectored else 'send'}",
+        "frames/s": frames / elapsed,
+        "MB/s": frames * len(frame) / elapsed / 1e6,
+        "server cpu s": cpu,
+        "incomplete": incomplete,
+    }
+
+#function that compares one-frame-per-send with vectored sendmsg for broadcasts in both server modes
+def bench_fanout(args):
+    print(f"{args.clients} students x {args.rounds} broadcasts of {args.payload} bytes")
+    print(f"{'mode':<30} {'frames/s':>10} {'MB/s':>8} {'cpu s':>7} {'incomplete':>11}")
+    for event_loop in (False, True):
+        for vectored in (False, True):
+            row = bench_fanout_mode(event_loop, vectored, args)
+            print(f"{row['mode']:<30} {row['frames/s']:>10.0f} {row['MB/s']:>8.1f} {row['server cpu s']:>7.2f} {row['incomplete']:>11}")
+
+#main function
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Tutor server benchmarks")
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+
+    event_loop_parser = subparsers.add_parser("eventloop", help="thread-per-client vs event-loop server")
+    event_loop_parser.add_argument("--clients", type=int, default=300)
+    event_loop_parser.add_argument("--rounds", type=int, default=20)
+    event_loop_parser.set_defaults(func=bench_event_loop)
+
+    cluster_parser = subparsers.add_parser("cluster", help="check-in throughput with 1..N SO_REUSEPORT worker processes")
+    cluster_parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    cluster_parser.add_argument("--drivers", type=int, default=os.cpu_count() or 1)
+    cluster_parser.add_argument("--clients", type=int, default=300)
+    cluster_parser.add_argument("--rounds", type=int, default=20)
+    cluster_parser.add_argument("--event-loop", action="store_true", help="run each worker as an event loop")
+    cluster_parser.add_argument("--bus-port", type=int, default=5300)
+    cluster_parser.set_defaults(func=bench_cluster)
+
+    fanout_parser = subparsers.add_parser("fanout", help="broadcast fan-out throughput, one send per frame vs vectored sendmsg")
+    fanout_parser.add_argument("--clients", type=int, default=200)
+    fanout_parser.add_argument("--rounds", type=int, default=200)
+    fanout_parser.add_argument("--payload", type=int, default=64, help="bytes of text per broadcast")
+    fanout_parser.set_defaults(func=bench_fanout)
+
+    args = parser.parse_args()
+    os.chdir(tempfile.mkdtemp(prefix="tutor_bench_")) #the servers' attendance logs and the cluster database go here, not into the source tree
+    args.func(args)
@@ -0,0 +1,175 @@
+import socket #UDP bus between the worker processes
+import sqlite3 #roster and session state shared by the worker processes
+import threading #one database connection per thread
+import time #for join timestamps
+from NoRawSocketsProtocol import FrameDecoder, DUPLICATE_ID, DUPLICATE_PORT, SESSION_FULL, ROUTED_PORT #bus datagrams carry ordinary frames
+
+CLUSTER_DB_FILE = "tutor_cluster.db"
+BUS_BASE_PORT = 5100 #worker n listens for the other workers' broadcasts on BUS_BASE_PORT + n
+MAX_BUS_DATAGRAM = 65000 #a broadcast must fit in one UDP datagram
+
+#bus-only message types, never sent to students
+BUS_SESSION_START = 100 #asks the primary worker to start the session timer
+BUS_SESSION_END = 101 #tells the other workers the session is over
+BUS_CHAT = 102 #relayed chat "sender_id|recipient|text" for the workers holding the recipient or room members
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS roster (
+    student_id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    port TEXT NOT NULL,
+    worker INTEGER NOT NULL,
+    joined_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS cluster_state (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    roster_version INTEGER NOT NULL,
+    session_active INTEGER NOT NULL
+);
+"""
+
+#SQLite (WAL mode) roster shared by every worker process; check-ins take the write lock so the limit and unique id hold across workers
+class SharedRoster:
+    #initialization
+    def __init__(self, path=CLUSTER_DB_FILE, busy_timeout=5.0):
+        self.path = path
+        self.busy_timeout = busy_timeout
+        self.local = threading.local()
+        conn = self.connection()
+        conn.execute("PRAGMA journal_mode=WAL") #readers never block the writer and vice versa
+        conn.executescript(SCHEMA)
+
+    #function that returns this thread's connection (sqlite connections are not shared between threads)
+    def connection(self):
+        conn = getattr(self.local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=self.busy_timeout, isolation_level=None)
+            conn.execute("PRAGMA synchronous=OFF") #live state only, rebuilt on every start, so no fsyncs
+            self.local.conn = conn
+        return conn
+
+    #function that empties the roster and resets the version (called once before the workers start)
+    def reset(self):
+        conn = self.connection()
+        conn.execute("BEGIN IMMEDIATE")
+        conn.execute("DELETE FROM roster")
+        conn.execute("INSERT OR REPLACE INTO cluster_state (id, roster_version, session_active) VALUES (1, 0, 0)")
+        conn.execute("COMMIT")
+
+    #function that returns why a check-in would be refused, or None
+    def check_in_error(self, conn, student_id, port, limit):
+        taken, port_taken, count = conn.execute("SELECT (SELECT COUNT(*) FROM roster WHERE student_id = ?), (SELECT COUNT(*) FROM roster WHERE port = ? AND port != ?), (SELECT COUNT(*) FROM roster)",
+                                                (student_id, port, ROUTED_PORT)).fetchone()
+        if taken:
+            return DUPLICATE_ID
+        if port_taken:
+            return DUPLICATE_PORT
+        if count >= limit:
+            return SESSION_FULL
+        return None
+
+    #function that checks a student in; returns (error, roster version, students checked in)
+    def check_in(self, student_id, name, port, worker, limit):
+        conn = self.connection()
+
+        #refusals are decided on a plain read, so a full session does not queue every worker on the write lock
+        error = self.check_in_error(conn, student_id, port, limit)
+        if error:
+            return error, None, None
+
+        conn.execute("BEGIN IMMEDIATE") #takes the write lock before checking again, so two workers cannot both take the last seat
+        try:
+            error = self.check_in_error(conn, student_id, port, limit)
+            if error:
+                conn.execute("ROLLBACK")
+                return error, None, None
+            conn.execute("INSERT INTO roster (student_id, name, port, worker, joined_at) VALUES (?, ?, ?, ?, ?)",
+                         (student_id, name, port, worker, time.time()))
+            conn.execute("UPDATE cluster_state SET roster_version = roster_version + 1 WHERE id = 1")
+            version = conn.execute("SELECT roster_version FROM cluster_state WHERE id = 1").fetchone()[0]
+            count = conn.execute("SELECT COUNT(*) FROM roster").fetchone()[0]
+            conn.execute("COMMIT")
+            return None, version, count
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    #function that removes a student; returns the new roster version
+    def remove(self, student_id):
+        conn = self.connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("DELETE FROM roster WHERE student_id = ?", (student_id,))
+            conn.execute("UPDATE cluster_state SET roster_version = roster_version + 1 WHERE id = 1")
+            version = conn.execute("SELECT roster_version FROM cluster_state WHERE id = 1").fetchone()[0]
+            conn.execute("COMMIT")
+            return version
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    #function that returns (roster version, [(student_id, name, port)]) read from one consistent snapshot
+    def snapshot(self):
+        conn = self.connection()
+        conn.execute("BEGIN")
+        try:
+            version = conn.execute("SELECT roster_version FROM cluster_state WHERE id = 1").fetchone()[0]
+            students = conn.execute("SELECT student_id, name, port FROM roster ORDER BY joined_at").fetchall()
+        finally:
+            conn.execute("COMMIT")
+        return version, students
+
+    #function that marks the session as started; only the first worker to call it gets True
+    def claim_session(self):
+        return self.connection().execute("UPDATE cluster_state SET session_active = 1 WHERE id = 1 AND session_active = 0").rowcount == 1
+
+    #function that marks the session as over so the next first check-in starts a new one
+    def end_session(self):
+        self.connection().execute("UPDATE cluster_state SET session_active = 0 WHERE id = 1")
+
+#UDP datagrams on localhost that carry each worker's broadcasts to every other worker
+class ClusterBus:
+    #initialization
+    def __init__(self, worker_id, workers, base_port=BUS_BASE_PORT, host='127.0.0.1'):
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1024 * 1024) #room for a burst of check-ins
+        self.sock.bind((host, base_port + worker_id))
+        self.peers = [(host, base_port + peer) for peer in range(workers) if peer != worker_id]
+
+    #function that sends one encoded frame to every other worker
+    def publish(self, frame):
+        if len(frame) > MAX_BUS_DATAGRAM:
+            print(f"Broadcast of {len(frame)} bytes is too large for the cluster bus, other workers will not see it.")
+            return
+        for peer in self.peers:
+            try:
+                self.sock.sendto(frame, peer)
+            except OSError as e:
+                print(f"Cluster bus error sending to {peer}: {e}")
+
+    #function that hands every frame published by the other workers to handler(msg_type, payload) until the bus closes
+    def listen(self, handler):
+        while True:
+            try:
+                data, _ = self.sock.recvfrom(MAX_BUS_DATAGRAM + 64)
+            except OSError:
+                break
+            try:
+                for msg_type, payload in FrameDecoder().feed(data):
+                    handler(msg_type, payload)
+            except Exception as e:
+                print(f"Error applying cluster broadcast: {e}")
+
+    #function that closes the bus socket
+    def close(self):
+        self.sock.close()
+
+#one worker's view of the cluster: the shared roster, the bus and whether it is the primary (the one that runs the session timer and GUI)
+class ClusterMember:
+    #initialization
+    def __init__(self, worker_id, workers, db_path=CLUSTER_DB_FILE, bus_port=BUS_BASE_PORT):
+        self.worker_id = worker_id
+        self.workers = workers
+        self.primary = worker_id == 0
+        self.roster = SharedRoster(db_path)
+        self.bus = ClusterBus(worker_id, workers, bus_port)
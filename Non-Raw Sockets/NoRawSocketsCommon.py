@@ -0,0 +1,7 @@
+import os #for the path of the shared directory
+import sys #puts it on the import path
+
+#modules both variants share live in ../Common; importing this module makes them importable from this directory
+COMMON_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Common")
+if COMMON_DIR not in sys.path:
+    sys.path.append(COMMON_DIR)
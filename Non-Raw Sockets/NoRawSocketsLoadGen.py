@@ -0,0 +1,391 @@
+import argparse #for the load profile
+import multiprocessing #for spawning the tutor and splitting the students over several processes
+import os #for the tutor's /proc entries
+import queue #results from the generator processes
+import random #picks chat partners
+import selectors #drives every simulated student from one loop
+import socket #for the simulated students' connections
+import sys #silences the spawned tutor's console output
+import tempfile #scratch directory for the spawned tutor's attendance log
+import time #for rates and latencies
+from NoRawSocketsProtocol import encode_frame, FrameDecoder, CHECK_IN, ACK, ERROR, EXIT, TEXT, WAITLISTED, ROSTER_ADD, SESSION_DEADLINE
+from NoRawSocketsPeers import PeerConnectionPool #chat goes over cached peer connections like real students
+
+try:
+    import resource #raises the open file limit for thousands of sockets (not on Windows)
+except ImportError:
+    resource = None
+
+#function that returns the p-th percentile of a sorted list
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(len(sorted_values) * p / 100))
+    return sorted_values[index]
+
+#function that raises the soft open file limit as far as the hard limit allows
+def raise_file_limit():
+    if resource is None:
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if hard == resource.RLIM_INFINITY or soft < hard:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+#samples a process's CPU time and resident memory from /proc (Linux only)
+class ProcessMonitor:
+    #initialization
+    def __init__(self, pid):
+        self.pid = pid
+        self.ticks = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else None #None where there is no /proc to read either
+        self.start_cpu = self.cpu_seconds()
+        self.start_time = time.perf_counter()
+        self.peak_rss = 0
+
+    #function that returns user + system CPU seconds, or None if the process cannot be read
+    def cpu_seconds(self):
+        if self.ticks is None:
+            return None
+        try:
+            with open(f"/proc/{self.pid}/stat") as f:
+                fields = f.read().rsplit(")", 1)[1].split()
+            return (int(fields[11]) + int(fields[12])) / self.ticks
+        except (OSError, IndexError, ValueError):
+            return None
+
+    #function that records the current resident memory
+    def sample(self):
+        try:
+            with open(f"/proc/{self.pid}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        self.peak_rss = max(self.peak_rss, int(line.split()[1]) * 1024)
+                        break
+        except OSError:
+            pass
+
+    #function that returns (CPU seconds used, average CPU %, peak RSS in MB) since the monitor started
+    def report(self):
+        end_cpu = self.cpu_seconds()
+        if end_cpu is None or self.start_cpu is None:
+            return None
+        used = end_cpu - self.start_cpu
+        elapsed = time.perf_counter() - self.start_time
+        return used, 100 * used / elapsed if elapsed else 0.0, self.peak_rss / (1024 * 1024)
+
+#one simulated student: a connection to the tutor plus a peer listener for chat
+class SimulatedStudent:
+    #initialization
+    def __init__(self, student_id, observer):
+        self.student_id = student_id
+        self.observer = observer #observers record roster fan-out latency (every student doing it would be n^2 samples)
+        self.sock = None
+        self.listener = None
+        self.listen_port = None
+        self.peers = {}  #{accepted peer socket: FrameDecoder}
+        self.decoder = FrameDecoder()
+        self.check_in_sent = None
+        self.state = "new" #new -> pending -> waitlisted/checked-in/refused -> exited
+
+#opens simulated students against a running tutor and scripts check-in, chat and exit
+class LoadGenerator:
+    #initialization
+    def __init__(self, host, port, students, checkin_rate, chat_rate, hold, exit_rate, id_base=10000, observers=50):
+        self.address = (host, port)
+        self.students = [SimulatedStudent(str(id_base + i), i < observers) for i in range(students)]
+        self.by_id = {student.student_id: student for student in self.students}
+        self.checkin_rate = checkin_rate
+        self.chat_rate = chat_rate
+        self.hold = hold #seconds of chat between the last check-in reply and the first exit
+        self.exit_rate = exit_rate
+        self.selector = selectors.DefaultSelector()
+
+        #results
+        self.checkin_latencies = []
+        self.fanout_latencies = []
+        self.chat_latencies = []
+        self.deadlines = [] #implied session end (local clock) from every SESSION_DEADLINE received
+        self.counts = {"acked": 0, "waitlisted": 0, "refused": 0, "connect errors": 0, "disconnected": 0, "chats sent": 0, "chat errors": 0}
+        self.peer_pool = PeerConnectionPool(max_connections=64, on_result=self.peer_send_result)
+
+    #function that connects one student and sends their check-in
+    def check_in(self, student):
+        try:
+            student.listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            student.listener.bind(('127.0.0.1', 0))
+            student.listener.listen(16)
+            student.listener.setblocking(False)
+            student.listen_port = student.listener.getsockname()[1]
+            self.selector.register(student.listener, selectors.EVENT_READ, ("listener", student))
+
+            student.sock = socket.create_connection(self.address)
+            student.sock.setblocking(False)
+            self.selector.register(student.sock, selectors.EVENT_READ, ("server", student))
+            student.check_in_sent = time.perf_counter()
+            student.sock.sendall(encode_frame(CHECK_IN, f"ID: {student.student_id}; Name: Load Student; Port: {student.listen_port}"))
+            student.state = "pending"
+        except OSError:
+            self.counts["connect errors"] += 1
+            student.state = "refused"
+
+    #function that sends one peer chat message between two checked-in students, stamped with the send time
+    def chat(self, checked_in):
+        if len(checked_in) < 2:
+            return
+        sender, receiver = random.sample(checked_in, 2)
+        self.peer_pool.send(('127.0.0.1', receiver.listen_port), f"{time.perf_counter():.9f}|chat from {sender.student_id}")
+
+    #function that counts how each queued chat message went (peer sending thread)
+    def peer_send_result(self, address, error):
+        self.counts["chat errors" if error else "chats sent"] += 1
+
+    #function that sends a student's exit and closes their sockets
+    def exit(self, student):
+        for sock in [student.sock, student.listener] + list(student.peers):
+            if sock is None:
+                continue
+            try:
+                self.selector.unregister(sock)
+            except (KeyError, ValueError):
+                pass
+            try:
+                if sock is student.sock and student.state == "checked-in":
+                    sock.setblocking(True)
+                    sock.sendall(encode_frame(EXIT, student.student_id))
+                sock.close()
+            except OSError:
+                pass
+        student.peers.clear()
+        student.state = "exited"
+
+    #function that handles one readable socket
+    def handle(self, kind, student, sock):
+        now = time.perf_counter()
+        if kind == "listener":
+            try:
+                conn, _ = sock.accept()
+            except BlockingIOError:
+                return
+            conn.setblocking(False)
+            student.peers[conn] = FrameDecoder()
+            self.selector.register(conn, selectors.EVENT_READ, ("peer", student))
+            return
+
+        try:
+            data = sock.recv(65536)
+        except BlockingIOError:
+            return
+        except OSError:
+            data = b""
+
+        if kind == "peer":
+            frames = []
+            if data:
+                try:
+                    frames = student.peers[sock].feed(data)
+                except ValueError:
+                    data = b""
+            for msg_type, payload in frames:
+                if msg_type == TEXT:
+                    try:
+                        self.chat_latencies.append(now - float(payload.split("|", 1)[0]))
+                    except ValueError:
+                        pass
+            if not data:
+                self.selector.unregister(sock)
+                sock.close()
+                student.peers.pop(sock, None)
+            return
+
+        if not data:
+            self.selector.unregister(sock)
+            sock.close()
+            student.sock = None
+            if student.state in ("pending", "waitlisted", "checked-in"):
+                self.counts["disconnected"] += 1
+            student.state = "refused" if student.state == "pending" else "exited"
+            return
+
+        for msg_type, payload in student.decoder.feed(data):
+            if msg_type == ACK:
+                self.checkin_latencies.append(now - student.check_in_sent)
+                self.counts["acked"] += 1
+                student.state = "checked-in"
+            elif msg_type == WAITLISTED:
+                self.counts["waitlisted"] += 1
+                student.state = "waitlisted"
+            elif msg_type == ERROR:
+                self.counts["refused"] += 1
+                student.state = "refused"
+            elif msg_type == ROSTER_ADD and student.observer:
+                #time from the new student's CHECK_IN to this student hearing about it
+                new_id = payload.partition("|")[2].split("-", 2)[1:2]
+                joined = self.by_id.get(new_id[0]) if new_id else None
+                if joined is not None and joined is not student and joined.check_in_sent:
+                    self.fanout_latencies.append(now - joined.check_in_sent)
+            elif msg_type == SESSION_DEADLINE:
+                remaining, _, state = payload.partition("|")
+                if state == "running":
+                    self.deadlines.append(now + float(remaining))
+
+    #function that runs the whole scenario and returns the results
+    def run(self):
+        start = time.perf_counter()
+        issued = 0
+        hold_until = None
+        exit_start = None
+        exited = 0
+        next_chat = None
+        while True:
+            now = time.perf_counter()
+
+            #check-ins at the configured rate
+            while issued < len(self.students) and now >= start + issued / self.checkin_rate:
+                self.check_in(self.students[issued])
+                issued += 1
+
+            #the hold starts once every check-in has been answered (waitlisted students keep waiting)
+            if hold_until is None and issued == len(self.students) and not any(s.state == "pending" for s in self.students):
+                hold_until = now + self.hold
+                next_chat = now
+
+            #chat during the hold
+            if hold_until is not None and now < hold_until and self.chat_rate > 0:
+                checked_in = [s for s in self.students if s.state == "checked-in"]
+                while now >= next_chat:
+                    self.chat(checked_in)
+                    next_chat += 1 / self.chat_rate
+
+            #exits at the configured rate after the hold
+            if hold_until is not None and now >= hold_until:
+                if exit_start is None:
+                    exit_start = now
+                while exited < len(self.students) and now >= exit_start + exited / self.exit_rate:
+                    self.exit(self.students[exited])
+                    exited += 1
+                if exited == len(self.students):
+                    break
+
+            for key, _ in self.selector.select(timeout=0.01):
+                kind, student = key.data
+                self.handle(kind, student, key.fileobj)
+
+        self.peer_pool.close(timeout=2.0) #lets the last chat messages and their counts finish
+        self.selector.close()
+        return {
+            "elapsed": time.perf_counter() - start,
+            "checkin": self.checkin_latencies,
+            "fanout": self.fanout_latencies,
+            "chat": self.chat_latencies,
+            "deadlines": self.deadlines,
+            "counts": self.counts,
+        }
+
+#function that runs one generator process and hands its results back
+def run_generator(options, id_base, students, results):
+    raise_file_limit()
+    generator = LoadGenerator(options["host"], options["port"], students, options["checkin_rate"], options["chat_rate"], options["hold"], options["exit_rate"],
+                              id_base=id_base, observers=options["observers"])
+    results.put(generator.run())
+
+#function that runs a headless tutor for --spawn (imported here so the generator processes never load the server)
+def run_tutor(port, event_loop, capacity, backlog, waitlist, timer_resync):
+    from NoRawSocketsTut import TutorServer
+    raise_file_limit()
+    os.chdir(tempfile.mkdtemp(prefix="tutor_loadgen_")) #keeps the attendance log out of the source tree
+    sys.stdout = open(os.devnull, "w") #the tutor still formats its per-student prints, they just do not flood the report
+    server = TutorServer(port=port, event_loop=event_loop, student_limit=capacity, backlog=backlog, waitlist_limit=waitlist)
+    server.timer_resync_interval = timer_resync
+    server.start()
+
+#function that prints the merged results
+def print_report(results, monitor):
+    counts = {}
+    for result in results:
+        for key, value in result["counts"].items():
+            counts[key] = counts.get(key, 0) + value
+    print("  ".join(f"{key}: {value}" for key, value in counts.items()))
+    elapsed = max(result["elapsed"] for result in results)
+    print(f"scenario took {elapsed:.1f} s")
+
+    print(f"{'latency (ms)':<22} {'count':>8} {'p50':>9} {'p90':>9} {'p99':>9} {'max':>9}")
+    for label, key in (("check-in", "checkin"), ("roster fan-out", "fanout"), ("peer chat", "chat")):
+        values = sorted(v for result in results for v in result[key])
+        if values:
+            print(f"{label:<22} {len(values):>8} {percentile(values, 50) * 1000:>9.2f} {percentile(values, 90) * 1000:>9.2f} "
+                  f"{percentile(values, 99) * 1000:>9.2f} {values[-1] * 1000:>9.2f}")
+
+    #every deadline message should imply the same session end; the spread is the timer jitter students see
+    deadlines = sorted(v for result in results for v in result["deadlines"])
+    if deadlines:
+        median = percentile(deadlines, 50)
+        deviations = sorted(abs(v - median) for v in deadlines)
+        print(f"{'timer jitter':<22} {len(deviations):>8} {percentile(deviations, 50) * 1000:>9.2f} {percentile(deviations, 90) * 1000:>9.2f} "
+              f"{percentile(deviations, 99) * 1000:>9.2f} {deviations[-1] * 1000:>9.2f}")
+
+    if monitor:
+        report = monitor.report()
+        if report:
+            print(f"tutor pid {monitor.pid}: {report[0]:.2f} CPU s ({report[1]:.0f}% of one core), peak RSS {report[2]:.1f} MB")
+        else:
+            print(f"tutor pid {monitor.pid}: CPU and memory not readable (needs Linux /proc)")
+
+#main function
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Headless load generator for the non-raw tutor server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5000)
+    parser.add_argument("--students", type=int, default=1000)
+    parser.add_argument("--checkin-rate", type=float, default=200, help="check-ins per second (per generator process)")
+    parser.add_argument("--chat-rate", type=float, default=50, help="peer chat messages per second during the hold (per generator process)")
+    parser.add_argument("--hold", type=float, default=10, help="seconds between the last check-in reply and the first exit")
+    parser.add_argument("--exit-rate", type=float, default=200, help="exits per second (per generator process)")
+    parser.add_argument("--processes", type=int, default=1, help="generator processes, each with students/processes students")
+    parser.add_argument("--observers", type=int, default=50, help="students per process that record roster fan-out latency")
+    parser.add_argument("--id-base", type=int, default=10000, help="first student id")
+    parser.add_argument("--server-pid", type=int, help="sample this tutor process's CPU and memory")
+    parser.add_argument("--spawn", action="store_true", help="start a headless tutor on --port first and monitor it")
+    parser.add_argument("--event-loop", action="store_true", help="with --spawn: run the tutor as an event loop")
+    parser.add_argument("--capacity", type=int, default=None, help="with --spawn: seats (defaults to --students)")
+    parser.add_argument("--waitlist", type=int, default=0, help="with --spawn: waitlist size")
+    parser.add_argument("--timer-resync", type=float, default=60, help="with --spawn: seconds between deadline broadcasts")
+    args = parser.parse_args()
+
+    tutor = None
+    if args.spawn:
+        capacity = args.capacity or args.students
+        tutor = multiprocessing.Process(target=run_tutor, args=(args.port, args.event_loop, capacity, min(capacity, 4096), args.waitlist, args.timer_resync), daemon=True)
+        tutor.start()
+        while True:
+            try:
+                socket.create_connection((args.host, args.port)).close()
+                break
+            except ConnectionRefusedError:
+                time.sleep(0.05)
+        time.sleep(0.2) #lets the tutor drop the probe connection
+    pid = tutor.pid if tutor else args.server_pid
+    monitor = ProcessMonitor(pid) if pid else None
+
+    options = {"host": args.host, "port": args.port, "checkin_rate": args.checkin_rate, "chat_rate": args.chat_rate,
+               "hold": args.hold, "exit_rate": args.exit_rate, "observers": args.observers}
+    result_queue = multiprocessing.Queue()
+    per_process = args.students // args.processes
+    generators = [multiprocessing.Process(target=run_generator, args=(options, args.id_base + i * per_process, per_process, result_queue)) for i in range(args.processes)]
+    for generator in generators:
+        generator.start()
+
+    #samples the tutor while the generators run
+    results = []
+    while len(results) < len(generators):
+        if monitor:
+            monitor.sample()
+        try:
+            results.append(result_queue.get(timeout=0.25))
+        except queue.Empty:
+            pass
+    for generator in generators:
+        generator.join()
+
+    print(f"{per_process * args.processes} simulated students in {args.processes} process(es) against {args.host}:{args.port}")
+    print_report(results, monitor)
+    if tutor:
+        tutor.terminate()
@@ -0,0 +1,124 @@
+import atexit #flushes whatever is still queued when the tutor exits
+import os #for fsync, rotation and file sizes
+import queue #hand-off from the server threads to the writer thread
+import threading #runs the writer in the background
+import time #for the flush interval and time-based rotation
+from datetime import datetime #for timestamps for attendance files
+import NoRawSocketsCommon #puts ../Common (modules shared with the raw variant) on the import path
+from TutorTrace import tracer #times the disk writes
+
+#fsync policies
+FSYNC_NEVER = "never" #leave it to the OS
+FSYNC_BATCH = "batch" #one fsync per written batch
+FSYNC_ALWAYS = "always" #fsync after every batch and on every flush() call (same as batch, plus explicit flushes)
+
+#asynchronous attendance log: callers only enqueue a line, one writer thread batches the disk writes
+class AttendanceLogWriter:
+    #initialization
+    def __init__(self, path, batch_size=256, flush_interval=0.5, fsync=FSYNC_BATCH, max_bytes=10 * 1024 * 1024, rotate_interval=None, backups=5):
+        self.path = path
+        self.batch_size = batch_size #most lines written per batch
+        self.flush_interval = flush_interval #longest a line waits before it is written
+        self.fsync = fsync
+        self.max_bytes = max_bytes #rotates once the file reaches this size (None turns it off)
+        self.rotate_interval = rotate_interval #rotates after this many seconds (None turns it off)
+        self.backups = backups #keeps path.1 .. path.N
+        self.queue = queue.Queue()
+        self.file = None
+        self.opened_at = None
+        self.closed = False
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+        atexit.register(self.close)
+
+    #function that queues one log line; the timestamp is taken now, not when it reaches the disk
+    def log(self, message):
+        timestamp = datetime.now().strftime("%d-%m-%Y %H:%M:%S")
+        self.queue.put(f"{timestamp} - {message}\n")
+
+    #function that blocks until every line queued before the call is on disk
+    def flush(self, timeout=None):
+        done = threading.Event()
+        self.queue.put(done)
+        return done.wait(timeout)
+
+    #function that flushes and stops the writer thread
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        self.queue.put(None)
+        self.thread.join()
+
+    #writer thread: waits for a line, then takes everything else already queued (up to batch_size) and writes it in one go
+    def run(self):
+        while True:
+            try:
+                item = self.queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+            batch, waiters, stop = [], [], False
+            while True:
+                if item is None:
+                    stop = True
+                elif isinstance(item, threading.Event):
+                    waiters.append(item)
+                else:
+                    batch.append(item)
+                if stop or len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+
+            if batch:
+                self.write_batch(batch)
+            if waiters and self.file and self.fsync == FSYNC_ALWAYS:
+                os.fsync(self.file.fileno())
+            for waiter in waiters:
+                waiter.set()
+            if stop:
+                if self.file:
+                    self.file.close()
+                    self.file = None
+                return
+
+    #function that appends one batch, rotating first if the file is too big or too old
+    def write_batch(self, batch):
+        with tracer.span("log_write", lines=len(batch)):
+            try:
+                if self.file is None:
+                    self.open_file()
+                elif self.should_rotate():
+                    self.rotate()
+                self.file.write("".join(batch))
+                self.file.flush()
+                if self.fsync != FSYNC_NEVER:
+                    os.fsync(self.file.fileno())
+            except OSError as e:
+                print(f"Failed to write attendance log: {e}")
+
+    #function that opens (or reopens) the log file for appending
+    def open_file(self):
+        self.file = open(self.path, "a")
+        self.opened_at = time.time()
+
+    #function that checks the size and age limits
+    def should_rotate(self):
+        if self.max_bytes is not None and self.file.tell() >= self.max_bytes:
+            return True
+        return self.rotate_interval is not None and time.time() - self.opened_at >= self.rotate_interval
+
+    #function that moves path -> path.1 -> path.2 ... and starts a fresh file
+    def rotate(self):
+        self.file.close()
+        for index in range(self.backups - 1, 0, -1):
+            source = f"{self.path}.{index}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.path}.{index + 1}")
+        if self.backups > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+        self.open_file()
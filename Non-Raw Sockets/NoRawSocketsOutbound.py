@@ -0,0 +1,139 @@
+import socket #for the vectored send check
+import threading #the queue is filled by broadcasting threads and drained by the I/O layer
+import time #for spotting consumers that stay slow
+from collections import deque #outbound frames in send order
+from NoRawSocketsProtocol import TIMER_UPDATE, SESSION_DEADLINE, CHAT
+
+#what to do with a new frame for a student whose queue is backing up
+KEEP = "keep" #never dropped; if the queue is full the student is disconnected instead
+COALESCE = "coalesce" #only the newest frame of this type is kept, an older queued one is overwritten
+DROP = "drop" #silently dropped when the queue is full
+
+#timer updates and deadline syncs are superseded by the next one, relayed chat is best effort (a busy room must not
+#disconnect a slow reader), everything else (roster, warnings, session end) must arrive
+DEFAULT_POLICIES = {TIMER_UPDATE: COALESCE, SESSION_DEADLINE: COALESCE, CHAT: DROP}
+
+VECTORED_SEND = hasattr(socket.socket, "sendmsg") #one sendmsg call writes several queued frames (not on Windows)
+MAX_FRAMES_PER_SEND = 64 #frames gathered into one sendmsg call, well under the kernel's IOV_MAX
+
+#bounded per-student queue of encoded frames waiting to be written to the socket
+#frames are immutable bytes shared by every recipient of a broadcast: a queue holds a reference, never a copy
+class OutboundQueue:
+    #initialization
+    def __init__(self, max_frames=256, slow_timeout=5.0, policies=None, on_sent=None, vectored=VECTORED_SEND):
+        self.max_frames = max_frames
+        self.slow_timeout = slow_timeout #a queue that makes no progress for this long marks a slow consumer
+        self.policies = DEFAULT_POLICIES if policies is None else policies
+        self.on_sent = on_sent #on_sent(msg_type, seconds from queued to written) once a frame is fully written (I/O thread)
+        self.vectored = vectored and VECTORED_SEND #False writes one frame per send call
+        self.frames = deque()  #[msg_type, bytes, time queued, being written] in send order
+        self.coalesce_slots = {}  #{msg_type: queued slot that a newer frame may overwrite}
+        self.head_offset = 0  #bytes of the first frame already written
+        self.queued_bytes = 0
+        self.stalled_since = None  #when the queue last went from empty to non-empty or last made progress
+        self.closed = False
+        self.lock = threading.Lock()
+        self.ready = threading.Condition(self.lock)
+
+    #function that queues a frame, returns False when the consumer is too slow and should be disconnected
+    def push(self, msg_type, frame):
+        with self.lock:
+            if self.closed:
+                return True #already being disconnected
+            policy = self.policies.get(msg_type, KEEP)
+            if policy == COALESCE:
+                slot = self.coalesce_slots.get(msg_type)
+                #a frame that a send call has picked up may be partly written, so only one still waiting is overwritten
+                if slot is not None and not slot[3]:
+                    self.queued_bytes += len(frame) - len(slot[1])
+                    slot[1] = frame
+                    return not self.is_slow()
+
+            if len(self.frames) >= self.max_frames:
+                return policy == DROP
+
+            slot = [msg_type, frame, time.monotonic(), False]
+            self.frames.append(slot)
+            self.queued_bytes += len(frame)
+            if policy == COALESCE:
+                self.coalesce_slots[msg_type] = slot
+            if self.stalled_since is None:
+                self.stalled_since = time.monotonic()
+            self.ready.notify()
+            return not self.is_slow()
+
+    #function that reports whether frames have been waiting without progress for too long (caller holds self.lock)
+    def is_slow(self):
+        return self.stalled_since is not None and time.monotonic() - self.stalled_since > self.slow_timeout
+
+    #function that writes as much as the socket accepts, returns True once the queue is empty
+    def write_to(self, sock):
+        while True:
+            with self.lock:
+                if not self.frames:
+                    self.stalled_since = None
+                    return True
+                #the unsent rest of the head frame, then whole frames behind it (bytes are passed as-is, nothing is copied)
+                count = min(len(self.frames), MAX_FRAMES_PER_SEND) if self.vectored else 1
+                slots = [self.frames[i] for i in range(count)]
+                buffers = [slot[1] for slot in slots]
+                if self.head_offset:
+                    buffers[0] = memoryview(buffers[0])[self.head_offset:]
+                for slot in slots:
+                    slot[3] = True
+            try:
+                sent = sock.sendmsg(buffers) if count > 1 else sock.send(buffers[0])
+            except BlockingIOError:
+                with self.lock:
+                    self.release_slots(slots)
+                return False
+            now = time.monotonic()
+            finished = []
+            with self.lock:
+                if self.closed:
+                    return True #cleared while the send was in progress
+                self.stalled_since = now
+                self.queued_bytes -= sent
+                sent += self.head_offset
+                for slot in slots:
+                    if sent < len(slot[1]):
+                        break
+                    sent -= len(slot[1])
+                    self.frames.popleft()
+                    if self.coalesce_slots.get(slot[0]) is slot:
+                        del self.coalesce_slots[slot[0]]
+                    finished.append(slot)
+                self.head_offset = sent
+                self.release_slots(slots[len(finished):])
+            if self.on_sent:
+                for slot in finished:
+                    self.on_sent(slot[0], now - slot[2])
+
+    #function that lets coalescing overwrite slots again once a send has not started writing them (caller holds self.lock)
+    #only a partly written head frame stays in flight, its rest must go out unchanged
+    def release_slots(self, slots):
+        for slot in slots:
+            slot[3] = False
+        if self.head_offset and self.frames:
+            self.frames[0][3] = True
+
+    #function that blocks a writer thread until there is something to send; returns False once the queue is closed
+    def wait(self):
+        with self.lock:
+            while not self.frames and not self.closed:
+                self.ready.wait()
+            return not self.closed
+
+    #function that wakes and stops the writer once the student is gone
+    def close(self):
+        with self.lock:
+            self.closed = True
+            self.frames.clear()
+            self.coalesce_slots.clear()
+            self.queued_bytes = 0
+            self.ready.notify()
+
+    #function that returns (queued frames, queued bytes) for monitoring
+    def depth(self):
+        with self.lock:
+            return len(self.frames), self.queued_bytes
@@ -0,0 +1,198 @@
+import queue #hand-off from the GUI to the sending thread
+import selectors #one loop for every incoming peer connection
+import socket #for the student-to-student connections
+import threading #runs the sender and the listener in the background
+import time #for idle eviction
+from collections import OrderedDict #least recently used connection is evicted first
+from NoRawSocketsProtocol import encode_frame, FrameDecoder, TEXT #peers use the same framing as the tutor
+
+#outgoing connections to other students, kept open between messages and driven by one sending thread
+class PeerConnectionPool:
+    #initialization
+    def __init__(self, max_connections=16, idle_timeout=30.0, connect_timeout=2.0, on_result=None):
+        self.max_connections = max_connections #least recently used connection is closed beyond this
+        self.idle_timeout = idle_timeout #closes connections nobody has used for this long (shorter than the listener's)
+        self.connect_timeout = connect_timeout
+        self.on_result = on_result #on_result(address, error) after each send, error is None on success (sending thread)
+        self.connections = OrderedDict()  #{(ip, port): (socket, time of last send)}, oldest first
+        self.queue = queue.Queue()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    #function that queues one message for a peer; returns at once
+    def send(self, address, message):
+        self.queue.put((address, message))
+
+    #function that stops the sending thread once the queued messages are out (waits up to timeout seconds if given)
+    def close(self, timeout=None):
+        self.queue.put(None)
+        if timeout:
+            self.thread.join(timeout)
+
+    #sending thread: sends queued messages in order and closes idle connections between them
+    def run(self):
+        while True:
+            try:
+                item = self.queue.get(timeout=self.idle_timeout / 2)
+            except queue.Empty:
+                self.evict_idle()
+                continue
+            if item is None:
+                break
+            address, message = item
+            error = self.deliver(address, encode_frame(TEXT, message))
+            if self.on_result:
+                self.on_result(address, error)
+            self.evict_idle()
+        for address in list(self.connections):
+            self.evict(address)
+
+    #function that sends one frame over the cached connection, reconnecting once if the peer had closed it; returns the error or None
+    def deliver(self, address, frame):
+        for _ in range(2):
+            try:
+                conn = self.connection(address)
+                conn.sendall(frame)
+                self.connections[address] = (conn, time.monotonic())
+                self.connections.move_to_end(address)
+                return None
+            except OSError as e:
+                self.evict(address)
+                error = e
+        return error
+
+    #function that returns an open connection to the peer, connecting (and evicting the oldest) if needed
+    def connection(self, address):
+        cached = self.connections.get(address)
+        if cached is not None:
+            if self.is_open(cached[0]):
+                return cached[0]
+            self.evict(address)
+        while len(self.connections) >= self.max_connections:
+            self.evict(next(iter(self.connections)))
+        conn = socket.create_connection(address, timeout=self.connect_timeout)
+        conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.connections[address] = (conn, time.monotonic())
+        return conn
+
+    #function that checks whether the peer has closed a cached connection (peers never send on it, so readable means closed)
+    def is_open(self, conn):
+        conn.setblocking(False) #a socket with a timeout would wait for data instead of answering at once
+        try:
+            return conn.recv(1, socket.MSG_PEEK) != b""
+        except BlockingIOError:
+            return True
+        except OSError:
+            return False
+        finally:
+            conn.settimeout(self.connect_timeout)
+
+    #function that closes one connection
+    def evict(self, address):
+        cached = self.connections.pop(address, None)
+        if cached is not None:
+            try:
+                cached[0].close()
+            except OSError:
+                pass
+
+    #function that closes connections idle for longer than idle_timeout
+    def evict_idle(self):
+        now = time.monotonic()
+        for address, (conn, last_used) in list(self.connections.items()):
+            if now - last_used >= self.idle_timeout:
+                self.evict(address)
+
+#incoming connections from other students, all served by one selector loop
+class PeerListener:
+    #initialization
+    def __init__(self, port, on_message, on_connect=None, on_disconnect=None, max_connections=64, idle_timeout=120.0, host=''):
+        self.on_message = on_message #on_message(address, text) for every message (listener thread)
+        self.on_connect = on_connect #on_connect(address)
+        self.on_disconnect = on_disconnect #on_disconnect(address)
+        self.max_connections = max_connections #the longest idle peer is dropped beyond this
+        self.idle_timeout = idle_timeout #peers reconnect on their next message, so idle ones are closed
+        self.selector = selectors.DefaultSelector()
+        self.peers = {}  #{socket: [address, FrameDecoder, time of last message]}
+        self.closed = False
+        self.listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.listener.bind((host, port))
+        self.listener.listen(16)
+        self.listener.setblocking(False)
+        self.selector.register(self.listener, selectors.EVENT_READ)
+
+    #function that starts the listener thread
+    def start(self):
+        threading.Thread(target=self.run, daemon=True).start()
+
+    #function that stops the loop and closes every connection
+    def close(self):
+        self.closed = True
+
+    #listener thread: accepts peers and reads their messages until closed
+    def run(self):
+        while not self.closed:
+            for key, _ in self.selector.select(timeout=1.0):
+                if key.fileobj is self.listener:
+                    self.accept()
+                else:
+                    self.read(key.fileobj)
+            self.drop_idle()
+        for conn in list(self.peers):
+            self.drop(conn, notify=False)
+        self.selector.close()
+        self.listener.close()
+
+    #function that accepts one peer, making room by dropping the longest idle one
+    def accept(self):
+        try:
+            conn, address = self.listener.accept()
+        except OSError:
+            return
+        if len(self.peers) >= self.max_connections:
+            self.drop(min(self.peers, key=lambda peer: self.peers[peer][2]))
+        conn.setblocking(False)
+        self.peers[conn] = [address, FrameDecoder(), time.monotonic()]
+        self.selector.register(conn, selectors.EVENT_READ)
+        if self.on_connect:
+            self.on_connect(address)
+
+    #function that reads whatever a peer sent and hands on every complete message
+    def read(self, conn):
+        if conn not in self.peers:
+            return #dropped to make room by an accept earlier in the same select() round
+        address, decoder, _ = self.peers[conn]
+        try:
+            data = conn.recv(65536)
+        except BlockingIOError:
+            return
+        except OSError:
+            data = b""
+        if not data:
+            self.drop(conn)
+            return
+        try:
+            frames = decoder.feed(data)
+        except ValueError:
+            self.drop(conn)
+            return
+        self.peers[conn][2] = time.monotonic()
+        for msg_type, payload in frames:
+            if msg_type == TEXT:
+                self.on_message(address, payload)
+
+    #function that closes one peer connection
+    def drop(self, conn, notify=True):
+        address = self.peers.pop(conn)[0]
+        self.selector.unregister(conn)
+        conn.close()
+        if notify and self.on_disconnect:
+            self.on_disconnect(address)
+
+    #function that closes peers that have been quiet for longer than idle_timeout
+    def drop_idle(self):
+        now = time.monotonic()
+        for conn, (address, decoder, last_message) in list(self.peers.items()):
+            if now - last_message >= self.idle_timeout:
+                self.drop(conn)
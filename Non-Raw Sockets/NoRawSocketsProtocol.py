@@ -0,0 +1,73 @@
+import struct #for packing the frame header
+
+#every frame is: 4-byte body length (big-endian) | 1-byte message type | utf-8 payload
+#the length counts the type byte plus the payload, so an empty payload still has length 1
+FRAME_HEADER = struct.Struct('!IB')
+MAX_FRAME_SIZE = 1024 * 1024 #refuses frames over 1 MB so a bad peer cannot make us buffer forever
+
+#message types
+CHECK_IN = 1 #student -> tutor: "ID: ...; Name: ...; Port: ..."
+ACK = 2 #tutor -> student: check-in acknowledged
+ERROR = 3 #tutor -> student: check-in rejected, payload is the reason
+EXIT = 4 #student -> tutor: payload is the student id (the tutor goes by the connection the frame came on)
+ATTENDANCE_LIST = 5 #tutor -> student: full roster snapshot "version|port-id-name,port-id-name,..."
+TIMER_UPDATE = 6 #tutor -> student: "MM:SS"
+TEXT = 7 #tutor -> student: free text (warnings, exits, session end)
+ROSTER_ADD = 8 #tutor -> student: "version|port-id-name"
+ROSTER_REMOVE = 9 #tutor -> student: "version|student_id"
+ROSTER_RESYNC = 10 #student -> tutor: asks for a fresh ATTENDANCE_LIST snapshot after a version gap
+SESSION_DEADLINE = 11 #tutor -> student: "remaining_seconds|running" or "remaining_seconds|paused", the student counts down locally
+WAITLISTED = 12 #tutor -> student: session is full, payload is the waitlist position; an ACK follows once a seat frees
+CHAT = 13 #student -> tutor: "recipient|text"; tutor -> student: "sender_id|recipient|text" (recipient is a student id or "#room")
+JOIN_ROOM = 14 #student -> tutor: room name, the student receives the room's CHAT messages from now on
+LEAVE_ROOM = 15 #student -> tutor: room name
+
+#names of the message types, for metrics and logs
+MESSAGE_NAMES = {CHECK_IN: "check_in", ACK: "ack", ERROR: "error", EXIT: "exit", ATTENDANCE_LIST: "attendance_list", TIMER_UPDATE: "timer_update",
+                 TEXT: "text", ROSTER_ADD: "roster_add", ROSTER_REMOVE: "roster_remove", ROSTER_RESYNC: "roster_resync",
+                 SESSION_DEADLINE: "session_deadline", WAITLISTED: "waitlisted", CHAT: "chat", JOIN_ROOM: "join_room", LEAVE_ROOM: "leave_room"}
+
+#check-in refusal reasons (ERROR payloads)
+DUPLICATE_ID = "Student ID must be unique."
+SESSION_FULL = "Maximum number of students reached. Cannot check in."
+DUPLICATE_PORT = "Port is already used by another student."
+ALREADY_CHECKED_IN = "This connection has already checked in."
+
+ROUTED_PORT = "0" #check-in port of a student that chats through the tutor and has no peer listener
+ROOM_PREFIX = "#" #a CHAT recipient starting with this is a room, anything else is a student id
+
+#function that builds one frame from a message type and a payload
+def encode_frame(msg_type, payload=""):
+    if isinstance(payload, str):
+        payload = payload.encode('utf-8')
+    return FRAME_HEADER.pack(len(payload) + 1, msg_type) + payload
+
+#streaming decoder: feed it whatever recv returned and get back every complete frame
+class FrameDecoder:
+    def __init__(self):
+        self.buffer = bytearray()
+
+    #function that adds received bytes and returns a list of (msg_type, payload) for every complete frame
+    def feed(self, data):
+        self.buffer += data
+        frames = []
+        offset = 0
+        while len(self.buffer) - offset >= FRAME_HEADER.size:
+            length, msg_type = FRAME_HEADER.unpack_from(self.buffer, offset)
+            if length < 1 or length > MAX_FRAME_SIZE:
+                raise ValueError(f"Invalid frame length {length}")
+            end = offset + 4 + length
+            if end > len(self.buffer):
+                break #partial frame, wait for the rest
+            frames.append((msg_type, self.buffer[offset + FRAME_HEADER.size:end].decode('utf-8')))
+            offset = end
+        if offset:
+            del self.buffer[:offset]
+        return frames
+
+#function that reads once from a socket and returns every frame it completed, or None when the peer closed
+def recv_frames(sock, decoder, bufsize=65536):
+    data = sock.recv(bufsize)
+    if not data:
+        return None
+    return decoder.feed(data)
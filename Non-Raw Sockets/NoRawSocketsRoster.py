@@ -0,0 +1,99 @@
+from NoRawSocketsProtocol import ROUTED_PORT #students without a peer listener share this port, so it is not indexed
+
+#one checked-in student; __slots__ keeps a lecture hall's worth of records small
+class StudentRecord:
+    __slots__ = ("student_id", "name", "port", "sock", "entry")
+
+    #initialization
+    def __init__(self, student_id, name, port, sock=None):
+        self.student_id = student_id
+        self.name = name
+        self.port = port
+        self.sock = sock #None for students checked in on another worker of a cluster
+        self.entry = f"{port}-{student_id}-{name}" #roster entry as sent on the wire, built once
+
+#the tutor's roster: every lookup (id, listening port, connection) is one dict access, and each change updates every index together
+#not thread-safe on its own, the server changes and reads it under its lock
+class Roster:
+    #initialization
+    def __init__(self):
+        self.by_id = {}  #{student_id: StudentRecord}, in check-in order
+        self.by_port = {}  #{port: StudentRecord}
+        self.by_socket = {}  #{socket: StudentRecord}, only the students connected to this process
+        self.version = 0  #bumped on every add/remove, tags the roster deltas
+        self.snapshot_cache = None  #"version|entry,entry,..." until the next change
+        self.dict_cache = None  #{student_id: (name, port)} until the next change
+
+    #function that returns the number of students on the roster
+    def __len__(self):
+        return len(self.by_id)
+
+    #function that checks whether a student id is on the roster
+    def __contains__(self, student_id):
+        return student_id in self.by_id
+
+    #function that returns the record of a student id, or None
+    def get(self, student_id):
+        return self.by_id.get(student_id)
+
+    #function that returns the record of the student on a connection, or None
+    def for_socket(self, sock):
+        return self.by_socket.get(sock)
+
+    #function that returns the record of the student listening on a port, or None
+    def for_port(self, port):
+        return self.by_port.get(port)
+
+    #function that returns (socket, record) for every student connected to this process
+    def connected(self):
+        return self.by_socket.items()
+
+    #function that adds (or replaces) a student; version is the cluster's version, None bumps the local one; returns the record
+    #an id, port and connection each belong to one student, so an older record holding any of them is removed first
+    def add(self, student_id, name, port, sock=None, version=None):
+        self.remove(student_id, bump=False)
+        if port != ROUTED_PORT and port in self.by_port:
+            self.remove(self.by_port[port].student_id, bump=False)
+        if sock is not None and sock in self.by_socket:
+            self.remove(self.by_socket[sock].student_id, bump=False)
+        record = StudentRecord(student_id, name, port, sock)
+        self.by_id[student_id] = record
+        if port != ROUTED_PORT:
+            self.by_port[port] = record
+        if sock is not None:
+            self.by_socket[sock] = record
+        self.bump(version)
+        return record
+
+    #function that removes a student from every index; returns the record, or None if they were not on the roster
+    def remove(self, student_id, version=None, bump=True):
+        record = self.by_id.pop(student_id, None)
+        if record is None:
+            if version is not None:
+                self.bump(version)
+            return None
+        if self.by_port.get(record.port) is record:
+            del self.by_port[record.port]
+        if record.sock is not None and self.by_socket.get(record.sock) is record:
+            del self.by_socket[record.sock]
+        if bump:
+            self.bump(version)
+        return record
+
+    #function that moves to the next version (or catches up with the cluster's) and drops the cached snapshots
+    def bump(self, version=None):
+        self.version = self.version + 1 if version is None else max(self.version, version)
+        self.snapshot_cache = None
+        self.dict_cache = None
+
+    #function that returns the versioned roster as sent in ATTENDANCE_LIST, serialized once per change
+    def snapshot(self):
+        if self.snapshot_cache is None:
+            self.snapshot_cache = f"{self.version}|" + ",".join(record.entry for record in self.by_id.values())
+        return self.snapshot_cache
+
+    #function that returns {student_id: (name, port)} for subscribers, built once per change (treat it as read-only)
+    def as_dict(self):
+        if self.dict_cache is None:
+            self.dict_cache = {student_id: (record.name, record.port) for student_id, record in self.by_id.items()}
+        return self.dict_cache
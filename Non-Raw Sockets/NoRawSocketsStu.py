@@ -1,294 +1,472 @@
-import socket #for communication using sockets
-import threading #runs background tasks
-import tkinter as Tkinter #student's GUI
-import tkinter.scrolledtext as ScrolledText #for scrolling
-from tkinter import messagebox, simpledialog #for dialog boxes, warnings, input
-
-#student class
-class StudentClient:
-    #function initialization for attributes and student's windows
-    def __init__(self, host='127.0.0.1', port=5000):
-        self.server_address = (host, port)
-        self.root = Tkinter.Tk()
-        self.root.title("Student Client")
-
-        self.client_socket = None  #server socket
-        self.is_checked_in = False
-        self.student_id = None
-        self.student_name = None
-
-        #student-to-student attributes
-        self.peer_listener = None
-        self.peer_listen_port = None
-        self.peer_listen_thread = None
-        self.peer_connections = []  #list of connected student sockets
-        self.create_widgets()
-        self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
-
-    #function for student's GUI
-    def create_widgets(self):
-        input_frame = Tkinter.Frame(self.root)
-        input_frame.pack(pady=10)
-
-        Tkinter.Label(input_frame, text="Student ID:").grid(row=0, column=0)
-        validate_id = self.root.register(self.validate_digit_input)
-        self.student_id_entry = Tkinter.Entry(input_frame, validate="key", validatecommand=(validate_id, '%S'))
-        self.student_id_entry.grid(row=0, column=1)
-
-        Tkinter.Label(input_frame, text="First Name:").grid(row=1, column=0)
-        self.first_name_entry = Tkinter.Entry(input_frame)
-        self.first_name_entry.grid(row=1, column=1)
-
-        Tkinter.Label(input_frame, text="Last Name:").grid(row=2, column=0)
-        self.last_name_entry = Tkinter.Entry(input_frame)
-        self.last_name_entry.grid(row=2, column=1)
-
-        self.check_in_button = Tkinter.Button(input_frame, text="Check In", command=self.check_in)
-        self.check_in_button.grid(row=3, columnspan=2)
-
-        #stores the chat history
-        self.history = ScrolledText.ScrolledText(self.root, width=60, height=10, state='disabled')
-        self.history.pack(pady=5)
-
-        #stores the attendance list
-        attendance_frame = Tkinter.Frame(self.root)
-        attendance_frame.pack(pady=5)
-
-        Tkinter.Label(attendance_frame, text="Attendance List:").pack()
-
-        self.attendance_list = ScrolledText.ScrolledText(attendance_frame, width=60, height=10, state='disabled')
-        self.attendance_list.pack()
-        
-        # session timer label for students
-        self.timer_label = Tkinter.Label(self.root, text="Session Timer: Not Started")
-        self.timer_label.pack(pady=5)
-
-
-        #chat input frame for students
-        chat_frame = Tkinter.Frame(self.root)
-        chat_frame.pack(pady=10)
-
-        Tkinter.Label(chat_frame, text="Peer IP:").grid(row=0, column=0)
-        self.peer_ip_entry = Tkinter.Entry(chat_frame)
-        self.peer_ip_entry.grid(row=0, column=1)
-        self.peer_ip_entry.insert(0, '127.0.0.1')
-
-        Tkinter.Label(chat_frame, text="Peer Port:").grid(row=1, column=0)
-        self.peer_port_entry = Tkinter.Entry(chat_frame)
-        self.peer_port_entry.grid(row=1, column=1)
-
-        self.send_button = Tkinter.Button(chat_frame, text="Send Message", command=self.start_chat, state='disabled')
-        self.send_button.grid(row=2, columnspan=2)
-
-        self.exit_button = Tkinter.Button(chat_frame, text="Exit Session", command=self.exit_session)
-        self.exit_button.grid(row=3, columnspan=2)
-
-    #function that validates the student id
-    def validate_digit_input(self, char):
-        return char.isdigit() and len(self.student_id_entry.get()) < 5
-
-    #function that updates the attendance
-    def update_attendance_list(self, raw_data):
-        self.attendance_list.config(state='normal')
-        
-        #clear previous attendance records
-        self.attendance_list.delete('1.0', 'end')  
-
-        #header
-        self.attendance_list.insert('end', f"{'PORT':<10} {'ID':<10} {'NAME':<30}\n")
-        self.attendance_list.insert('end', "-" * 50 + "\n")
-
-        if raw_data.strip():
-            entries = raw_data.split(",")
-            for entry in entries:
-                try:
-                    port, student_id, name = entry.strip().split("-")
-                    self.attendance_list.insert('end', f"{port:<10} {student_id:<10} {name:<30}\n")
-                except ValueError:
-                    continue  #skips malformed entries
-
-        self.attendance_list.config(state='disabled')
-        self.attendance_list.yview('end')
-
-    #function for check in system
-    def check_in(self):
-        student_id = self.student_id_entry.get()
-        first_name = self.first_name_entry.get()
-        last_name = self.last_name_entry.get()
-
-        #if student id is longer than 5 digits
-        if len(student_id) != 5:
-            messagebox.showwarning("Input Error", "Student ID must be exactly 5 digits long.")
-            return
-
-        #if name is not in alphabetical letters
-        if not first_name.isalpha() or not last_name.isalpha():
-            messagebox.showwarning("Input Error", "First and Last Name must contain only alphabetic characters.")
-            return
-
-        #automatically assigns student listening port based on last two digits of student ID
-        self.peer_listen_port = 6000 + int(student_id[-2:])  #set listen port first
-        message = f"ID: {student_id}; Name: {first_name} {last_name}; Port: {self.peer_listen_port}"
-
-        try:
-            self.client_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            self.client_socket.connect(self.server_address)
-            self.client_socket.send(message.encode('utf-8'))
-
-            response = self.client_socket.recv(1024).decode('utf-8')
-            if response:
-                if "Maximum number of students reached" in response or "must be unique" in response:
-                    messagebox.showwarning("Check-in Error", response)
-                    self.exit_session()
-                    return
-                else:
-                    self.display_message(response)
-                    self.is_checked_in = True
-                    self.student_id = student_id
-                    self.student_name = f"{first_name} {last_name}"
-                    self.send_button.config(state='normal')
-
-            if self.is_checked_in:
-                threading.Thread(target=self.listen_for_server_messages, daemon=True).start()
-
-            self.start_peer_listener(self.peer_listen_port)  #start listener after sending
-
-        except Exception as e:
-            messagebox.showerror("Connection Error", f"Could not connect to the server: {e}")
-
-    #function that listens to server messages
-    def listen_for_server_messages(self):
-        while True:
-            try:
-                message = self.client_socket.recv(1024).decode('utf-8')
-                if message:
-                    if message.startswith("ATTENDANCE_LIST:"):
-                        attendance_data = message.replace("ATTENDANCE_LIST:", "")
-                        self.update_attendance_list(attendance_data)
-                    elif message.startswith("TIMER_UPDATE:"):
-                        timer_time = message.split(":")[1] + ":" + message.split(":")[2]
-                        self.timer_label.config(text=f"Session Timer: {timer_time}")
-                    else:
-                        self.display_message(f"Tutor: {message}")
-                else:
-                    self.display_message("Disconnected from server.")
-                    break
-            except Exception as e:
-                self.display_message(f"Error receiving message from server: {e}")
-                break
-
-    #function that starts listening to student's messages
-    def start_peer_listener(self, port):
-        def listen():
-            self.peer_listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            self.peer_listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-            self.peer_listener.bind(('', port))
-            self.peer_listener.listen(5)
-            self.display_message(f"Listening for peer connections on port {port}...")
-            while True:
-                try:
-                    peer_conn, peer_addr = self.peer_listener.accept()
-                    self.peer_connections.append(peer_conn)
-                    threading.Thread(target=self.handle_peer_connection, args=(peer_conn, peer_addr), daemon=True).start()
-                except Exception:
-                    break
-
-        self.peer_listen_thread = threading.Thread(target=listen, daemon=True)
-        self.peer_listen_thread.start()
-
-    #function that handles the student's connection
-    def handle_peer_connection(self, peer_conn, peer_addr):
-        self.display_message(f"Peer connected from {peer_addr}")
-        while True:
-            try:
-                data = peer_conn.recv(1024)
-                if not data:
-                    break
-                message = data.decode('utf-8')
-                self.display_message(f"Peer [{peer_addr}]: {message}")
-            except Exception:
-                break
-        peer_conn.close()
-        self.peer_connections.remove(peer_conn)
-        self.display_message(f"Peer disconnected: {peer_addr}")
-
-    #function that starts chatting with other students
-    def start_chat(self):
-        peer_ip = self.peer_ip_entry.get().strip()
-        peer_port_str = self.peer_port_entry.get().strip()
-
-        if not peer_ip:
-            messagebox.showwarning("Invalid Input", "Please enter a peer IP address.")
-            return
-        if not peer_port_str.isdigit():
-            messagebox.showwarning("Invalid Input", "Please enter a valid peer port number.")
-            return
-
-        peer_port = int(peer_port_str)
-        message = self.get_message()
-        if not message:
-            return
-            
-        if peer_port == self.peer_listen_port:
-            messagebox.showerror("Invalid", "Cannot send message to yourself!")
-            return
-
-        threading.Thread(target=self.send_message_to_peer, args=(peer_ip, peer_port, message), daemon=True).start()
-
-    #function that sends messages across to other students
-    def send_message_to_peer(self, peer_ip, peer_port, message):
-        try:
-            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as peer_socket:
-                peer_socket.connect((peer_ip, peer_port))
-                peer_socket.send(message.encode('utf-8'))
-                self.display_message(f"Message sent to {peer_ip}:{peer_port}")
-        except Exception as e:
-            messagebox.showerror("Peer Connection Error", f"Failed to send message to {peer_ip}:{peer_port}\n{e}")
-
-    #function that displays messages in the student's GUI
-    def display_message(self, message):
-        self.history.config(state='normal')
-        self.history.insert('end', message + '\n')
-        self.history.config(state='disabled')
-        self.history.yview('end')
-
-    #function that gets the message from the student
-    def get_message(self):
-        # Prompt user to enter message
-        message = simpledialog.askstring("Send Message", "Enter your message:")
-        if not message:
-            messagebox.showinfo("No Message", "You didn't enter any message.")
-            return None
-        return message
-
-    #function that exists the session
-    def on_closing(self):
-        self.exit_session()
-
-    #function that exists the session and closes the student's GUI
-    def exit_session(self):
-        if self.client_socket:
-            try:
-                self.client_socket.send("EXIT".encode('utf-8'))
-                self.client_socket.close()
-            except:
-                pass
-
-        for conn in self.peer_connections:
-            try:
-                conn.close()
-            except:
-                pass
-        self.peer_connections.clear()
-
-        if self.peer_listener:
-            try:
-                self.peer_listener.close()
-            except:
-                pass
-        self.root.destroy()
-
-#main function
-if __name__ == "__main__":
-    client = StudentClient()
-    client.root.mainloop()
+import socket #for communication using sockets
+import argparse #for choosing direct or routed chat on startup
+import threading #runs background tasks
+import time #for the local session countdown
+import queue #hand-off from the network threads to the Tk main thread
+import tkinter as Tkinter #student's GUI
+import tkinter.scrolledtext as ScrolledText #for scrolling
+from tkinter import messagebox, simpledialog #for dialog boxes, warnings, input
+import NoRawSocketsCommon #puts ../Common (modules shared with the raw variant) on the import path
+from RosterView import RosterView, ROSTER_REFRESH_MS #attendance table that redraws only changed rows
+from NoRawSocketsPeers import PeerConnectionPool, PeerListener #cached student-to-student connections
+from NoRawSocketsProtocol import encode_frame, FrameDecoder, recv_frames, CHECK_IN, ACK, ERROR, EXIT, ATTENDANCE_LIST, TIMER_UPDATE, ROSTER_ADD, ROSTER_REMOVE, ROSTER_RESYNC, SESSION_DEADLINE, WAITLISTED, CHAT, JOIN_ROOM, LEAVE_ROOM, ROUTED_PORT, ROOM_PREFIX #framed wire protocol
+
+UI_POLL_MS = 50 #how often the Tk main thread runs the calls queued by the network threads
+
+#student class
+class StudentClient:
+    #function initialization for attributes and student's windows
+    def __init__(self, host='127.0.0.1', port=5000, routed=False):
+        self.server_address = (host, port)
+        self.routed = routed  #True sends chat through the tutor connection instead of peer sockets
+        self.root = Tkinter.Tk()
+        self.root.title("Student Client")
+
+        self.client_socket = None  #server socket
+        self.decoder = FrameDecoder()  #reassembles frames from the server socket
+        self.is_checked_in = False
+        self.waitlisted = False  #True while waiting for a seat in a full session
+        self.pending_check_in = None  #(student_id, student_name) sent with the last check-in
+        self.student_id = None
+        self.student_name = None
+
+        #versioned roster kept in sync from the tutor's snapshot and add/remove deltas
+        self.roster = {}  #{student_id: (port, name)}
+        self.roster_version = None  #None until the first snapshot arrives
+        self.resync_pending = False
+        self.roster_changed = set()  #student ids whose rows are out of date
+
+        #local session countdown, synced from the tutor's deadline messages
+        self.timer_deadline = None  #time.monotonic() at which the session ends
+        self.timer_paused_remaining = None  #seconds left while the tutor has paused the session
+        self.timer_after_id = None
+
+        #student-to-student attributes
+        self.peer_listener = None  #PeerListener, one thread for every incoming peer
+        self.peer_listen_port = None
+        self.peer_pool = None if routed else PeerConnectionPool(on_result=self.peer_send_result)  #one thread and cached connections for every outgoing message
+        self.create_widgets()
+        self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
+        self.root.after(ROSTER_REFRESH_MS, self.refresh_attendance_list)
+
+        #Tk is not thread-safe, so the server listener and the peer threads only queue calls here and the main loop runs them
+        self.ui_calls = queue.Queue()  #(function, args)
+        self.root.after(UI_POLL_MS, self.drain_ui_calls)
+
+    #function for student's GUI
+    def create_widgets(self):
+        input_frame = Tkinter.Frame(self.root)
+        input_frame.pack(pady=10)
+
+        Tkinter.Label(input_frame, text="Student ID:").grid(row=0, column=0)
+        validate_id = self.root.register(self.validate_digit_input)
+        self.student_id_entry = Tkinter.Entry(input_frame, validate="key", validatecommand=(validate_id, '%S'))
+        self.student_id_entry.grid(row=0, column=1)
+
+        Tkinter.Label(input_frame, text="First Name:").grid(row=1, column=0)
+        self.first_name_entry = Tkinter.Entry(input_frame)
+        self.first_name_entry.grid(row=1, column=1)
+
+        Tkinter.Label(input_frame, text="Last Name:").grid(row=2, column=0)
+        self.last_name_entry = Tkinter.Entry(input_frame)
+        self.last_name_entry.grid(row=2, column=1)
+
+        self.check_in_button = Tkinter.Button(input_frame, text="Check In", command=self.check_in)
+        self.check_in_button.grid(row=3, columnspan=2)
+
+        #stores the chat history
+        self.history = ScrolledText.ScrolledText(self.root, width=60, height=10, state='disabled')
+        self.history.pack(pady=5)
+
+        #stores the attendance list
+        attendance_frame = Tkinter.Frame(self.root)
+        attendance_frame.pack(pady=5)
+
+        Tkinter.Label(attendance_frame, text="Attendance List:").pack()
+
+        self.attendance_list = RosterView(attendance_frame, height=10)
+        self.attendance_list.pack(fill="both", expand=True)
+        
+        # session timer label for students
+        self.timer_label = Tkinter.Label(self.root, text="Session Timer: Not Started")
+        self.timer_label.pack(pady=5)
+
+
+        #chat input frame for students
+        chat_frame = Tkinter.Frame(self.root)
+        chat_frame.pack(pady=10)
+
+        #routed chat is addressed by student id or #room through the tutor, direct chat by peer ip and port
+        if self.routed:
+            Tkinter.Label(chat_frame, text="To (ID or #room):").grid(row=0, column=0)
+            self.recipient_entry = Tkinter.Entry(chat_frame)
+            self.recipient_entry.grid(row=0, column=1)
+
+            Tkinter.Label(chat_frame, text="Room:").grid(row=1, column=0)
+            room_frame = Tkinter.Frame(chat_frame)
+            room_frame.grid(row=1, column=1)
+            self.room_entry = Tkinter.Entry(room_frame, width=10)
+            self.room_entry.pack(side="left")
+            Tkinter.Button(room_frame, text="Join", command=lambda: self.change_room(JOIN_ROOM)).pack(side="left")
+            Tkinter.Button(room_frame, text="Leave", command=lambda: self.change_room(LEAVE_ROOM)).pack(side="left")
+        else:
+            Tkinter.Label(chat_frame, text="Peer IP:").grid(row=0, column=0)
+            self.peer_ip_entry = Tkinter.Entry(chat_frame)
+            self.peer_ip_entry.grid(row=0, column=1)
+            self.peer_ip_entry.insert(0, '127.0.0.1')
+
+            Tkinter.Label(chat_frame, text="Peer Port:").grid(row=1, column=0)
+            self.peer_port_entry = Tkinter.Entry(chat_frame)
+            self.peer_port_entry.grid(row=1, column=1)
+
+        self.send_button = Tkinter.Button(chat_frame, text="Send Message", command=self.start_chat, state='disabled')
+        self.send_button.grid(row=2, columnspan=2)
+
+        self.exit_button = Tkinter.Button(chat_frame, text="Exit Session", command=self.exit_session)
+        self.exit_button.grid(row=3, columnspan=2)
+
+    #function that validates the student id
+    def validate_digit_input(self, char):
+        return char.isdigit() and len(self.student_id_entry.get()) < 5
+
+    #function that queues a call for the Tk main thread (any thread)
+    def run_on_ui(self, function, *args):
+        self.ui_calls.put((function, args))
+
+    #function that runs every queued call, then runs again after UI_POLL_MS (Tk main loop)
+    def drain_ui_calls(self):
+        while True:
+            try:
+                function, args = self.ui_calls.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                function(*args)
+            except Exception as e:
+                print(f"UI update failed: {e}")
+        self.root.after(UI_POLL_MS, self.drain_ui_calls)
+
+    #function that applies a roster snapshot or delta from the tutor and marks the rows that changed (Tk main loop)
+    def update_attendance_list(self, msg_type, payload):
+        version, _, data = payload.partition("|")
+        try:
+            version = int(version)
+        except ValueError:
+            return  #skips malformed updates
+
+        if msg_type == ATTENDANCE_LIST:
+            roster = {}
+            for entry in data.split(",") if data.strip() else []:
+                try:
+                    port, student_id, name = entry.strip().split("-")
+                    roster[student_id] = (port, name)
+                except ValueError:
+                    continue  #skips malformed entries
+            self.roster_changed.update(self.roster)
+            self.roster_changed.update(roster)
+            self.roster = roster
+            self.roster_version = version
+            self.resync_pending = False
+            return
+
+        #deltas older than what we have are already applied, a jump means we missed one
+        if self.roster_version is None or version <= self.roster_version:
+            return
+        if version != self.roster_version + 1:
+            self.request_roster_resync()
+            return
+
+        if msg_type == ROSTER_ADD:
+            try:
+                port, student_id, name = data.strip().split("-")
+            except ValueError:
+                self.request_roster_resync()
+                return
+            self.roster[student_id] = (port, name)
+            self.roster_changed.add(student_id)
+            self.roster_version = version
+        elif msg_type == ROSTER_REMOVE:
+            student_id = data.strip()
+            self.roster.pop(student_id, None)
+            self.roster_changed.add(student_id)
+            self.roster_version = version
+
+    #function that draws the rows changed since the last refresh, then runs again after ROSTER_REFRESH_MS (Tk main loop)
+    def refresh_attendance_list(self):
+        changed, self.roster_changed = self.roster_changed, set()
+        rows = {student_id: self.roster[student_id] for student_id in changed if student_id in self.roster}
+        if changed:
+            self.attendance_list.update_rows(rows, changed)
+        self.root.after(ROSTER_REFRESH_MS, self.refresh_attendance_list)
+
+    #function that asks the tutor for a fresh roster snapshot (once per gap)
+    def request_roster_resync(self):
+        if self.resync_pending:
+            return
+        self.resync_pending = True
+        try:
+            self.client_socket.sendall(encode_frame(ROSTER_RESYNC))
+        except OSError:
+            self.resync_pending = False
+
+    #function for check in system
+    def check_in(self):
+        student_id = self.student_id_entry.get()
+        first_name = self.first_name_entry.get()
+        last_name = self.last_name_entry.get()
+
+        #if student id is longer than 5 digits
+        if len(student_id) != 5:
+            messagebox.showwarning("Input Error", "Student ID must be exactly 5 digits long.")
+            return
+
+        #if name is not in alphabetical letters
+        if not first_name.isalpha() or not last_name.isalpha():
+            messagebox.showwarning("Input Error", "First and Last Name must contain only alphabetic characters.")
+            return
+
+        #automatically assigns student listening port based on last two digits of student ID (routed students need none)
+        self.peer_listen_port = ROUTED_PORT if self.routed else 6000 + int(student_id[-2:])  #set listen port first
+        message = f"ID: {student_id}; Name: {first_name} {last_name}; Port: {self.peer_listen_port}"
+
+        try:
+            self.client_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self.client_socket.connect(self.server_address)
+            self.client_socket.sendall(encode_frame(CHECK_IN, message))
+
+            #the reply may arrive split, or batched with the first roster broadcast
+            frames = []
+            while not frames:
+                frames = recv_frames(self.client_socket, self.decoder)
+                if frames is None:
+                    raise ConnectionError("Server closed the connection during check-in.")
+            msg_type, response = frames[0]
+            self.pending_check_in = (student_id, f"{first_name} {last_name}")
+            if msg_type == ERROR:
+                messagebox.showwarning("Check-in Error", response)
+                self.exit_session()
+                return
+            elif msg_type in (ACK, WAITLISTED):
+                self.handle_server_frames(frames)
+
+            if self.is_checked_in or self.waitlisted:
+                threading.Thread(target=self.listen_for_server_messages, daemon=True).start()
+
+            if not self.routed:
+                self.start_peer_listener(self.peer_listen_port)  #start listener after sending
+
+        except Exception as e:
+            messagebox.showerror("Connection Error", f"Could not connect to the server: {e}")
+
+    #function that listens to server messages (listener thread, every frame is handled on the Tk main loop)
+    def listen_for_server_messages(self):
+        while True:
+            try:
+                #one recv can carry many frames, so they are queued together before reading again
+                frames = recv_frames(self.client_socket, self.decoder)
+                if frames is None:
+                    self.run_on_ui(self.display_message, "Disconnected from server.")
+                    break
+                if frames:
+                    self.run_on_ui(self.handle_server_frames, frames)
+            except Exception as e:
+                self.run_on_ui(self.display_message, f"Error receiving message from server: {e}")
+                break
+
+    #function that handles frames from the server, in order (Tk main loop)
+    def handle_server_frames(self, frames):
+        for msg_type, payload in frames:
+            self.handle_server_frame(msg_type, payload)
+
+    #function that handles one frame from the server (Tk main loop)
+    def handle_server_frame(self, msg_type, payload):
+        if msg_type == ACK:
+            self.complete_check_in(payload)
+        elif msg_type == WAITLISTED:
+            self.waitlisted = True
+            self.display_message(f"Session is full, you are number {payload} on the waitlist. You will be checked in when a seat frees up.")
+        elif msg_type == ERROR:
+            self.waitlisted = False
+            self.display_message(f"Check-in refused: {payload}")
+        elif msg_type in (ATTENDANCE_LIST, ROSTER_ADD, ROSTER_REMOVE):
+            self.update_attendance_list(msg_type, payload)
+        elif msg_type == SESSION_DEADLINE:
+            remaining, _, state = payload.partition("|")
+            try:
+                remaining = float(remaining)
+            except ValueError:
+                return
+            self.sync_timer(remaining, state == "paused")
+        elif msg_type == TIMER_UPDATE:
+            self.timer_label.config(text=f"Session Timer: {payload}")
+        elif msg_type == CHAT:
+            fields = payload.split("|", 2)
+            if len(fields) != 3:
+                print(f"Ignoring malformed chat frame: {payload}")
+                return
+            sender, recipient, text = fields
+            if recipient.startswith(ROOM_PREFIX):
+                self.display_message(f"[{recipient}] {sender}: {text}")
+            else:
+                self.display_message(f"{sender}: {text}")
+        else:
+            self.display_message(f"Tutor: {payload}")
+
+    #function that marks the student as checked in once the tutor acknowledges (straight away, or later from the waitlist)
+    def complete_check_in(self, response):
+        self.display_message(response)
+        self.is_checked_in = True
+        self.waitlisted = False
+        self.student_id, self.student_name = self.pending_check_in
+        self.send_button.config(state='normal')
+
+    #function that restarts the local countdown from the tutor's remaining time
+    def sync_timer(self, remaining, paused):
+        self.timer_deadline = time.monotonic() + remaining
+        self.timer_paused_remaining = remaining if paused else None
+        if self.timer_after_id is not None:
+            self.root.after_cancel(self.timer_after_id)
+        self.tick_timer()
+
+    #function that redraws the countdown and schedules itself for the moment the displayed second changes
+    def tick_timer(self):
+        self.timer_after_id = None
+        if self.timer_paused_remaining is not None:
+            minutes, seconds = divmod(int(self.timer_paused_remaining), 60)
+            self.timer_label.config(text=f"Session Timer: {minutes:02}:{seconds:02} (paused)")
+            return
+        remaining = self.timer_deadline - time.monotonic()
+        if remaining <= 0:
+            self.timer_label.config(text="Session Timer: 00:00")
+            return
+        minutes, seconds = divmod(int(remaining), 60)
+        self.timer_label.config(text=f"Session Timer: {minutes:02}:{seconds:02}")
+        self.timer_after_id = self.root.after(int((remaining % 1) * 1000) + 1, self.tick_timer)
+
+    #function that starts listening to student's messages
+    def start_peer_listener(self, port):
+        try:
+            self.peer_listener = PeerListener(port, on_message=lambda addr, message: self.run_on_ui(self.display_message, f"Peer [{addr}]: {message}"),
+                                              on_connect=lambda addr: self.run_on_ui(self.display_message, f"Peer connected from {addr}"),
+                                              on_disconnect=lambda addr: self.run_on_ui(self.display_message, f"Peer disconnected: {addr}"))
+        except OSError as e:
+            self.display_message(f"Could not listen for peers on port {port}: {e}")
+            return
+        self.peer_listener.start()
+        self.display_message(f"Listening for peer connections on port {port}...")
+
+    #function that starts chatting with other students
+    def start_chat(self):
+        if self.routed:
+            self.send_routed_chat()
+            return
+        peer_ip = self.peer_ip_entry.get().strip()
+        peer_port_str = self.peer_port_entry.get().strip()
+
+        if not peer_ip:
+            messagebox.showwarning("Invalid Input", "Please enter a peer IP address.")
+            return
+        if not peer_port_str.isdigit():
+            messagebox.showwarning("Invalid Input", "Please enter a valid peer port number.")
+            return
+
+        peer_port = int(peer_port_str)
+        message = self.get_message()
+        if not message:
+            return
+            
+        if peer_port == self.peer_listen_port:
+            messagebox.showerror("Invalid", "Cannot send message to yourself!")
+            return
+
+        self.peer_pool.send((peer_ip, peer_port), message)
+
+    #function that sends a chat message through the tutor to a student id or a #room
+    def send_routed_chat(self):
+        recipient = self.recipient_entry.get().strip()
+        if not recipient or recipient == ROOM_PREFIX or "|" in recipient:
+            messagebox.showwarning("Invalid Input", "Please enter a student ID or a #room.")
+            return
+        if recipient == self.student_id:
+            messagebox.showerror("Invalid", "Cannot send message to yourself!")
+            return
+
+        message = self.get_message()
+        if not message:
+            return
+        try:
+            self.client_socket.sendall(encode_frame(CHAT, f"{recipient}|{message}"))
+            self.display_message(f"You => {recipient}: {message}")
+        except OSError as e:
+            messagebox.showerror("Connection Error", f"Failed to send message to {recipient}\n{e}")
+
+    #function that joins or leaves the room typed in the room field
+    def change_room(self, msg_type):
+        room = self.room_entry.get().strip().lstrip(ROOM_PREFIX)
+        if not room or "|" in room:
+            messagebox.showwarning("Invalid Input", "Please enter a room name.")
+            return
+        if not self.is_checked_in:
+            messagebox.showwarning("Not Checked In", "Check in before joining a room.")
+            return
+        try:
+            self.client_socket.sendall(encode_frame(msg_type, room))
+        except OSError as e:
+            messagebox.showerror("Connection Error", f"Could not reach the tutor: {e}")
+
+    #function that reports how a queued peer message went (called from the peer sending thread)
+    def peer_send_result(self, address, error):
+        peer_ip, peer_port = address
+        if error is None:
+            self.run_on_ui(self.display_message, f"Message sent to {peer_ip}:{peer_port}")
+        else:
+            self.run_on_ui(messagebox.showerror, "Peer Connection Error", f"Failed to send message to {peer_ip}:{peer_port}\n{error}")
+
+    #function that displays messages in the student's GUI
+    def display_message(self, message):
+        self.history.config(state='normal')
+        self.history.insert('end', message + '\n')
+        self.history.config(state='disabled')
+        self.history.yview('end')
+
+    #function that gets the message from the student
+    def get_message(self):
+        # Prompt user to enter message
+        message = simpledialog.askstring("Send Message", "Enter your message:")
+        if not message:
+            messagebox.showinfo("No Message", "You didn't enter any message.")
+            return None
+        return message
+
+    #function that exists the session
+    def on_closing(self):
+        self.exit_session()
+
+    #function that exists the session and closes the student's GUI
+    def exit_session(self):
+        if self.client_socket:
+            try:
+                if self.is_checked_in:
+                    self.client_socket.sendall(encode_frame(EXIT, self.student_id))
+                self.client_socket.close()
+            except:
+                pass
+
+        if self.peer_pool:
+            self.peer_pool.close()
+
+        if self.peer_listener:
+            try:
+                self.peer_listener.close()
+            except:
+                pass
+        self.root.destroy()
+
+#main function
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Student client")
+    parser.add_argument("--routed", action="store_true", help="chat through the tutor connection (by student id or #room) instead of a peer listener")
+    args = parser.parse_args()
+
+    client = StudentClient(routed=args.routed)
+    client.root.mainloop()
@@ -1,271 +1,857 @@
-import socket
-import threading #for polling (not freezing tutor's GUI)
-import time #for using session timers and delays
-from datetime import datetime #for timestamps for attendance files
-import tkinter as Tkinter #tutor's GUI
-from tkinter import scrolledtext #for scrolling
-
-#log attendance in a txt file
-ATTENDANCE_LOG_FILE = "attendance_log.txt"
-
-#function that logs the attendance into a file
-def log_attendance(message):
-    timestamp = datetime.now().strftime("%d-%m-%Y %H:%M:%S")
-    with open(ATTENDANCE_LOG_FILE, "a") as f:
-        f.write(f"{timestamp} - {message}\n")
-
-#class for user authentication
-class UserAuthentication:
-    #initialization
-    def __init__(self):
-        self.sessions = {}  #dictionary to store active sessions
-
-    #function that validates the student id
-    def is_unique_student_id(self, student_id):
-        return student_id not in self.sessions.values()
-
-#tutor server's class
-class TutorServer:
-    #initialization
-    def __init__(self, gui, host='127.0.0.1', port=5000):
-        self.gui = gui
-        self.server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        self.server_socket.bind((host, port))
-        self.server_socket.listen(3) #only 3 students allowed in a session
-        self.students = {}  # {student_id: (student_name, port)}
-        self.student_sockets = {}  # {student_id: socket}
-        self.lock = threading.Lock()
-        self.session_duration = 6 * 60  # 6 minutes session (testing)
-        self.session_end_time = None
-        self.session_active = False
-        self.warning_sent = False
-        self.auth = UserAuthentication()
-
-    #function that handles the clients
-    def handle_client(self, client_socket, addr):
-        print(f"Connection from {addr} established.")
-        while True:
-            try:
-                message = client_socket.recv(1024).decode('utf-8')
-                if not message:
-                    break
-                if "has exited the session" in message:
-                    self.notify_exit(message)
-                else:
-                    self.process_message(message, client_socket, addr)
-            except ConnectionResetError:
-                print(f"Connection reset by {addr}.")
-                break
-            except Exception as e:
-                print(f"Error handling client {addr}: {e}")
-                break
-        client_socket.close()
-        with self.lock:
-            for student_id, sock in list(self.student_sockets.items()):
-                if sock == client_socket:
-                    del self.student_sockets[student_id]
-                    del self.students[student_id]
-                    log_attendance(f"Student {student_id} disconnected unexpectedly.")
-                    break
-        self.gui.update_attendance_display()
-        self.broadcast_attendance_list()  # <- Add this line to notify remaining students
-
-    #function that sends the message across to all students
-    def broadcast_message(self, message):
-        with self.lock:
-            for student_id in list(self.students.keys()):
-                try:
-                    sock = self.student_sockets.get(student_id)
-                    if sock:
-                        sock.send(message.encode('utf-8'))
-                        print(f"Sent to {self.students[student_id]} (ID: {student_id}): {message}")
-                except Exception as e:
-                    print(f"Failed to send message to {student_id}: {e}")
-                    del self.students[student_id]
-                    del self.student_sockets[student_id]
-                    self.gui.update_attendance_display()
-
-    #function that notifies the tutor of the student's exit
-    def notify_exit(self, message):
-        print(message)
-        student_id = message.split()[1]
-        with self.lock:
-            if student_id in self.students:
-                log_attendance(f"Student {student_id} ({self.students[student_id]}) has exited the session.")
-                del self.students[student_id]
-            if student_id in self.student_sockets:
-                del self.student_sockets[student_id]
-        self.broadcast_message(f"{student_id} has exited the session.")
-        self.gui.update_attendance_display()
-        self.broadcast_attendance_list()  # broadcast updated list here
-
-    #function that sends the attendance list to every student
-    def broadcast_attendance_list(self):
-        attendance_list = []
-        for student_id, (student_name, port) in self.students.items():
-            attendance_list.append(f"{port}-{student_id}-{student_name}")
-        attendance_message = "ATTENDANCE_LIST:" + ",".join(attendance_list)
-        self.broadcast_message(attendance_message)
-
-    #function that processes the messages to the students
-    def process_message(self, message, client_socket, addr):
-        try:
-            parts = message.split(';')
-            if len(parts) < 3:
-                print(f"Ignoring malformed message (not enough parts): {message}")
-                return
-
-            student_id = parts[0].split(':')[1].strip()
-            student_name = parts[1].split(':')[1].strip()
-            student_listen_port = parts[2].split(':')[1].strip()  #student's actual listening port
-
-        except (IndexError, ValueError) as e:
-            print(f"Malformed message received: {message} — Error: {e}")
-            return
-
-        with self.lock:
-            if student_id in self.students:
-                error_message = "Student ID must be unique."
-                client_socket.send(error_message.encode('utf-8'))
-                return
-            if len(self.students) >= 3:
-                error_message = "Maximum number of students reached. Cannot check in."
-                client_socket.send(error_message.encode('utf-8'))
-                return
-
-            self.students[student_id] = (student_name, student_listen_port)
-            self.student_sockets[student_id] = client_socket
-            log_attendance(f"Student checked in: {student_id} - {student_name} (Port: {student_listen_port})")
-            print(f"Student checked in: {student_name} (ID: {student_id}) on port {student_listen_port}")
-            self.send_acknowledgment(client_socket)
-
-        self.gui.update_attendance_display()
-        self.broadcast_attendance_list()
-
-        if len(self.students) == 1 and not self.session_active:
-            self.session_end_time = time.time() + self.session_duration
-            self.session_active = True
-            self.warning_sent = False
-            log_attendance("Session started.")
-            threading.Thread(target=self.session_timer, daemon=True).start()
-            threading.Thread(target=self.gui.update_timer, daemon=True).start()
-
-    #function that sends the acknowledgment to all students upon checking in
-    def send_acknowledgment(self, client_socket):
-        timestamp = datetime.now().strftime("%d-%m-%Y %H:%M:%S")
-        ack_message = f"Check-in acknowledged at {timestamp}"
-        client_socket.send(ack_message.encode('utf-8'))
-
-    #function that updates the session timer
-    def session_timer(self):
-        print("Session timer started.")
-        while self.session_active:
-            now = time.time()
-            remaining = self.session_end_time - now
-
-            if remaining <= 0:
-                self.broadcast_message("The session has ended.")
-                self.session_active = False
-                log_attendance("Session ended.")
-                self.gui.update_attendance_display()
-                print("Session ended.")
-                break
-            
-            remaining_minutes = int(remaining // 60)
-
-            #send 5-minute warning once
-            if int(remaining // 60) == 5 and int(remaining % 60) == 0 and not self.warning_sent:
-                self.broadcast_message("Warning: 5 minutes remaining in the session!")
-                print("Sent 5-minute warning.")
-                log_attendance("Sent 5-minute warning.")
-                self.warning_sent = True
-            
-            time.sleep(1)
-            
-            #broadcast the session timer update to students
-            minutes, seconds = divmod(int(remaining), 60)
-            timer_message = f"TIMER_UPDATE:{minutes:02}:{seconds:02}"
-            self.broadcast_message(timer_message)
-
-    #function that notifies that the session has ended
-    def notify_end_of_session(self):
-        self.session_active = False
-        self.broadcast_message("The session has ended.")
-        log_attendance("Session ended manually.")
-        self.gui.update_attendance_display()
-
-    #function that starts the server
-    def start(self):
-        print("Server is starting...")
-        try:
-            while True:
-                try:
-                    client_socket, addr = self.server_socket.accept()
-                    threading.Thread(target=self.handle_client, args=(client_socket, addr), daemon=True).start()
-                except OSError as e:
-                    print(f"Socket error: {e}")
-                    break
-        finally:
-            self.server_socket.close()
-            print("Server has been shut down.")
-
-#tutor's GUI class
-class TutorGUI:
-    def __init__(self, server):
-        self.server = server
-        self.root = Tkinter.Tk()
-        self.root.title("Tutor Control Panel")
-
-        self.end_button = Tkinter.Button(self.root, text="End Session", command=self.end_session)
-        self.end_button.pack(pady=10)
-
-        self.attendance_display = scrolledtext.ScrolledText(self.root, width=40, height=10)
-        self.attendance_display.pack(pady=10)
-
-        self.timer_label = Tkinter.Label(self.root, text="Session Timer: Not Started")
-        self.timer_label.pack(pady=10)
-
-        self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
-
-    #function that ends the session upon the button being clicked
-    def end_session(self):
-        if self.server.session_active:
-            self.server.notify_end_of_session()
-            self.timer_label.config(text="Session Timer: Session has Ended")
-            self.update_attendance_display()
-            self.server.session_active = False
-
-    #function that updates the session timer
-    def update_timer(self):
-        while self.server.session_active:
-            remaining_time = self.server.session_end_time - time.time()
-            if remaining_time > 0:
-                minutes, seconds = divmod(int(remaining_time), 60)
-                self.timer_label.config(text=f"Session Timer: {minutes:02}:{seconds:02}")
-            else:
-                self.timer_label.config(text="Session Timer: Time's Up!")
-                break
-            time.sleep(1)
-
-    #function that updates the attendance displayed in the tutor's GUI
-    def update_attendance_display(self):
-        attendance_message = "Current Attendance:\n"
-        for student_id, (student_name, port) in self.server.students.items():
-            attendance_message += f"Port: {port}, ID: {student_id}, Name: {student_name}\n"
-
-        self.attendance_display.delete(1.0, Tkinter.END)
-        self.attendance_display.insert(Tkinter.END, attendance_message)
-
-    #function that 
-    def on_closing(self):
-        if self.server.session_active:
-            self.server.notify_end_of_session()
-        self.root.destroy()
-
-#main function
-if __name__ == "__main__":
-    gui = TutorGUI(None)  #creates the tutor's GUI first
-    server = TutorServer(gui)  #passes the tutor's GUI to tutor server
-    gui.server = server  #links back the tutor server to GUI
-    threading.Thread(target=server.start, daemon=True).start()
-    gui.root.mainloop()
\ No newline at end of file
+import socket
+import selectors #for the event-loop server mode (one loop for every student socket)
+import argparse #for choosing the server mode on startup
+import multiprocessing #for the multi-process (SO_REUSEPORT) server mode
+import signal #stops the headless daemon cleanly on SIGTERM
+import threading #for polling (not freezing tutor's GUI)
+from collections import deque #sockets with frames waiting for the event loop to write
+import time #for using session timers and delays
+from datetime import datetime #for timestamps for attendance files
+import NoRawSocketsCommon #puts ../Common (modules shared with the raw variant) on the import path
+from TutorEvents import EVENT_ATTENDANCE, EVENT_SESSION_STARTED, EVENT_TIMER, EVENT_WARNING, EVENT_SESSION_ENDED, print_event #events published to the GUI and the headless console
+from NoRawSocketsProtocol import encode_frame, FrameDecoder, recv_frames, CHECK_IN, ACK, ERROR, EXIT, ATTENDANCE_LIST, TEXT, ROSTER_ADD, ROSTER_REMOVE, ROSTER_RESYNC, SESSION_DEADLINE, WAITLISTED, CHAT, JOIN_ROOM, LEAVE_ROOM, DUPLICATE_ID, DUPLICATE_PORT, ALREADY_CHECKED_IN, SESSION_FULL, ROUTED_PORT, ROOM_PREFIX, MESSAGE_NAMES #framed wire protocol
+from NoRawSocketsOutbound import OutboundQueue #bounded per-student send queues
+from NoRawSocketsRoster import Roster #roster indexed by student id, port and connection
+from NoRawSocketsLog import AttendanceLogWriter #batched background writer for the attendance log
+from NoRawSocketsAdmission import ConnectionRateLimiter, Waitlist #connection rate limits and the waitlist
+from NoRawSocketsCluster import ClusterMember, SharedRoster, CLUSTER_DB_FILE, BUS_BASE_PORT, BUS_SESSION_START, BUS_SESSION_END, BUS_CHAT #shared roster and bus for worker processes
+from TutorMetrics import Metrics, MetricsServer, JITTER_BUCKETS #counters and histograms for the opt-in metrics endpoint
+from TutorTrace import tracer, install_trace_signals #spans of the hot paths and the profiling toggle
+
+#log attendance in a txt file
+ATTENDANCE_LOG_FILE = "attendance_log.txt"
+
+#the log writer is created on first use so its options can be set from the command line first
+attendance_log = None
+attendance_log_options = {}
+attendance_log_lock = threading.Lock()
+
+#function that sets the log writer's batching, fsync and rotation options (call before the first log line)
+def configure_attendance_log(**options):
+    attendance_log_options.update(options)
+
+#function that logs the attendance into a file (only queues the line, the disk write happens in the background)
+def log_attendance(message):
+    global attendance_log
+    if attendance_log is None:
+        with attendance_log_lock:
+            if attendance_log is None:
+                attendance_log = AttendanceLogWriter(ATTENDANCE_LOG_FILE, **attendance_log_options)
+    attendance_log.log(message)
+
+#function that writes out everything still queued and stops the log writer
+def close_attendance_log():
+    if attendance_log is not None:
+        attendance_log.close()
+
+REJECT_REASONS = {DUPLICATE_ID: "duplicate_id", DUPLICATE_PORT: "duplicate_port", ALREADY_CHECKED_IN: "already_checked_in", SESSION_FULL: "session_full"} #metric labels of the check-in refusals
+
+#class for user authentication
+class UserAuthentication:
+    #initialization
+    def __init__(self):
+        self.sessions = {}  #dictionary to store active sessions
+
+    #function that validates the student id
+    def is_unique_student_id(self, student_id):
+        return student_id not in self.sessions.values()
+
+#tutor server's class
+class TutorServer:
+    #initialization
+    def __init__(self, host='127.0.0.1', port=5000, event_loop=False, max_queued_frames=256, slow_consumer_timeout=5.0, queue_policies=None, cluster=None,
+                 student_limit=3, backlog=3, waitlist_limit=0, connect_rate=None, connect_burst=10, vectored_send=True):
+        self.subscribers = []  #callbacks(event, data) called from whichever server thread changed the state
+        self.event_loop = event_loop #True multiplexes every student on one selector loop instead of a thread each
+        self.cluster = cluster #ClusterMember when several worker processes share the port, None for a single process
+        self.server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        if cluster:
+            self.server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1) #every worker binds the same port, the kernel spreads the connections
+        self.server_socket.bind((host, port))
+        self.server_socket.listen(backlog) #connections the kernel holds while the accept loop catches up
+        self.student_limit = student_limit #3 students by default, raise it for lecture halls
+
+        #admission control: the waitlist admits students as seats free, the rate limiter stops reconnect storms at accept
+        self.waitlist = Waitlist(waitlist_limit)
+        self.rate_limiter = ConnectionRateLimiter(connect_rate, connect_burst) if connect_rate else None
+        self.full_frame = encode_frame(ERROR, SESSION_FULL) #sent as-is to connections turned away at accept
+        self.roster = Roster()  #in a cluster this mirrors every worker's students, only this worker's have a socket
+        self.rooms = {}  # {room: set of student ids}, only this worker's students
+        self.student_rooms = {}  # {student_id: set of rooms}, so leaving the session leaves every room at once
+
+        #outbound queues: broadcasts only enqueue, the I/O layer (writer threads or the event loop) does the sending
+        self.max_queued_frames = max_queued_frames
+        self.slow_consumer_timeout = slow_consumer_timeout
+        self.queue_policies = queue_policies #{msg_type: KEEP/COALESCE/DROP}, None uses the defaults
+        self.vectored_send = vectored_send #several queued frames go out in one sendmsg call
+        self.outbound = {}  # {socket: OutboundQueue}
+        self.write_ready = deque()  #sockets the event loop should start writing to
+        self.wake_pending = False
+        self.wake_recv, self.wake_send = socket.socketpair()
+        self.lock = threading.Lock()
+        self.session_duration = 6 * 60  # 6 minutes session (testing)
+        self.session_end_time = None
+        self.session_active = False
+        self.warning_sent = False
+
+        #students count down locally from the deadline; the server only resends it on resync, pause and extend
+        self.timer_resync_interval = 60
+        self.paused_remaining = None  #seconds left while the session is paused, None while running
+        self.timer_wakeup = threading.Event()  #wakes the timer thread early after a pause, resume, extend or end
+        self.auth = UserAuthentication()
+
+        #always collected (a dict update per event), only exposed once serve_metrics is called
+        self.metrics = Metrics()
+        self.metrics_server = None
+        self.register_metrics()
+
+    #function that declares every metric the server reports
+    def register_metrics(self):
+        metrics = self.metrics
+        metrics.gauge("tutor_connected_students", "Students checked in on this process.", lambda: len(self.roster.by_socket))
+        metrics.gauge("tutor_roster_students", "Students on the roster (every worker in a cluster).", lambda: len(self.roster))
+        metrics.gauge("tutor_open_connections", "Student connections with an outbound queue.", lambda: len(self.outbound))
+        metrics.gauge("tutor_waitlisted_students", "Students waiting for a free seat.", lambda: len(self.waitlist))
+        metrics.gauge("tutor_threads", "Threads alive in the server process.", threading.active_count)
+        metrics.gauge("tutor_outbound_queued_frames", "Frames waiting in the outbound queues, summed over students.", lambda: sum(frames for frames, _ in self.queue_depths().values()))
+        metrics.gauge("tutor_outbound_queued_bytes", "Bytes waiting in the outbound queues, summed over students.", lambda: sum(size for _, size in self.queue_depths().values()))
+        metrics.gauge("tutor_outbound_queue_max_frames", "Frames waiting in the fullest student queue.", lambda: max((frames for frames, _ in self.queue_depths().values()), default=0))
+        metrics.gauge("tutor_session_active", "1 while a session is running.", lambda: int(self.session_active))
+        metrics.counter("tutor_check_ins_total", "Students checked in.")
+        metrics.counter("tutor_check_in_rejects_total", "Check-ins and connections refused, by reason.")
+        metrics.counter("tutor_slow_consumers_dropped_total", "Students disconnected because their outbound queue stayed full.")
+        metrics.counter("tutor_broadcasts_total", "Broadcasts queued, by message type.")
+        metrics.counter("tutor_broadcast_bytes_total", "Bytes queued by broadcasts (frame size times recipients), by message type.")
+        metrics.histogram("tutor_send_latency_seconds", "Time from queueing a frame to writing its last byte to the socket, by message type.")
+        metrics.histogram("tutor_timer_jitter_seconds", "How late the session timer woke up for a scheduled event.", JITTER_BUCKETS)
+
+    #function that exposes the metrics on a loopback HTTP port in the Prometheus text format
+    def serve_metrics(self, port):
+        self.metrics_server = MetricsServer(self.metrics, port, tracer=tracer)
+        self.metrics_server.start()
+
+    #function that records one frame fully written to a student (I/O thread)
+    def record_send(self, msg_type, seconds):
+        self.metrics.observe("tutor_send_latency_seconds", seconds, type=MESSAGE_NAMES.get(msg_type, str(msg_type)))
+
+    #function that registers callback(event, data) for every state change; callbacks run on server threads and must not block
+    def subscribe(self, callback):
+        self.subscribers.append(callback)
+
+    #function that hands one event to every subscriber
+    def publish(self, event, data=None):
+        for callback in self.subscribers:
+            try:
+                callback(event, data)
+            except Exception as e:
+                print(f"Event subscriber failed on {event}: {e}")
+
+    #function that publishes the roster (the roster builds a new dict after every change, so subscribers never see one being changed)
+    def publish_attendance(self):
+        with self.lock:
+            students = self.roster.as_dict()
+        self.publish(EVENT_ATTENDANCE, students)
+
+    #function that handles the clients
+    def handle_client(self, client_socket, addr):
+        print(f"Connection from {addr} established.")
+        decoder = FrameDecoder()
+        while True:
+            try:
+                frames = recv_frames(client_socket, decoder)
+                if frames is None:
+                    break
+                for msg_type, payload in frames:
+                    self.dispatch_message(msg_type, payload, client_socket, addr)
+            except ConnectionResetError:
+                print(f"Connection reset by {addr}.")
+                break
+            except Exception as e:
+                print(f"Error handling client {addr}: {e}")
+                break
+        self.disconnect_client(client_socket)
+
+    #function that handles one frame from a student, timed as a span named after its message type
+    def dispatch_message(self, msg_type, payload, client_socket, addr):
+        with tracer.span(MESSAGE_NAMES.get(msg_type, "unknown")):
+            self.handle_message(msg_type, payload, client_socket, addr)
+
+    #function that routes a frame from a student to the exit or check-in handling
+    def handle_message(self, msg_type, payload, client_socket, addr):
+        if msg_type == EXIT:
+            self.notify_exit(client_socket)
+        elif msg_type == CHECK_IN:
+            self.process_message(payload, client_socket, addr)
+        elif msg_type == ROSTER_RESYNC:
+            with self.lock:
+                self.send_roster_snapshot(client_socket)
+        elif msg_type == CHAT:
+            self.route_chat(payload, client_socket)
+        elif msg_type in (JOIN_ROOM, LEAVE_ROOM):
+            self.change_room(payload.strip().lstrip(ROOM_PREFIX), msg_type == JOIN_ROOM, client_socket)
+        else:
+            print(f"Ignoring unexpected message type {msg_type} from {addr}")
+
+    #function that removes a closed student socket and tells the remaining students
+    def disconnect_client(self, client_socket):
+        with tracer.span("disconnect"):
+            removed = []
+            with self.lock:
+                queue = self.outbound.pop(client_socket, None)
+                if queue:
+                    queue.close()
+                client_socket.close()
+                self.waitlist.discard(client_socket)
+                record = self.roster.for_socket(client_socket)
+            if record is not None:
+                version = self.remove_shared(record.student_id)
+                with self.lock:
+                    if self.roster.get(record.student_id) is record: #not already removed by an EXIT meanwhile
+                        removed.append((record.student_id, self.remove_student(record.student_id, version)))
+                        log_attendance(f"Student {record.student_id} disconnected unexpectedly.")
+            self.publish_attendance()
+            self.broadcast_roster_removals(removed)  #notifies the remaining students
+            if removed:
+                self.admit_waitlisted()
+
+    #function that sends the message across to all students (queues it, never blocks on a slow student)
+    def broadcast_message(self, message, msg_type=TEXT):
+        recipients = self.broadcast_frame(encode_frame(msg_type, message), msg_type)
+        print(f"Sent to {recipients} student(s): {message}")
+
+    #function that broadcasts an encoded frame: every student's queue gets the same immutable bytes, nothing is copied per student; returns the local recipients
+    def broadcast_frame(self, frame, msg_type):
+        with tracer.span("broadcast", type=MESSAGE_NAMES.get(msg_type, str(msg_type))):
+            recipients = self.queue_broadcast(msg_type, frame)
+            if self.cluster:
+                self.cluster.bus.publish(frame) #the other workers pass it on to their students
+        return recipients
+
+    #function that queues an encoded broadcast for every student connected to this process; returns how many
+    def queue_broadcast(self, msg_type, frame):
+        with self.lock:
+            for sock in self.roster.by_socket:
+                self.queue_frame(sock, msg_type, frame)
+            recipients = len(self.roster.by_socket)
+        type_name = MESSAGE_NAMES.get(msg_type, str(msg_type))
+        self.metrics.inc("tutor_broadcasts_total", type=type_name)
+        self.metrics.inc("tutor_broadcast_bytes_total", len(frame) * recipients, type=type_name)
+        return recipients
+
+    #function that queues one encoded frame for a student and hands the socket to the I/O layer
+    def queue_frame(self, client_socket, msg_type, frame):
+        queue = self.outbound.get(client_socket)
+        if queue is None:
+            return
+        if not queue.push(msg_type, frame):
+            self.drop_slow_consumer(client_socket, queue)
+        elif self.event_loop:
+            self.write_ready.append(client_socket)
+            if not self.wake_pending:
+                self.wake_pending = True
+                self.wake_send.send(b"\0")
+
+    #function that disconnects a student whose queue stays full; the normal disconnect path then cleans up
+    def drop_slow_consumer(self, client_socket, queue):
+        print("Disconnecting a student whose outbound queue stays full.")
+        self.metrics.inc("tutor_slow_consumers_dropped_total")
+        queue.close()
+        try:
+            client_socket.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+
+    #function that returns {student_id: (queued frames, queued bytes)} for monitoring
+    def queue_depths(self):
+        with self.lock:
+            return {record.student_id: self.outbound[sock].depth() for sock, record in self.roster.connected() if sock in self.outbound}
+
+    #function that drains one student's queue from its own writer thread (thread-per-client mode)
+    def write_client(self, client_socket, queue):
+        while queue.wait():
+            try:
+                queue.write_to(client_socket)
+            except OSError:
+                break
+
+    #function that notifies the tutor of the student's exit; the student is the one on the connection, not whatever id the frame names
+    def notify_exit(self, client_socket):
+        removed = []
+        with self.lock:
+            record = self.roster.for_socket(client_socket)
+            if record is None:
+                return #not checked in (or already gone)
+            student_id = record.student_id
+            log_attendance(f"Student {student_id} ({record.name}, port {record.port}) has exited the session.")
+        version = self.remove_shared(student_id)
+        with self.lock:
+            if self.roster.get(student_id) is not record:
+                return #the disconnect path got there first
+            removed.append((student_id, self.remove_student(student_id, version)))
+        print(f"Student {student_id} has exited the session.")
+        self.broadcast_message(f"{student_id} has exited the session.")
+        self.publish_attendance()
+        self.broadcast_roster_removals(removed)  # broadcast the roster change here
+        if removed:
+            self.admit_waitlisted()
+
+    #function that takes a student off the shared roster; returns its new version, or None outside a cluster
+    #(called without self.lock, the shared roster may wait on another worker like check-in does)
+    def remove_shared(self, student_id):
+        return self.cluster.roster.remove(student_id) if self.cluster else None
+
+    #function that removes a student and returns the new roster version (caller holds self.lock)
+    #version is what remove_shared returned, None bumps this process's own version
+    def remove_student(self, student_id, version=None):
+        for room in self.student_rooms.pop(student_id, ()):
+            members = self.rooms[room]
+            members.discard(student_id)
+            if not members:
+                del self.rooms[room]
+        self.roster.remove(student_id, version)
+        return self.roster.version
+
+    #function that sends the full versioned roster to one student (caller holds self.lock)
+    def send_roster_snapshot(self, client_socket):
+        if self.cluster:
+            #the shared roster, not this worker's mirror, which may still be waiting on a bus message
+            version, students = self.cluster.roster.snapshot()
+            snapshot = f"{version}|" + ",".join(f"{port}-{student_id}-{student_name}" for student_id, student_name, port in students)
+        else:
+            snapshot = self.roster.snapshot()
+        self.queue_frame(client_socket, ATTENDANCE_LIST, encode_frame(ATTENDANCE_LIST, snapshot))
+
+    #function that tells every student which students left, one delta per removal
+    def broadcast_roster_removals(self, removed):
+        for student_id, version in removed:
+            self.broadcast_message(f"{version}|{student_id}", ROSTER_REMOVE)
+
+    #function that processes the messages to the students
+    def process_message(self, message, client_socket, addr):
+        try:
+            parts = message.split(';')
+            if len(parts) < 3:
+                print(f"Ignoring malformed message (not enough parts): {message}")
+                return
+
+            student_id = parts[0].split(':')[1].strip()
+            student_name = parts[1].split(':')[1].strip()
+            student_listen_port = parts[2].split(':')[1].strip()  #student's actual listening port
+
+        except (IndexError, ValueError) as e:
+            print(f"Malformed message received: {message} — Error: {e}")
+            return
+
+        error_message = self.check_in_student(student_id, student_name, student_listen_port, client_socket)
+        if error_message == SESSION_FULL:
+            with self.lock:
+                position = self.waitlist.add(student_id, student_name, student_listen_port, client_socket)
+            if position is not None:
+                print(f"Session full, {student_name} (ID: {student_id}) is number {position} on the waitlist")
+                self.queue_frame(client_socket, WAITLISTED, encode_frame(WAITLISTED, str(position)))
+                return
+        if error_message:
+            self.metrics.inc("tutor_check_in_rejects_total", reason=REJECT_REASONS.get(error_message, "other"))
+            self.queue_frame(client_socket, ERROR, encode_frame(ERROR, error_message))
+
+    #function that relays a chat message from a checked-in student to one student or to everyone else in a room
+    def route_chat(self, payload, client_socket):
+        recipient, _, text = payload.partition("|")
+        recipient = recipient.strip()
+        with self.lock:
+            record = self.roster.for_socket(client_socket)
+            if record is None or not recipient:
+                return #only checked-in students chat
+            sender = record.student_id
+            relayed = f"{sender}|{recipient}|{text}"
+            delivered = self.deliver_chat(relayed, sender, recipient)
+
+        #in a cluster the recipient or other room members may be on another worker
+        if self.cluster and (recipient.startswith(ROOM_PREFIX) or not delivered):
+            self.cluster.bus.publish(encode_frame(BUS_CHAT, relayed))
+        elif not delivered:
+            self.queue_frame(client_socket, TEXT, encode_frame(TEXT, f"Student {recipient} is not checked in."))
+
+    #function that queues a relayed chat for local recipients; returns False if a direct recipient is not here (caller holds self.lock)
+    def deliver_chat(self, relayed, sender, recipient):
+        frame = encode_frame(CHAT, relayed)
+        if recipient.startswith(ROOM_PREFIX):
+            for student_id in self.rooms.get(recipient[len(ROOM_PREFIX):], ()):
+                if student_id != sender:
+                    self.queue_frame(self.roster.get(student_id).sock, CHAT, frame)
+            return True
+        record = self.roster.get(recipient)
+        if record is None or record.sock is None:
+            return False
+        self.queue_frame(record.sock, CHAT, frame)
+        return True
+
+    #function that adds a checked-in student to a room or takes them out of it
+    def change_room(self, room, join, client_socket):
+        with self.lock:
+            record = self.roster.for_socket(client_socket)
+            if record is None or not room:
+                return
+            student_id = record.student_id
+            if join:
+                self.rooms.setdefault(room, set()).add(student_id)
+                self.student_rooms.setdefault(student_id, set()).add(room)
+            elif room in self.student_rooms.get(student_id, ()):
+                self.student_rooms[student_id].discard(room)
+                self.rooms[room].discard(student_id)
+                if not self.rooms[room]:
+                    del self.rooms[room]
+            notice = f"{'Joined' if join else 'Left'} room {ROOM_PREFIX}{room}."
+            self.queue_frame(client_socket, TEXT, encode_frame(TEXT, notice))
+
+    #function that admits waitlisted students, in order, while seats are free
+    def admit_waitlisted(self):
+        while True:
+            with self.lock:
+                entry = self.waitlist.pop()
+            if entry is None:
+                return
+            student_id, student_name, port, client_socket = entry
+            error_message = self.check_in_student(student_id, student_name, port, client_socket)
+            if error_message == SESSION_FULL:
+                with self.lock:
+                    self.waitlist.push_front(entry)
+                return
+            if error_message:
+                self.queue_frame(client_socket, ERROR, encode_frame(ERROR, error_message))
+
+    #function that checks a student in; returns None, or the reason they were refused
+    def check_in_student(self, student_id, student_name, student_listen_port, client_socket):
+        with self.lock:
+            if self.roster.for_socket(client_socket) is not None or self.waitlist.holds(client_socket):
+                return ALREADY_CHECKED_IN #one student per connection, a second CHECK_IN would leave the first id behind
+            if self.waitlist.contains(student_id):
+                return DUPLICATE_ID
+
+        #in a cluster the shared roster decides for every worker (outside self.lock, it may wait on another worker)
+        if self.cluster:
+            error_message, version, count = self.cluster.roster.check_in(student_id, student_name, student_listen_port, self.cluster.worker_id, self.student_limit)
+
+        with self.lock:
+            if self.cluster is None:
+                if student_id in self.roster:
+                    error_message = DUPLICATE_ID
+                elif student_listen_port != ROUTED_PORT and self.roster.for_port(student_listen_port) is not None:
+                    error_message = DUPLICATE_PORT
+                elif len(self.roster) >= self.student_limit:
+                    error_message = SESSION_FULL
+                else:
+                    error_message = None
+            if error_message:
+                return error_message
+
+            record = self.roster.add(student_id, student_name, student_listen_port, client_socket, version if self.cluster else None)
+            if self.cluster is None:
+                version, count = self.roster.version, len(self.roster)
+            added = f"{version}|{record.entry}"
+            log_attendance(f"Student checked in: {student_id} - {student_name} (Port: {student_listen_port})")
+            print(f"Student checked in: {student_name} (ID: {student_id}) on port {student_listen_port}")
+            self.send_acknowledgment(client_socket)
+            self.send_roster_snapshot(client_socket)  #the new student gets the full roster once
+            self.metrics.inc("tutor_check_ins_total")
+            if self.session_active:
+                self.queue_frame(client_socket, SESSION_DEADLINE, encode_frame(SESSION_DEADLINE, self.deadline_message()))
+
+        self.publish_attendance()
+        self.broadcast_message(added, ROSTER_ADD)  #everyone else only gets the new entry
+
+        if count == 1 and not self.session_active:
+            self.begin_session()
+        return None
+
+    #function that starts the session for the first student; in a cluster the first worker to claim it asks the primary to run the timer
+    def begin_session(self):
+        if self.cluster is None:
+            self.start_session()
+        elif self.cluster.roster.claim_session():
+            if self.cluster.primary:
+                self.start_session()
+            else:
+                self.cluster.bus.publish(encode_frame(BUS_SESSION_START))
+
+    #function that starts the session clock and the timer threads
+    def start_session(self):
+        if self.session_active:
+            return
+        self.session_end_time = time.time() + self.session_duration
+        self.paused_remaining = None
+        self.session_active = True
+        self.warning_sent = False
+        log_attendance("Session started.")
+        self.publish(EVENT_SESSION_STARTED)
+        threading.Thread(target=self.session_timer, daemon=True).start()
+
+    #function that tells the other workers the session is over
+    def publish_session_end(self):
+        if self.cluster:
+            self.cluster.roster.end_session()
+            self.cluster.bus.publish(encode_frame(BUS_SESSION_END))
+
+    #function that applies a broadcast from another worker to this worker's state, then passes it on to this worker's students
+    def apply_cluster_frame(self, msg_type, payload):
+        if msg_type == BUS_SESSION_START:
+            if self.cluster.primary:
+                self.start_session()
+            return
+        if msg_type == BUS_SESSION_END:
+            self.session_active = False
+            self.paused_remaining = None
+            self.publish(EVENT_SESSION_ENDED)
+            self.publish_attendance()
+            return
+        if msg_type == BUS_CHAT:
+            sender, recipient, _ = payload.split("|", 2)
+            with self.lock:
+                self.deliver_chat(payload, sender, recipient)
+            return
+
+        with self.lock:
+            if msg_type == ROSTER_ADD:
+                version, _, entry = payload.partition("|")
+                port, student_id, student_name = entry.split("-", 2)
+                self.roster.add(student_id, student_name, port, version=int(version))
+            elif msg_type == ROSTER_REMOVE:
+                version, _, student_id = payload.partition("|")
+                self.roster.remove(student_id, int(version))
+                threading.Thread(target=self.admit_waitlisted, daemon=True).start() #a seat freed on another worker
+            elif msg_type == SESSION_DEADLINE:
+                #only the primary runs the timer; the others keep the deadline so they can brief students who check in
+                remaining, _, state = payload.partition("|")
+                if state == "paused":
+                    self.paused_remaining = float(remaining)
+                else:
+                    self.session_end_time = time.time() + float(remaining)
+                    self.paused_remaining = None
+                self.session_active = True
+        if msg_type in (ROSTER_ADD, ROSTER_REMOVE):
+            self.publish_attendance()
+        self.queue_broadcast(msg_type, encode_frame(msg_type, payload))
+
+    #function that sends the acknowledgment to all students upon checking in
+    def send_acknowledgment(self, client_socket):
+        timestamp = datetime.now().strftime("%d-%m-%Y %H:%M:%S")
+        ack_message = f"Check-in acknowledged at {timestamp}"
+        self.queue_frame(client_socket, ACK, encode_frame(ACK, ack_message))
+
+    #function that returns (seconds remaining, paused)
+    def remaining_time(self):
+        paused_remaining = self.paused_remaining
+        if paused_remaining is not None:
+            return paused_remaining, True
+        return self.session_end_time - time.time(), False
+
+    #function that builds the deadline sync message
+    def deadline_message(self):
+        remaining, paused = self.remaining_time()
+        return f"{max(remaining, 0):.3f}|{'paused' if paused else 'running'}"
+
+    #function that sends the deadline to every student (they count down on their own until the next one)
+    def broadcast_deadline(self):
+        self.broadcast_message(self.deadline_message(), SESSION_DEADLINE)
+        self.publish(EVENT_TIMER, self.remaining_time())
+
+    #function that pauses the session clock
+    def pause_session(self):
+        if self.session_active and self.paused_remaining is None:
+            self.paused_remaining = max(self.session_end_time - time.time(), 0)
+            log_attendance("Session paused.")
+            self.broadcast_deadline()
+            self.timer_wakeup.set()
+
+    #function that resumes a paused session clock
+    def resume_session(self):
+        if self.session_active and self.paused_remaining is not None:
+            self.session_end_time = time.time() + self.paused_remaining
+            self.paused_remaining = None
+            log_attendance("Session resumed.")
+            self.broadcast_deadline()
+            self.timer_wakeup.set()
+
+    #function that adds time to the session
+    def extend_session(self, seconds):
+        if not self.session_active:
+            return
+        if self.paused_remaining is not None:
+            self.paused_remaining += seconds
+        else:
+            self.session_end_time += seconds
+        if self.remaining_time()[0] > 5 * 60:
+            self.warning_sent = False #the 5-minute warning is due again
+        log_attendance(f"Session extended by {seconds} seconds.")
+        self.broadcast_deadline()
+        self.timer_wakeup.set()
+
+    #function that updates the session timer: sleeps until the next event (warning, end, resync) instead of ticking every second
+    def session_timer(self):
+        print("Session timer started.")
+        self.broadcast_deadline()
+        next_resync = time.monotonic() + self.timer_resync_interval
+        previous_remaining = None  #the warning goes out when the clock crosses 5:00, never for a session that starts shorter
+        while self.session_active:
+            self.timer_wakeup.clear()
+            remaining, paused = self.remaining_time()
+            crossed_warning = previous_remaining is not None and previous_remaining > 5 * 60 >= remaining
+            previous_remaining = remaining
+
+            if not paused and remaining <= 0:
+                self.broadcast_message("The session has ended.")
+                self.session_active = False
+                self.publish_session_end()
+                log_attendance("Session ended.")
+                self.publish(EVENT_SESSION_ENDED)
+                self.publish_attendance()
+                print("Session ended.")
+                break
+
+            #send 5-minute warning once
+            if not paused and crossed_warning and not self.warning_sent:
+                self.broadcast_message("Warning: 5 minutes remaining in the session!")
+                print("Sent 5-minute warning.")
+                log_attendance("Sent 5-minute warning.")
+                self.warning_sent = True
+                self.publish(EVENT_WARNING)
+
+            #occasional resync so clients that drifted or missed an event catch up
+            now = time.monotonic()
+            if now >= next_resync:
+                self.broadcast_deadline()
+                next_resync = now + self.timer_resync_interval
+
+            #sleeps until the resync, the warning or the end, whichever is first
+            wait = next_resync - now
+            if not paused:
+                wait = min(wait, remaining - 5 * 60 if remaining > 5 * 60 and not self.warning_sent else remaining)
+            wait = max(wait, 0)
+            if not self.timer_wakeup.wait(wait):
+                self.metrics.observe("tutor_timer_jitter_seconds", max(time.monotonic() - now - wait, 0))
+
+    #function that notifies that the session has ended
+    def notify_end_of_session(self):
+        self.session_active = False
+        self.paused_remaining = None
+        self.timer_wakeup.set()
+        self.broadcast_message("The session has ended.")
+        self.publish_session_end()
+        log_attendance("Session ended manually.")
+        self.publish(EVENT_SESSION_ENDED)
+        self.publish_attendance()
+
+    #function that starts the server
+    def start(self):
+        print("Server is starting...")
+        if self.cluster:
+            threading.Thread(target=self.cluster.bus.listen, args=(self.apply_cluster_frame,), daemon=True).start()
+        if self.event_loop:
+            self.run_event_loop()
+            return
+        try:
+            while True:
+                try:
+                    client_socket, addr = self.server_socket.accept()
+                    if not self.admit_connection(client_socket, addr):
+                        continue
+                    queue = self.new_outbound_queue(client_socket)
+                    threading.Thread(target=self.handle_client, args=(client_socket, addr), daemon=True).start()
+                    threading.Thread(target=self.write_client, args=(client_socket, queue), daemon=True).start()
+                except OSError as e:
+                    print(f"Socket error: {e}")
+                    break
+        finally:
+            self.server_socket.close()
+            print("Server has been shut down.")
+
+    #function that waits (up to timeout seconds) for every student's queued frames to go out, e.g. the end-of-session message on shutdown
+    def wait_for_outbound(self, timeout=2.0):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if not any(frames for frames, _ in self.queue_depths().values()):
+                return True
+            time.sleep(0.05)
+        return False
+
+    #function that ends a running session, gives its last messages a moment to go out and flushes the log (window closed or daemon stopped)
+    def shutdown(self):
+        if self.session_active:
+            self.notify_end_of_session()
+            self.wait_for_outbound()
+        if self.metrics_server:
+            self.metrics_server.close()
+        close_attendance_log()
+
+    #function that turns a connection away before any thread, queue or parsing is spent on it; returns False if it was closed
+    def admit_connection(self, client_socket, addr):
+        #reconnect storm from one source: dropped without a reply
+        if self.rate_limiter and not self.rate_limiter.allow(addr[0]):
+            self.metrics.inc("tutor_check_in_rejects_total", reason="rate_limited")
+            client_socket.close()
+            return False
+
+        #no seat and no room to wait: the pre-encoded refusal, then close
+        if len(self.roster) >= self.student_limit and not self.waitlist.has_room():
+            self.metrics.inc("tutor_check_in_rejects_total", reason="full_at_accept")
+            try:
+                client_socket.setblocking(False)
+                client_socket.send(self.full_frame)
+            except OSError:
+                pass
+            client_socket.close()
+            return False
+        return True
+
+    #function that creates the outbound queue for a newly accepted student
+    def new_outbound_queue(self, client_socket):
+        queue = OutboundQueue(self.max_queued_frames, self.slow_consumer_timeout, self.queue_policies, on_sent=self.record_send, vectored=self.vectored_send)
+        with self.lock:
+            self.outbound[client_socket] = queue
+        return queue
+
+    #function that writes a student's queue from the event loop and only watches for writability while it is not empty
+    def flush_outbound(self, selector, client_socket):
+        queue = self.outbound.get(client_socket)
+        try:
+            key = selector.get_key(client_socket)
+        except (KeyError, ValueError):
+            return
+        try:
+            done = queue is None or queue.write_to(client_socket)
+        except OSError:
+            done = True #the read side sees the error and disconnects
+        events = selectors.EVENT_READ if done else selectors.EVENT_READ | selectors.EVENT_WRITE
+        if key.events != events:
+            selector.modify(client_socket, events, key.data)
+
+    #function that serves every student from a single selector loop (no thread per student)
+    def run_event_loop(self):
+        selector = selectors.DefaultSelector()
+        self.server_socket.setblocking(False)
+        self.wake_recv.setblocking(False)
+        selector.register(self.server_socket, selectors.EVENT_READ, None)
+        selector.register(self.wake_recv, selectors.EVENT_READ, "wake")
+        try:
+            while True:
+                for key, events in selector.select():
+                    #new student connecting
+                    if key.data is None:
+                        try:
+                            client_socket, addr = self.server_socket.accept()
+                        except BlockingIOError:
+                            continue
+                        if not self.admit_connection(client_socket, addr):
+                            continue
+                        print(f"Connection from {addr} established.")
+                        client_socket.setblocking(False)
+                        self.new_outbound_queue(client_socket)
+                        selector.register(client_socket, selectors.EVENT_READ, (addr, FrameDecoder()))
+                        continue
+
+                    #another thread queued frames
+                    if key.data == "wake":
+                        self.wake_pending = False
+                        try:
+                            self.wake_recv.recv(4096)
+                        except BlockingIOError:
+                            pass
+                        while self.write_ready:
+                            self.flush_outbound(selector, self.write_ready.popleft())
+                        continue
+
+                    client_socket, (addr, decoder) = key.fileobj, key.data
+                    if events & selectors.EVENT_WRITE:
+                        self.flush_outbound(selector, client_socket)
+                        if not events & selectors.EVENT_READ:
+                            continue
+
+                    #data (or a close) from a connected student
+                    try:
+                        frames = recv_frames(client_socket, decoder)
+                        if frames is not None:
+                            for msg_type, payload in frames:
+                                self.dispatch_message(msg_type, payload, client_socket, addr)
+                            continue
+                    except BlockingIOError:
+                        continue
+                    except ConnectionResetError:
+                        print(f"Connection reset by {addr}.")
+                    except Exception as e:
+                        print(f"Error handling client {addr}: {e}")
+                    selector.unregister(client_socket)
+                    self.disconnect_client(client_socket)
+        except OSError as e:
+            print(f"Socket error: {e}")
+        finally:
+            selector.close()
+            self.server_socket.close()
+            print("Server has been shut down.")
+
+#function that runs the server without a window until SIGTERM or Ctrl+C, then ends the session and flushes the log
+def run_headless(server):
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda signum, frame: stop.set())
+    server.subscribe(print_event)
+    threading.Thread(target=server.start, daemon=True).start()
+    try:
+        while not stop.wait(1.0):
+            pass
+    except KeyboardInterrupt:
+        pass
+    print("Shutting down...")
+    server.shutdown()
+
+#function that runs one extra worker process of a cluster: same port, own log file, no window (the primary process shows it)
+def run_cluster_worker(worker_id, workers, event_loop=False, log_options=None, port=5000, db_path=CLUSTER_DB_FILE, bus_port=BUS_BASE_PORT, admission=None, metrics_port=None):
+    global ATTENDANCE_LOG_FILE
+    ATTENDANCE_LOG_FILE = f"attendance_log_worker{worker_id}.txt" #processes never share a log file, so rotation cannot race
+    configure_attendance_log(**(log_options or {}))
+    install_trace_signals()
+    server = TutorServer(port=port, event_loop=event_loop, cluster=ClusterMember(worker_id, workers, db_path, bus_port), **(admission or {}))
+    if metrics_port:
+        server.serve_metrics(metrics_port + worker_id) #one endpoint per worker, scraped side by side
+    try:
+        server.start()
+    finally:
+        close_attendance_log()
+
+#main function
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Tutor attendance server")
+    parser.add_argument("--headless", action="store_true", help="run as a daemon without a window (tkinter is never imported)")
+    parser.add_argument("--event-loop", action="store_true", help="serve all students from one selector loop instead of one thread per student")
+    parser.add_argument("--log-fsync", choices=["never", "batch", "always"], default="batch", help="when the attendance log is fsynced")
+    parser.add_argument("--log-max-bytes", type=int, default=10 * 1024 * 1024, help="rotate the attendance log at this size")
+    parser.add_argument("--log-rotate-seconds", type=float, default=None, help="rotate the attendance log after this many seconds")
+    parser.add_argument("--workers", type=int, default=1, help="worker processes accepting on the same port (SO_REUSEPORT, Linux/BSD only)")
+    parser.add_argument("--capacity", type=int, default=3, help="students allowed in a session")
+    parser.add_argument("--backlog", type=int, default=3, help="listen backlog (pending connections the kernel holds)")
+    parser.add_argument("--waitlist", type=int, default=0, help="students that may wait for a free seat (0 turns the waitlist off)")
+    parser.add_argument("--connect-rate", type=float, default=None, help="new connections per second allowed from one address")
+    parser.add_argument("--connect-burst", type=int, default=10, help="connections one address may open back to back")
+    parser.add_argument("--metrics-port", type=int, default=None, help="serve Prometheus metrics on 127.0.0.1 at this port (workers use the following ports)")
+    args = parser.parse_args()
+    log_options = {"fsync": args.log_fsync, "max_bytes": args.log_max_bytes, "rotate_interval": args.log_rotate_seconds}
+    admission = {"student_limit": args.capacity, "backlog": args.backlog, "waitlist_limit": args.waitlist, "connect_rate": args.connect_rate, "connect_burst": args.connect_burst}
+    configure_attendance_log(**log_options)
+    install_trace_signals() #SIGUSR1 starts/stops profiling, SIGUSR2 dumps the trace
+
+    #several processes share the port; the roster lives in SQLite and broadcasts cross over a local UDP bus
+    cluster = None
+    if args.workers > 1:
+        SharedRoster().reset()
+        for worker_id in range(1, args.workers):
+            multiprocessing.Process(target=run_cluster_worker, args=(worker_id, args.workers, args.event_loop, log_options), kwargs={"admission": admission, "metrics_port": args.metrics_port}, daemon=True).start()
+        cluster = ClusterMember(0, args.workers)
+
+    server = TutorServer(event_loop=args.event_loop, cluster=cluster, **admission)
+    if args.metrics_port:
+        server.serve_metrics(args.metrics_port)
+    if args.headless:
+        run_headless(server)
+    else:
+        from NoRawSocketsTutGUI import TutorGUI #only the windowed mode loads tkinter
+        gui = TutorGUI(server)  #subscribes to the server's events
+        threading.Thread(target=server.start, daemon=True).start()
+        gui.root.mainloop()
\ No newline at end of file
@@ -0,0 +1,117 @@
+import time #for capping the roster refresh rate
+import threading #shuts the server down without freezing the window
+import tkinter as Tkinter #tutor's GUI
+import NoRawSocketsCommon #puts ../Common (modules shared with the raw variant) on the import path
+from RosterView import RosterView, ROSTER_REFRESH_MS #attendance table that redraws only changed rows
+from TutorTrace import tracer #times the roster redraws
+from TutorEvents import EventQueue, EVENT_ATTENDANCE, EVENT_SESSION_STARTED, EVENT_TIMER, EVENT_SESSION_ENDED #the server only publishes events, the window renders them
+
+EVENT_POLL_MS = 50 #how often the Tk main thread drains the server's events
+
+#tutor's GUI class
+class TutorGUI:
+    def __init__(self, server):
+        self.server = server
+        self.root = Tkinter.Tk()
+        self.root.title("Tutor Control Panel")
+
+        self.end_button = Tkinter.Button(self.root, text="End Session", command=self.end_session)
+        self.end_button.pack(pady=10)
+
+        self.pause_button = Tkinter.Button(self.root, text="Pause Session", command=self.toggle_pause)
+        self.pause_button.pack(pady=5)
+
+        self.extend_button = Tkinter.Button(self.root, text="Extend 5 Minutes", command=lambda: self.server.extend_session(5 * 60))
+        self.extend_button.pack(pady=5)
+
+        self.attendance_display = RosterView(self.root, height=10)
+        self.attendance_display.pack(pady=10, fill="both", expand=True)
+        self.pending_students = None  #latest roster snapshot not drawn yet
+        self.last_roster_refresh = 0.0
+
+        self.timer_label = Tkinter.Label(self.root, text="Session Timer: Not Started")
+        self.timer_label.pack(pady=10)
+
+        self.timer_after_id = None
+        self.events = EventQueue(self.server)  #Tk is not thread-safe, so server threads only queue events here
+        self.root.after(EVENT_POLL_MS, self.drain_events)
+
+        self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
+
+    #function that applies every queued server event on the Tk main thread
+    def drain_events(self):
+        for event, data in self.events.drain():
+            if event == EVENT_ATTENDANCE:
+                self.pending_students = data  #only the newest snapshot matters, older ones are skipped
+            elif event in (EVENT_SESSION_STARTED, EVENT_TIMER):
+                self.update_timer()
+            elif event == EVENT_SESSION_ENDED:
+                self.show_session_ended()
+
+        #a burst of joins and leaves becomes one redraw, at most every ROSTER_REFRESH_MS
+        now = time.monotonic()
+        if self.pending_students is not None and now - self.last_roster_refresh >= ROSTER_REFRESH_MS / 1000:
+            self.update_attendance_display(self.pending_students)
+            self.pending_students = None
+            self.last_roster_refresh = now
+        self.root.after(EVENT_POLL_MS, self.drain_events)
+
+    #function that ends the session upon the button being clicked
+    def end_session(self):
+        if self.server.session_active:
+            self.server.notify_end_of_session()
+            self.server.session_active = False
+
+    #function that pauses or resumes the session clock
+    def toggle_pause(self):
+        if self.server.paused_remaining is None:
+            self.server.pause_session()
+            self.pause_button.config(text="Resume Session")
+        else:
+            self.server.resume_session()
+            self.pause_button.config(text="Pause Session")
+
+    #function that updates the session timer once a second from the server's deadline
+    def update_timer(self):
+        if self.timer_after_id is not None:
+            self.root.after_cancel(self.timer_after_id)
+            self.timer_after_id = None
+        if not self.server.session_active:
+            return
+        remaining_time, paused = self.server.remaining_time()
+        if remaining_time > 0:
+            minutes, seconds = divmod(int(remaining_time), 60)
+            self.timer_label.config(text=f"Session Timer: {minutes:02}:{seconds:02}{' (paused)' if paused else ''}")
+            self.timer_after_id = self.root.after(1000, self.update_timer)
+        else:
+            self.timer_label.config(text="Session Timer: Time's Up!")
+
+    #function that stops the countdown once the session is over
+    def show_session_ended(self):
+        if self.timer_after_id is not None:
+            self.root.after_cancel(self.timer_after_id)
+            self.timer_after_id = None
+        self.timer_label.config(text="Session Timer: Session has Ended")
+
+    #function that updates the attendance displayed in the tutor's GUI (only rows that changed are redrawn)
+    def update_attendance_display(self, students):
+        with tracer.span("roster_redraw", rows=len(students)):
+            self.attendance_display.show({student_id: (port, student_name) for student_id, (student_name, port) in students.items()})
+
+    #function that ends the session and flushes the log when the window is closed
+    #shutdown waits for the outbound queues and the log writer, so it runs on a worker while the window stays responsive
+    def on_closing(self):
+        self.root.protocol("WM_DELETE_WINDOW", lambda: None) #one shutdown is enough
+        for button in (self.end_button, self.pause_button, self.extend_button):
+            button.config(state='disabled')
+        self.timer_label.config(text="Session Timer: Closing...")
+        shutdown_thread = threading.Thread(target=self.server.shutdown)
+        shutdown_thread.start()
+        self.destroy_after(shutdown_thread)
+
+    #function that closes the window once the shutdown thread has finished (polled from the Tk main loop, Tk is not thread-safe)
+    def destroy_after(self, shutdown_thread):
+        if shutdown_thread.is_alive():
+            self.root.after(EVENT_POLL_MS, self.destroy_after, shutdown_thread)
+        else:
+            self.root.destroy()
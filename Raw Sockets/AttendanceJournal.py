@@ -0,0 +1,143 @@
+import os #for file checks and atomic replace
+try:
+    import fcntl #locks the journal so appends and compaction never interleave
+except ImportError:
+    fcntl = None
+try:
+    import msvcrt #byte-range lock on Windows, where fcntl does not exist
+except ImportError:
+    msvcrt = None
+
+#the attendance list is an append-only journal of join and leave records:
+#  JOIN port-student_id-name
+#  LEAVE port-student_id
+#readers remember their byte offset and only parse what was appended since their last read
+JOIN = "JOIN"
+LEAVE = "LEAVE"
+
+#function that takes an exclusive lock on an open file until it is closed (no lock where neither fcntl nor msvcrt exists)
+def lock_file(f):
+    if fcntl:
+        fcntl.flock(f, fcntl.LOCK_EX)
+    elif msvcrt:
+        f.seek(0) #every writer locks the first byte; appends still go to the end
+        while True:
+            try:
+                msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                return
+            except OSError:
+                continue #LK_LOCK gives up after about 10 s, keep waiting like flock does
+
+#function that opens the journal for appending under an exclusive lock, retrying if compaction replaced the file meanwhile
+def open_locked(path):
+    while True:
+        f = open(path, "a")
+        lock_file(f)
+        try:
+            if os.fstat(f.fileno()).st_ino == os.stat(path).st_ino:
+                return f
+        except FileNotFoundError:
+            pass
+        f.close() #we locked a file that was swapped out underneath us
+
+#function that appends one record to the journal
+def append_record(path, record):
+    with open_locked(path) as f:
+        f.write(record + "\n")
+
+#function that records a student joining
+def record_join(path, port, student_id, name):
+    append_record(path, f"{JOIN} {port}-{student_id}-{name}")
+
+#function that records a student leaving
+def record_leave(path, port, student_id):
+    append_record(path, f"{LEAVE} {port}-{student_id}")
+
+#function that parses one record, returns (kind, port, student_id, name) or None for a malformed line
+def parse_record(line):
+    kind, _, body = line.strip().partition(" ")
+    try:
+        if kind == JOIN:
+            port, student_id, name = body.split("-")
+            return kind, port, student_id, name
+        if kind == LEAVE:
+            port, student_id = body.split("-")
+            return kind, port, student_id, None
+    except ValueError:
+        pass
+    return None
+
+#incremental reader: keeps its own roster and applies only the records appended since the last read
+class JournalReader:
+    #initialization
+    def __init__(self, path):
+        self.path = path
+        self.offset = 0
+        self.inode = None
+        self.partial = b""  #an unfinished last line, completed by the next read
+        self.roster = {}  #{student_id: (name, port)} in join order
+        self.dead_records = 0  #leave records plus the joins they cancelled (what compaction would remove)
+
+    #function that reads the new tail; returns (reset, joined, left)
+    #reset is True when the journal was truncated or compacted and the roster was rebuilt from the start,
+    #joined is [(student_id, name, port)] and left is [(student_id, port)] for the records applied
+    def read_new(self):
+        reset = False
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            st = None
+
+        #a new inode (compaction) or a shorter file (fresh session) means starting over
+        if st is None or st.st_ino != self.inode or st.st_size < self.offset:
+            reset = self.inode is not None or bool(self.roster)
+            self.inode = st.st_ino if st else None
+            self.offset = 0
+            self.partial = b""
+            self.roster.clear()
+            self.dead_records = 0
+        if st is None or st.st_size == self.offset:
+            return reset, [], []
+
+        with open(self.path, "rb") as f:
+            f.seek(self.offset)
+            data = f.read()
+        self.offset += len(data)
+        *lines, self.partial = (self.partial + data).split(b"\n")
+
+        joined, left = [], []
+        for line in lines:
+            record = parse_record(line.decode("utf-8", errors="ignore"))
+            if record is None:
+                continue
+            kind, port, student_id, name = record
+            if kind == JOIN and student_id not in self.roster:
+                self.roster[student_id] = (name, port)
+                joined.append((student_id, name, port))
+            elif kind == LEAVE and self.roster.get(student_id, (None, None))[1] == port:
+                del self.roster[student_id]
+                left.append((student_id, port))
+                self.dead_records += 2
+            else:
+                self.dead_records += 1 #duplicate join or leave for someone not present
+        return reset, joined, left
+
+#function that rewrites the journal with only the students still present (drops tombstones)
+def compact(path):
+    try:
+        f = open_locked(path)
+    except FileNotFoundError:
+        return 0
+    with f:
+        reader = JournalReader(path)
+        reader.read_new()
+        if not reader.dead_records:
+            return 0
+        temp_path = path + ".compact"
+        with open(temp_path, "w") as out:
+            for student_id, (name, port) in reader.roster.items():
+                out.write(f"{JOIN} {port}-{student_id}-{name}\n")
+            out.flush()
+            os.fsync(out.fileno())
+        os.replace(temp_path, path) #readers notice the new inode and reread from the start
+        return reader.dead_records
@@ -0,0 +1,155 @@
+import sqlite3 #embedded database for the optional roster/attendance backend
+import threading #one connection per thread
+import time #for join/leave timestamps
+
+DATABASE_FILE = "attendance.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    started_at REAL NOT NULL,
+    ended_at REAL
+);
+CREATE TABLE IF NOT EXISTS roster (
+    student_id TEXT NOT NULL,
+    port TEXT NOT NULL,
+    name TEXT NOT NULL,
+    session_id INTEGER NOT NULL REFERENCES sessions(id),
+    joined_at REAL NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS roster_student_id ON roster(student_id);
+CREATE UNIQUE INDEX IF NOT EXISTS roster_port ON roster(port);
+CREATE TABLE IF NOT EXISTS attendance (
+    session_id INTEGER NOT NULL REFERENCES sessions(id),
+    student_id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    port TEXT NOT NULL,
+    joined_at REAL NOT NULL,
+    left_at REAL
+);
+CREATE INDEX IF NOT EXISTS attendance_session ON attendance(session_id, student_id);
+"""
+
+#SQLite (WAL mode) store for the live roster and per-session attendance history
+#the roster's unique indexes make check-in atomic: two students can never hold the same id or port
+class AttendanceStore:
+    #initialization
+    def __init__(self, path=DATABASE_FILE, busy_timeout=5.0):
+        self.path = path
+        self.busy_timeout = busy_timeout
+        self.local = threading.local()
+        conn = self.connection()
+        conn.execute("PRAGMA journal_mode=WAL") #readers never block the writer and vice versa
+        conn.executescript(SCHEMA)
+
+    #function that returns this thread's connection (sqlite connections are not shared between threads)
+    def connection(self):
+        conn = getattr(self.local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=self.busy_timeout, isolation_level=None)
+            conn.execute("PRAGMA synchronous=NORMAL") #safe with WAL, avoids an fsync per check-in
+            self.local.conn = conn
+        return conn
+
+    #function that starts a new session: closes any session left open and clears the live roster
+    def start_session(self):
+        conn = self.connection()
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("UPDATE attendance SET left_at = ? WHERE left_at IS NULL", (now,))
+            conn.execute("UPDATE sessions SET ended_at = ? WHERE ended_at IS NULL", (now,))
+            conn.execute("DELETE FROM roster")
+            session_id = conn.execute("INSERT INTO sessions (started_at) VALUES (?)", (now,)).lastrowid
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return session_id
+
+    #function that returns the open session's id, or None
+    def current_session(self):
+        row = self.connection().execute("SELECT id FROM sessions WHERE ended_at IS NULL ORDER BY id DESC LIMIT 1").fetchone()
+        return row[0] if row else None
+
+    #function that checks a student in inside one transaction; returns None on success or the reason it was refused
+    def check_in(self, student_id, port, name, limit=30):
+        conn = self.connection()
+        conn.execute("BEGIN IMMEDIATE") #takes the write lock before counting, so the limit check cannot race
+        try:
+            session_id = self.current_session()
+            if session_id is None:
+                conn.execute("ROLLBACK")
+                return "No session is open."
+            if conn.execute("SELECT COUNT(*) FROM roster").fetchone()[0] >= limit:
+                conn.execute("ROLLBACK")
+                return f"Session is full! Maximum {limit} students allowed."
+            now = time.time()
+            conn.execute("INSERT INTO roster (student_id, port, name, session_id, joined_at) VALUES (?, ?, ?, ?, ?)",
+                         (student_id, port, name, session_id, now))
+            conn.execute("INSERT INTO attendance (session_id, student_id, name, port, joined_at) VALUES (?, ?, ?, ?, ?)",
+                         (session_id, student_id, name, port, now))
+            conn.execute("COMMIT")
+            return None
+        except sqlite3.IntegrityError:
+            conn.execute("ROLLBACK")
+            taken = conn.execute("SELECT 1 FROM roster WHERE port = ?", (port,)).fetchone()
+            return "Port already in use!" if taken else "Student ID already in use!"
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    #function that checks a student out (only if both id and port match)
+    def check_out(self, student_id, port):
+        conn = self.connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT session_id FROM roster WHERE student_id = ? AND port = ?", (student_id, port)).fetchone()
+            if row:
+                conn.execute("DELETE FROM roster WHERE student_id = ?", (student_id,))
+                conn.execute("UPDATE attendance SET left_at = ? WHERE session_id = ? AND student_id = ? AND left_at IS NULL",
+                             (time.time(), row[0], student_id))
+            conn.execute("COMMIT")
+            return row is not None
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    #function that ends the open session; returns the students still present at the end
+    def end_session(self):
+        conn = self.connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            session_id = self.current_session()
+            present = self.session_attendance(session_id, present_only=True) if session_id else []
+            now = time.time()
+            conn.execute("UPDATE attendance SET left_at = ? WHERE session_id = ? AND left_at IS NULL", (now, session_id))
+            conn.execute("UPDATE sessions SET ended_at = ? WHERE id = ?", (now, session_id))
+            conn.execute("DELETE FROM roster")
+            conn.execute("COMMIT")
+            return present
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    #function that returns the live roster as [(student_id, name, port)] in join order
+    def roster(self):
+        return self.connection().execute("SELECT student_id, name, port FROM roster ORDER BY joined_at").fetchall()
+
+    #function that lists past and current sessions as [(id, started_at, ended_at)]
+    def sessions(self):
+        return self.connection().execute("SELECT id, started_at, ended_at FROM sessions ORDER BY id").fetchall()
+
+    #function that returns one session's attendance as [(student_id, name, port, joined_at, left_at)]
+    def session_attendance(self, session_id, present_only=False):
+        query = "SELECT student_id, name, port, joined_at, left_at FROM attendance WHERE session_id = ?"
+        if present_only:
+            query += " AND left_at IS NULL"
+        return self.connection().execute(query + " ORDER BY joined_at", (session_id,)).fetchall()
+
+    #function that closes this thread's connection
+    def close(self):
+        conn = getattr(self.local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self.local.conn = None
@@ -0,0 +1,112 @@
+import os #for file checks and reading inotify events
+import select #waits on the inotify descriptor with a timeout
+import struct #for decoding inotify events
+import time #for the polling fallback
+import ctypes #calls inotify from libc (Linux only)
+import ctypes.util
+
+#inotify flags (from <sys/inotify.h>)
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE
+EVENT_HEADER = struct.Struct('iIII') #wd, mask, cookie, name length
+
+#function that loads libc's inotify calls, returns None where inotify is not available
+def load_inotify():
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        return libc
+    except (OSError, AttributeError):
+        return None
+
+LIBC = load_inotify()
+
+#wakes a reader only when a file actually changes (inotify), or by checking its size/mtime on an interval (fallback)
+class FileWatcher:
+    #initialization
+    def __init__(self, path, poll_interval=1.0, use_inotify=True):
+        self.path = path
+        self.name = os.fsencode(os.path.basename(path))
+        self.poll_interval = poll_interval
+        self.fd = None
+        self.last_signature = None
+
+        #watches the directory so the file can be created, replaced or deleted and still be seen
+        if use_inotify and LIBC is not None:
+            fd = LIBC.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+            if fd >= 0:
+                directory = os.path.dirname(os.path.abspath(path))
+                if LIBC.inotify_add_watch(fd, os.fsencode(directory), WATCH_MASK) >= 0:
+                    self.fd = fd
+                else:
+                    os.close(fd)
+        if self.fd is None:
+            self.last_signature = self.signature()
+
+    #function that tells whether the inotify backend is in use
+    @property
+    def uses_inotify(self):
+        return self.fd is not None
+
+    #function that returns (inode, size, mtime) so the fallback can spot changes without reading the file
+    def signature(self):
+        try:
+            st = os.stat(self.path)
+            return (st.st_ino, st.st_size, st.st_mtime_ns)
+        except FileNotFoundError:
+            return None
+
+    #function that blocks until the file changes, returns False if the timeout passed with no change
+    def wait(self, timeout=None):
+        if self.fd is None:
+            return self.poll(timeout)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            ready, _, _ = select.select([self.fd], [], [], remaining)
+            if not ready:
+                return False
+            if self.read_events():
+                return True
+
+    #function that reads the pending inotify events and reports whether any was for our file
+    def read_events(self):
+        try:
+            data = os.read(self.fd, 65536)
+        except BlockingIOError:
+            return False
+        changed = False
+        offset = 0
+        while offset + EVENT_HEADER.size <= len(data):
+            wd, mask, cookie, length = EVENT_HEADER.unpack_from(data, offset)
+            name = data[offset + EVENT_HEADER.size:offset + EVENT_HEADER.size + length].rstrip(b"\0")
+            if name == self.name:
+                changed = True
+            offset += EVENT_HEADER.size + length
+        return changed
+
+    #polling fallback: checks the file's signature every poll_interval
+    def poll(self, timeout):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            signature = self.signature()
+            if signature != self.last_signature:
+                self.last_signature = signature
+                return True
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            sleep_for = self.poll_interval if deadline is None else min(self.poll_interval, max(0.0, deadline - time.monotonic()))
+            time.sleep(sleep_for)
+
+    #function that releases the inotify descriptor
+    def close(self):
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
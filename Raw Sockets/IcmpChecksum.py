@@ -0,0 +1,76 @@
+import array #sums the packet 16 bits at a time in C instead of a Python loop
+import sys #for the machine's byte order
+
+#all functions return the checksum the same way TutorServer always has: ready for struct.pack('!H')
+
+#function that returns the ones' complement sum of the packet's little-endian 16-bit words (odd length padded with a zero byte)
+def word_sum(data):
+    if len(data) % 2:
+        data = bytes(data) + b"\0"
+    words = array.array('H', data)
+    if sys.byteorder == 'big':
+        words.byteswap()
+    return sum(words)
+
+#function that folds a word sum into the final byte-swapped 16-bit checksum
+def finish(total):
+    total = (total >> 16) + (total & 0xffff)
+    total = total + (total >> 16)
+    answer = ~total & 0xffff
+    return answer >> 8 | (answer << 8 & 0xff00)
+
+#function that computes the ICMP checksum of a whole packet (bit-identical to the old byte-pair loop)
+def checksum(data):
+    return finish(word_sum(data))
+
+#function that updates a checksum after data[offset:offset + len(old)] changed from old to new (RFC 1624, eqn. 3)
+#HC' = ~(~HC + ~m + m'), done on the byte-swapped words the checksum is stored as
+def update_checksum(old_checksum, offset, old, new):
+    if len(old) != len(new):
+        raise ValueError("Incremental checksum update needs old and new data of the same length")
+
+    #aligns the changed span to 16-bit words; the padding byte is the same in old and new so it cancels out
+    if offset % 2:
+        old, new = b"\0" + bytes(old), b"\0" + bytes(new)
+    old_sum = fold(word_sum(old))
+    new_sum = fold(word_sum(new))
+
+    stored = old_checksum >> 8 | (old_checksum << 8 & 0xff00)  #back to the little-endian checksum
+    total = (~stored & 0xffff) + (~old_sum & 0xffff) + new_sum
+    return finish(total)
+
+#function that folds carries back into 16 bits (end-around carry)
+def fold(total):
+    while total >> 16:
+        total = (total >> 16) + (total & 0xffff)
+    return total
+
+#below this size a full checksum is cheaper than working out what changed
+INCREMENTAL_MIN_SIZE = 128
+
+#remembers the last packet so a packet of the same length only pays for the bytes that changed (e.g. the timer digits)
+class ChecksumCache:
+    #initialization
+    def __init__(self):
+        self.last_packet = None
+        self.last_checksum = None
+
+    #function that returns the checksum of packet, incrementally when only part of it changed
+    def checksum(self, packet):
+        packet = bytes(packet)
+        last = self.last_packet
+        if last is None or len(last) != len(packet):
+            result = checksum(packet)
+        elif last == packet:
+            result = self.last_checksum
+        elif len(packet) < INCREMENTAL_MIN_SIZE:
+            result = checksum(packet)
+        else:
+            #xor of the two packets as one big integer: its highest and lowest set bits give the changed span
+            diff = int.from_bytes(last, 'big') ^ int.from_bytes(packet, 'big')
+            start = len(packet) - 1 - (diff.bit_length() - 1) // 8
+            end = len(packet) - ((diff & -diff).bit_length() - 1) // 8
+            result = update_checksum(self.last_checksum, start, last[start:end], packet[start:end])
+        self.last_packet = packet
+        self.last_checksum = result
+        return result
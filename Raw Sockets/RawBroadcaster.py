@@ -0,0 +1,69 @@
+import os #for the ICMP identifier
+import socket #for the raw socket
+import struct #for raw packet processing
+import threading #the timer thread and the GUI thread both broadcast
+from IcmpChecksum import ChecksumCache #word-at-a-time ICMP checksum with incremental updates
+
+ICMP_ECHO_REQUEST = 8
+ICMP_HEADER = struct.Struct('!BBHHH') #type, code, checksum, identifier, sequence
+
+#owns one raw ICMP socket for the whole session and stamps every packet with the next sequence number
+class RawBroadcaster:
+    #initialization
+    def __init__(self, address=('127.0.0.1', 1), packet_id=None):
+        self.address = address
+        self.packet_id = (os.getpid() if packet_id is None else packet_id) & 0xFFFF
+        self.sequence = 0
+        self.sock = None
+        self.disabled = False #set once we know raw sockets are not allowed, so we stop retrying every tick
+        self.checksum_cache = ChecksumCache()
+        self.lock = threading.Lock()
+
+        #header template: only the checksum and sequence change between packets
+        self.template = ICMP_HEADER.pack(ICMP_ECHO_REQUEST, 0, 0, self.packet_id, 0)
+
+    #function that opens the raw socket the first time it is needed (caller holds self.lock)
+    def open(self):
+        if self.sock is None and not self.disabled:
+            try:
+                self.sock = socket.socket(socket.AF_INET, socket.SOCK_RAW, socket.IPPROTO_ICMP)
+            except PermissionError:
+                self.disabled = True
+                print("[Error] Run tutor script as admin/root to use raw sockets.")
+        return self.sock
+
+    #function that builds one packet from the template with the next sequence number (caller holds self.lock)
+    def build_packet(self, payload):
+        self.sequence = (self.sequence + 1) & 0xFFFF
+        packet = bytearray(self.template)
+        packet += payload
+        struct.pack_into('!H', packet, 6, self.sequence)
+        struct.pack_into('!H', packet, 2, self.checksum_cache.checksum(packet))
+        return packet
+
+    #function that sends one payload
+    def send(self, payload):
+        self.send_batch([payload])
+
+    #function that sends several payloads back to back on the same socket with consecutive sequence numbers; returns the bytes sent
+    def send_batch(self, payloads):
+        sent = 0
+        with self.lock:
+            sock = self.open()
+            if sock is None:
+                return sent
+            try:
+                for payload in payloads:
+                    sent += sock.sendto(self.build_packet(payload), self.address)
+            except Exception as e:
+                print(f"[Raw socket error] {e}")
+                sock.close()
+                self.sock = None #reopened on the next send
+        return sent
+
+    #function that closes the raw socket
+    def close(self):
+        with self.lock:
+            if self.sock is not None:
+                self.sock.close()
+                self.sock = None
@@ -0,0 +1,149 @@
+import argparse #for choosing which benchmark to run
+import os #for the scratch directory
+import statistics #for summarising latencies
+import tempfile #keeps benchmark files out of the session's files
+import threading #runs the reader side in the background
+import time #for measuring latency
+import random #for random packets in the checksum comparison
+import struct #for building ICMP headers
+import timeit #for the checksum microbenchmark
+from FileWatcher import FileWatcher
+import IcmpChecksum
+
+#function that measures join-to-display latency: a student appends to the attendance file, a reader notices and reads it
+def measure_join_latency(path, use_inotify, poll_interval, joins, gap):
+    open(path, 'w').close()
+    watcher = FileWatcher(path, poll_interval=poll_interval, use_inotify=use_inotify)
+    seen = {}
+    done = threading.Event()
+
+    def reader():
+        count = 0
+        while count < joins:
+            if not watcher.wait(timeout=5):
+                continue
+            with open(path, "r") as f:
+                lines = f.readlines()
+            now = time.perf_counter()
+            for line in lines[count:]:
+                seen[int(line.split('-')[1])] = now
+            count = len(lines)
+        done.set()
+
+    threading.Thread(target=reader, daemon=True).start()
+    written = {}
+    for i in range(joins):
+        time.sleep(gap)
+        written[i] = time.perf_counter()
+        with open(path, "a") as f:
+            f.write(f"{20000 + i}-{i}-Bench Student\n")
+    done.wait(joins * (gap + poll_interval) + 10)
+    used_inotify = watcher.uses_inotify
+    watcher.close()
+    return used_inotify, sorted((seen[i] - written[i]) * 1000 for i in seen)
+
+#function that compares inotify wake-ups with the old fixed-interval polling
+def bench_file_watch(args):
+    path = os.path.join(tempfile.mkdtemp(), "attendance_list.txt")
+    print(f"{args.joins} joins, {args.gap * 1000:.0f} ms apart")
+    print(f"{'backend':<22} {'median ms':>10} {'p90 ms':>8} {'max ms':>8}")
+    backends = [("inotify", True, 1.0), ("polling 1 s (old)", False, 1.0)]
+    for name, use_inotify, interval in backends:
+        used_inotify, latencies = measure_join_latency(path, use_inotify, interval, args.joins, args.gap)
+        if use_inotify and not used_inotify:
+            name += " (unavailable, polled)"
+        p90 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.9))]
+        print(f"{name:<22} {statistics.median(latencies):>10.2f} {p90:>8.2f} {latencies[-1]:>8.2f}")
+
+#the checksum loop TutorServer used before IcmpChecksum, kept as the reference
+def reference_checksum(source_string):
+    countTo = (int(len(source_string) / 2)) * 2
+    sum = 0
+    count = 0
+
+    while count < countTo:
+        thisVal = source_string[count + 1] * 256 + source_string[count]
+        sum = sum + thisVal
+        sum = sum & 0xffffffff
+        count = count + 2
+
+    if countTo < len(source_string):
+        sum = sum + source_string[len(source_string) - 1]
+        sum = sum & 0xffffffff
+
+    sum = (sum >> 16) + (sum & 0xffff)
+    sum = sum + (sum >> 16)
+    answer = ~sum
+    answer = answer & 0xffff
+    answer = answer >> 8 | (answer << 8 & 0xff00)
+    return answer
+
+#function that builds the timer packet the tutor sends (checksum field zero), optionally padded to a larger payload
+def timer_packet(remaining, padding=0):
+    minutes, seconds = divmod(remaining, 60)
+    header = struct.pack('!BBHHH', 8, 0, 0, 1234, 1)
+    return header + f"timer:{minutes:02}:{seconds:02}".encode() + b" " * padding
+
+#function that checks the fast and incremental checksums against the old loop, then times them
+def bench_checksum(args):
+    rng = random.Random(args.seed)
+
+    #bit-identical on random packets of every length, including odd lengths and all-0xff data
+    samples = [bytes(rng.randrange(256) for _ in range(n)) for n in range(0, 300) for _ in range(5)]
+    samples += [b"\xff" * n for n in range(0, 64)] + [bytes(1500)]
+    for data in samples:
+        assert IcmpChecksum.checksum(data) == reference_checksum(data), data
+
+    #incremental updates at random (odd and even) offsets against a full recomputation
+    for _ in range(args.updates):
+        data = bytearray(rng.randrange(256) for _ in range(rng.randrange(2, 200)))
+        start = rng.randrange(len(data))
+        end = rng.randrange(start + 1, len(data) + 1)
+        before = bytes(data)
+        data[start:end] = bytes(rng.randrange(256) for _ in range(end - start))
+        updated = IcmpChecksum.update_checksum(reference_checksum(before), start, before[start:end], bytes(data[start:end]))
+        assert updated == reference_checksum(bytes(data)), (before, bytes(data))
+
+    #a whole session of timer ticks through the cache
+    for padding in (0, 1, 500):
+        cache = IcmpChecksum.ChecksumCache()
+        for remaining in range(30 * 60, -1, -1):
+            packet = timer_packet(remaining, padding)
+            assert cache.checksum(packet) == reference_checksum(packet)
+    print(f"bit-identical: {len(samples)} packets, {args.updates} incremental updates, 3 x 1801 timer ticks")
+
+    #microbenchmark
+    packets = [timer_packet(remaining) for remaining in range(30 * 60, 0, -1)]
+    padded = [timer_packet(remaining, 500) for remaining in range(30 * 60, 0, -1)]
+    large = bytes(rng.randrange(256) for _ in range(1472))
+    print(f"{'case':<32} {'old us':>8} {'new us':>8} {'speedup':>8}")
+    def row(name, old, new, number):
+        old_us = min(timeit.repeat(old, number=number, repeat=5)) / number * 1e6
+        new_us = min(timeit.repeat(new, number=number, repeat=5)) / number * 1e6
+        print(f"{name:<32} {old_us:>8.2f} {new_us:>8.2f} {old_us / new_us:>7.1f}x")
+    row("timer packet (19 B), full", lambda: reference_checksum(packets[0]), lambda: IcmpChecksum.checksum(packets[0]), 20000)
+    def cached_session(session):
+        cache = IcmpChecksum.ChecksumCache()
+        for packet in session:
+            cache.checksum(packet)
+    row("1800 timer ticks (19 B), cached", lambda: [reference_checksum(p) for p in packets], lambda: cached_session(packets), 20)
+    row("1800 timer ticks (519 B), cached", lambda: [reference_checksum(p) for p in padded], lambda: cached_session(padded), 5)
+    row("1472 B payload, full", lambda: reference_checksum(large), lambda: IcmpChecksum.checksum(large), 2000)
+
+#main function
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Raw-variant benchmarks")
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+
+    watch_parser = subparsers.add_parser("filewatch", help="join-to-display latency: inotify vs polling")
+    watch_parser.add_argument("--joins", type=int, default=20)
+    watch_parser.add_argument("--gap", type=float, default=0.37)
+    watch_parser.set_defaults(func=bench_file_watch)
+
+    checksum_parser = subparsers.add_parser("checksum", help="fast/incremental ICMP checksum vs the old loop")
+    checksum_parser.add_argument("--updates", type=int, default=20000)
+    checksum_parser.add_argument("--seed", type=int, default=1)
+    checksum_parser.set_defaults(func=bench_checksum)
+
+    args = parser.parse_args()
+    args.func(args)
@@ -0,0 +1,415 @@
+import argparse #for the load profile
+import multiprocessing #for spawning a headless tutor
+import os #for the tutor's /proc entries and the session files
+import random #picks chat partners
+import selectors #drives every simulated student from one loop
+import socket #for the students' TCP listeners and the ICMP listener
+import struct #for reading ICMP headers
+import sys #silences the spawned tutor's console output
+import time #for rates and latencies
+import AttendanceJournal #simulated students join and leave through the same journal as real ones
+import StudentInbox #chat goes through the same tailed inboxes as real students
+import SessionMulticast #simulated students join the tutor's multicast group like real ones
+
+try:
+    import resource #raises the open file limit for thousands of sockets (not on Windows)
+except ImportError:
+    resource = None
+
+#declaration of files (same as StudentClient)
+ATTENDANCE_LIST_FILE = "attendance_list.txt"
+STUDENT_COUNT_FILE = "student_count.txt"
+
+#function that returns the p-th percentile of a sorted list
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(len(sorted_values) * p / 100))
+    return sorted_values[index]
+
+#function that raises the soft open file limit as far as the hard limit allows
+def raise_file_limit():
+    if resource is None:
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if hard == resource.RLIM_INFINITY or soft < hard:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+#samples a process's CPU time and resident memory from /proc (Linux only)
+class ProcessMonitor:
+    #initialization
+    def __init__(self, pid):
+        self.pid = pid
+        self.ticks = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else None #None where there is no /proc to read either
+        self.start_cpu = self.cpu_seconds()
+        self.start_time = time.perf_counter()
+        self.peak_rss = 0
+
+    #function that returns user + system CPU seconds, or None if the process cannot be read
+    def cpu_seconds(self):
+        if self.ticks is None:
+            return None
+        try:
+            with open(f"/proc/{self.pid}/stat") as f:
+                fields = f.read().rsplit(")", 1)[1].split()
+            return (int(fields[11]) + int(fields[12])) / self.ticks
+        except (OSError, IndexError, ValueError):
+            return None
+
+    #function that records the current resident memory
+    def sample(self):
+        try:
+            with open(f"/proc/{self.pid}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        self.peak_rss = max(self.peak_rss, int(line.split()[1]) * 1024)
+                        break
+        except OSError:
+            pass
+
+    #function that returns (CPU seconds used, average CPU %, peak RSS in MB) since the monitor started
+    def report(self):
+        end_cpu = self.cpu_seconds()
+        if end_cpu is None or self.start_cpu is None:
+            return None
+        used = end_cpu - self.start_cpu
+        elapsed = time.perf_counter() - self.start_time
+        return used, 100 * used / elapsed if elapsed else 0.0, self.peak_rss / (1024 * 1024)
+
+#one simulated student: a TCP listener for the tutor's pushes and, for observers, a watched inbox
+class SimulatedStudent:
+    #initialization
+    def __init__(self, student_id, port, observer):
+        self.student_id = student_id
+        self.port = port
+        self.observer = observer #observers have their inbox read so chat delivery can be timed
+        self.listener = None
+        self.multicast = None #joined the tutor's group at check-in
+        self.connections = []
+        self.inbox = None #StudentInbox.InboxReader, created on the first read
+        self.joined_at = None
+        self.state = "new" #new -> pending -> checked-in -> exited
+
+#drives the raw variant's file protocol (journal, count file, inboxes) and listens like real students
+class LoadGenerator:
+    #initialization
+    def __init__(self, students, checkin_rate, chat_rate, hold, exit_rate, id_base=10000, port_base=20000, observers=50, listen_raw=False):
+        self.students = [SimulatedStudent(str(id_base + i), str(port_base + i), i < observers) for i in range(students)]
+        self.checkin_rate = checkin_rate
+        self.chat_rate = chat_rate
+        self.hold = hold #seconds of chat between the last admission and the first exit
+        self.exit_rate = exit_rate
+        self.selector = selectors.DefaultSelector()
+        self.join_order = [] #students in the order their join records were appended
+        self.admitted = 0
+        self.last_progress = time.perf_counter() #last join or admission
+        self.initial_count = self.read_count()
+
+        #one raw socket for every simulated student: ICMP is delivered per host, not per port
+        self.raw_sock = None
+        self.raw_last_sequence = {}
+        if listen_raw:
+            try:
+                self.raw_sock = socket.socket(socket.AF_INET, socket.SOCK_RAW, socket.IPPROTO_ICMP)
+                self.raw_sock.setblocking(False)
+                self.selector.register(self.raw_sock, selectors.EVENT_READ, ("raw", None))
+            except PermissionError:
+                print("[Raw socket] Run as admin/root to listen for the tutor's ICMP broadcasts; continuing with TCP only.")
+
+        #results
+        self.checkin_latencies = []
+        self.chat_latencies = []
+        self.arrivals = {} #{(channel, message): [arrival times]} one entry per tutor broadcast and channel
+        self.deadlines = [] #implied session end (local clock) from every deadline message
+        self.counts = {"admitted": 0, "not admitted": 0, "listen errors": 0, "chats sent": 0, "tcp messages": 0, "icmp messages": 0, "multicast messages": 0}
+
+    #function that reads the tutor's admitted-student count
+    def read_count(self):
+        try:
+            with open(STUDENT_COUNT_FILE, "r") as f:
+                return int(f.read().strip() or 0)
+        except (OSError, ValueError):
+            return 0
+
+    #function that opens the student's listener and appends their join record
+    def check_in(self, student):
+        try:
+            student.listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            student.listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            student.listener.bind(('127.0.0.1', int(student.port)))
+            student.listener.listen(5)
+            student.listener.setblocking(False)
+            self.selector.register(student.listener, selectors.EVENT_READ, ("listener", student))
+            student.multicast = SessionMulticast.open_group_socket()
+            student.multicast.setblocking(False)
+            self.selector.register(student.multicast, selectors.EVENT_READ, ("multicast", student))
+        except OSError:
+            self.counts["listen errors"] += 1
+            student.state = "exited"
+            return
+        student.joined_at = time.perf_counter()
+        AttendanceJournal.record_join(ATTENDANCE_LIST_FILE, student.port, student.student_id, "Load Student")
+        self.join_order.append(student)
+        self.last_progress = student.joined_at
+        student.state = "pending"
+
+    #function that marks students admitted once the tutor's count file has caught up with them
+    def poll_admissions(self):
+        count = self.read_count() - self.initial_count
+        now = time.perf_counter()
+        while self.admitted < min(count, len(self.join_order)):
+            student = self.join_order[self.admitted]
+            self.checkin_latencies.append(now - student.joined_at)
+            student.state = "checked-in"
+            self.admitted += 1
+            self.counts["admitted"] += 1
+            self.last_progress = now
+
+    #function that appends one chat line to a random student's inbox, stamped with the send time
+    def chat(self, checked_in):
+        if len(checked_in) < 2:
+            return
+        sender, receiver = random.sample(checked_in, 2)
+        StudentInbox.append_message(StudentInbox.inbox_path(receiver.port), sender.port, f"{time.perf_counter():.9f}|load chat")
+        self.counts["chats sent"] += 1
+
+    #function that reads whatever new lines reached an observer's inbox
+    def read_inbox(self, student):
+        if student.inbox is None:
+            student.inbox = StudentInbox.InboxReader(StudentInbox.inbox_path(student.port), persist_offset=False)
+        try:
+            messages = student.inbox.read_new()
+        except OSError:
+            return
+        now = time.perf_counter()
+        for message_id, sender, text in messages:
+            try:
+                self.chat_latencies.append(now - float(text.split("|", 1)[0]))
+            except ValueError:
+                continue
+
+    #function that leaves the session the way StudentClient.exit_session does
+    def exit(self, student):
+        if student.state in ("pending", "checked-in"):
+            AttendanceJournal.record_leave(ATTENDANCE_LIST_FILE, student.port, student.student_id)
+            if student.state == "checked-in":
+                count = max(self.read_count() - 1, 0)
+                with open(STUDENT_COUNT_FILE, "w") as f:
+                    f.write(str(count))
+        for sock in [student.listener, student.multicast] + student.connections:
+            if sock is None:
+                continue
+            try:
+                self.selector.unregister(sock)
+            except (KeyError, ValueError):
+                pass
+            sock.close()
+        student.connections = []
+        if os.path.exists(StudentInbox.inbox_path(student.port)):
+            os.remove(StudentInbox.inbox_path(student.port))
+        student.state = "exited"
+
+    #function that records one message from the tutor (over TCP, ICMP or multicast)
+    def record_message(self, message, now, channel):
+        self.counts[channel] += 1
+        if channel != "icmp messages": #one raw socket stands in for every student, so ICMP has no per-student spread
+            self.arrivals.setdefault((channel, message), []).append(now)
+        if message.startswith("deadline:"):
+            remaining, _, state = message[len("deadline:"):].partition(":")
+            try:
+                if state == "running":
+                    self.deadlines.append(now + float(remaining))
+            except ValueError:
+                pass
+
+    #function that handles one readable socket
+    def handle(self, kind, data, sock):
+        now = time.perf_counter()
+        if kind == "listener":
+            try:
+                conn, _ = sock.accept()
+            except BlockingIOError:
+                return
+            conn.setblocking(False)
+            data.connections.append(conn)
+            self.selector.register(conn, selectors.EVENT_READ, ("tutor", (data, bytearray())))
+            return
+
+        if kind == "raw":
+            try:
+                packet = sock.recv(65535)
+            except BlockingIOError:
+                return
+            icmp_type, _, _, packet_id, sequence = struct.unpack('!BBHHH', packet[20:28])
+            last = self.raw_last_sequence.get(packet_id)
+            if icmp_type not in (0, 8) or (last is not None and not 0 < (sequence - last) & 0xFFFF < 0x8000):
+                return #the kernel's echo reply repeats every request
+            self.raw_last_sequence[packet_id] = sequence
+            self.record_message(packet[28:].decode(errors='ignore'), now, "icmp messages")
+            return
+
+        if kind == "multicast":
+            try:
+                datagram = sock.recv(65535)
+            except BlockingIOError:
+                return
+            parsed = SessionMulticast.parse_datagram(datagram)
+            if parsed and parsed[0] == SessionMulticast.EVT: #heartbeats carry no event
+                self.record_message(parsed[3], now, "multicast messages")
+            return
+
+        student, buffer = data
+        try:
+            chunk = sock.recv(65536)
+        except BlockingIOError:
+            return
+        except OSError:
+            chunk = b""
+        if not chunk:
+            self.selector.unregister(sock)
+            sock.close()
+            if sock in student.connections:
+                student.connections.remove(sock)
+            return
+        buffer += chunk
+        *lines, rest = buffer.split(b"\n")
+        buffer[:] = rest
+        for line in lines:
+            if line:
+                self.record_message(line.decode(errors='ignore'), now, "tcp messages")
+
+    #function that runs the whole scenario and returns the results
+    def run(self, monitor=None):
+        start = time.perf_counter()
+        issued = 0
+        hold_until = None
+        exit_start = None
+        exited = 0
+        next_chat = None
+        next_sample = start
+        while True:
+            now = time.perf_counter()
+
+            #check-ins at the configured rate
+            while issued < len(self.students) and now >= start + issued / self.checkin_rate:
+                self.check_in(self.students[issued])
+                issued += 1
+            if self.admitted < len(self.join_order):
+                self.poll_admissions()
+
+            #the hold starts once everyone is admitted, or once the tutor has admitted nobody new for 5 s (the session is full)
+            if hold_until is None and issued == len(self.students):
+                if self.admitted == len(self.join_order) or now - self.last_progress >= 5:
+                    self.counts["not admitted"] = len(self.join_order) - self.admitted
+                    hold_until = now + self.hold
+                    next_chat = now
+
+            #chat during the hold; observers' inboxes are read every loop
+            if hold_until is not None and now < hold_until and self.chat_rate > 0:
+                checked_in = [s for s in self.students if s.state == "checked-in"]
+                while now >= next_chat:
+                    self.chat(checked_in)
+                    next_chat += 1 / self.chat_rate
+            for student in self.students:
+                if student.observer and student.state == "checked-in":
+                    self.read_inbox(student)
+
+            #exits at the configured rate after the hold
+            if hold_until is not None and now >= hold_until:
+                if exit_start is None:
+                    exit_start = now
+                while exited < len(self.students) and now >= exit_start + exited / self.exit_rate:
+                    self.exit(self.students[exited])
+                    exited += 1
+                if exited == len(self.students):
+                    break
+
+            if monitor and now >= next_sample:
+                monitor.sample()
+                next_sample = now + 0.25
+
+            for key, _ in self.selector.select(timeout=0.005):
+                kind, data = key.data
+                self.handle(kind, data, key.fileobj)
+
+        if self.raw_sock:
+            self.raw_sock.close()
+        self.selector.close()
+        return time.perf_counter() - start
+
+#function that runs a headless tutor in the session directory for --spawn (imported here so the generator itself never loads the tutor)
+def run_tutor(capacity, timer_resync, legacy_broadcast):
+    from TutorServer import TutorServer
+    raise_file_limit()
+    sys.stdout = open(os.devnull, "w")
+    server = TutorServer(student_limit=capacity, legacy_broadcast=legacy_broadcast)
+    server.timer_resync_interval = timer_resync
+    server.start_session()
+    while True:
+        time.sleep(3600)
+
+#function that prints the results
+def print_report(generator, elapsed, monitor):
+    print("  ".join(f"{key}: {value}" for key, value in generator.counts.items()))
+    print(f"scenario took {elapsed:.1f} s")
+
+    #a tutor broadcast reaches every student at slightly different times; the spread is how long the fan-out takes
+    spreads = {}
+    for (channel, message), times in generator.arrivals.items():
+        if len(times) > 1:
+            spreads.setdefault(channel.split()[0], []).append(max(times) - min(times))
+
+    print(f"{'latency (ms)':<22} {'count':>8} {'p50':>9} {'p90':>9} {'p99':>9} {'max':>9}")
+    deadlines = sorted(generator.deadlines)
+    median = percentile(deadlines, 50)
+    for label, values in (("check-in (admitted)", sorted(generator.checkin_latencies)),
+                          ("tcp spread", sorted(spreads.get("tcp", []))),
+                          ("multicast spread", sorted(spreads.get("multicast", []))),
+                          ("inbox chat", sorted(generator.chat_latencies)),
+                          ("timer jitter", sorted(abs(v - median) for v in deadlines))):
+        if values:
+            print(f"{label:<22} {len(values):>8} {percentile(values, 50) * 1000:>9.2f} {percentile(values, 90) * 1000:>9.2f} "
+                  f"{percentile(values, 99) * 1000:>9.2f} {values[-1] * 1000:>9.2f}")
+
+    if monitor:
+        report = monitor.report()
+        if report:
+            print(f"tutor pid {monitor.pid}: {report[0]:.2f} CPU s ({report[1]:.0f}% of one core), peak RSS {report[2]:.1f} MB")
+        else:
+            print(f"tutor pid {monitor.pid}: CPU and memory not readable (needs Linux /proc)")
+
+#main function
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Headless load generator for the raw-socket tutor (run it in the tutor's directory)")
+    parser.add_argument("--students", type=int, default=200)
+    parser.add_argument("--checkin-rate", type=float, default=50, help="join records per second")
+    parser.add_argument("--chat-rate", type=float, default=20, help="inbox chat messages per second during the hold")
+    parser.add_argument("--hold", type=float, default=10, help="seconds between the last admission and the first exit")
+    parser.add_argument("--exit-rate", type=float, default=50, help="leave records per second")
+    parser.add_argument("--observers", type=int, default=50, help="students whose inbox is read to time chat delivery")
+    parser.add_argument("--id-base", type=int, default=10000, help="first student id")
+    parser.add_argument("--port-base", type=int, default=20000, help="first student port (5 digits, like real students)")
+    parser.add_argument("--raw", action="store_true", help="also listen for the tutor's ICMP broadcasts (needs root)")
+    parser.add_argument("--server-pid", type=int, help="sample this tutor process's CPU and memory")
+    parser.add_argument("--spawn", action="store_true", help="start a headless tutor in this directory first and monitor it")
+    parser.add_argument("--capacity", type=int, default=None, help="with --spawn: seats (defaults to --students)")
+    parser.add_argument("--timer-resync", type=float, default=60, help="with --spawn: seconds between deadline broadcasts")
+    parser.add_argument("--legacy-broadcast", action="store_true", help="with --spawn: the tutor also sends its events over ICMP and TCP")
+    args = parser.parse_args()
+    raise_file_limit()
+
+    tutor = None
+    if args.spawn:
+        tutor = multiprocessing.Process(target=run_tutor, args=(args.capacity or args.students, args.timer_resync, args.legacy_broadcast), daemon=True)
+        tutor.start()
+        time.sleep(1.0) #the tutor resets the session files when it starts
+    pid = tutor.pid if tutor else args.server_pid
+    monitor = ProcessMonitor(pid) if pid else None
+
+    generator = LoadGenerator(args.students, args.checkin_rate, args.chat_rate, args.hold, args.exit_rate,
+                              id_base=args.id_base, port_base=args.port_base, observers=args.observers, listen_raw=args.raw)
+    elapsed = generator.run(monitor)
+    print(f"{args.students} simulated students against the raw-socket tutor in {os.getcwd()}")
+    print_report(generator, elapsed, monitor)
+    if tutor:
+        tutor.terminate()
@@ -0,0 +1,235 @@
+import os #for the session nonce
+import selectors #the subscriber waits on the group socket and its unicast socket together
+import socket #UDP multicast needs no root, unlike the ICMP broadcast
+import struct #for the group membership request
+import threading #the publisher answers NACKs and the subscriber listens in the background
+import time #for heartbeats and gap timeouts
+from collections import OrderedDict #recent events kept for resending, oldest first
+
+#session-wide events (deadline, warning, session end) go to one multicast group, so one datagram reaches every student
+#  EVT session seq payload   an event (multicast, or unicast when resent)
+#  HB session last_seq       heartbeat, lets a student notice that the newest events were lost
+#  NACK session seq seq ...  student -> tutor (unicast): please resend these
+#  LOST session seq          tutor -> student (unicast): no longer kept, skip it
+#session is a random nonce per tutor run, so sequence numbers restart cleanly when the tutor does
+MULTICAST_GROUP = "239.255.42.99" #administratively scoped, never routed off the site
+MULTICAST_PORT = 5007
+LOOPBACK = "127.0.0.1" #students on the same machine; pass a LAN address to reach other machines
+EVT = "EVT"
+HB = "HB"
+NACK = "NACK"
+LOST = "LOST"
+HISTORY_LIMIT = 1024 #events kept for resending
+HEARTBEAT_INTERVAL = 0.5 #seconds between heartbeats
+NACK_INTERVAL = 0.25 #seconds between repeated NACKs for the same gap
+GAP_TIMEOUT = 3.0 #a gap that no resend fills in this long is skipped
+MAX_NACK_SEQUENCES = 64 #sequence numbers asked for in one NACK
+LINGER = 2.0 #seconds the publisher keeps answering NACKs when closed, so the session end can still be recovered
+
+#function that parses one datagram; returns (kind, session, seq, payload) or None
+def parse_datagram(data):
+    parts = data.decode(errors="ignore").split(" ", 3)
+    if len(parts) < 3 or parts[0] not in (EVT, HB, LOST):
+        return None
+    try:
+        seq = int(parts[2])
+    except ValueError:
+        return None
+    return parts[0], parts[1], seq, parts[3] if len(parts) == 4 else ""
+
+#function that opens a UDP socket that has joined the group on the given interface
+def open_group_socket(group=MULTICAST_GROUP, port=MULTICAST_PORT, interface=LOOPBACK):
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1) #every student on the machine binds the same port
+    if hasattr(socket, "SO_REUSEPORT"):
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1) #needed for the same on BSD/macOS
+    sock.bind(('', port))
+    membership = struct.pack("4s4s", socket.inet_aton(group), socket.inet_aton(interface))
+    sock.setsockopt(socket.IPPROTO_IP, socket.IP_ADD_MEMBERSHIP, membership)
+    return sock
+
+#tutor side: numbers every event, sends it once to the group and resends it on request
+class MulticastPublisher:
+    #initialization
+    def __init__(self, group=MULTICAST_GROUP, port=MULTICAST_PORT, interface=LOOPBACK, ttl=1, heartbeat_interval=HEARTBEAT_INTERVAL):
+        self.address = (group, port)
+        self.session = os.urandom(4).hex()
+        self.sequence = 0
+        self.history = OrderedDict()  #{seq: datagram}
+        self.heartbeat_interval = heartbeat_interval
+        self.lock = threading.Lock()
+        self.closed = False
+
+        #students send their NACKs to the address the events come from, so this one socket sends and answers
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_TTL, ttl) #1 keeps it on the local network
+        self.sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_LOOP, 1) #students on this machine get it too
+        self.sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_IF, socket.inet_aton(interface))
+        self.sock.bind((interface, 0))
+        self.sock.settimeout(heartbeat_interval)
+        threading.Thread(target=self.run, daemon=True).start()
+
+    #function that sends one event to every student with a single datagram; returns the bytes sent
+    def publish(self, payload):
+        with self.lock:
+            self.sequence += 1
+            datagram = f"{EVT} {self.session} {self.sequence} {payload}".encode()
+            self.history[self.sequence] = datagram
+            if len(self.history) > HISTORY_LIMIT:
+                self.history.popitem(last=False)
+            try:
+                return self.sock.sendto(datagram, self.address)
+            except OSError as e:
+                print(f"[Multicast error] {e}")
+                return 0
+
+    #background thread: answers NACKs and sends a heartbeat every heartbeat_interval
+    def run(self):
+        next_heartbeat = time.monotonic()
+        while not self.closed:
+            now = time.monotonic()
+            if now >= next_heartbeat:
+                self.send_heartbeat()
+                next_heartbeat = now + self.heartbeat_interval
+            try:
+                data, addr = self.sock.recvfrom(65535)
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            self.answer_nack(data, addr)
+
+    #function that tells the group the newest sequence number
+    def send_heartbeat(self):
+        with self.lock:
+            datagram = f"{HB} {self.session} {self.sequence}".encode()
+            try:
+                self.sock.sendto(datagram, self.address)
+            except OSError:
+                pass
+
+    #function that resends the requested events to the one student that asked, or says they are gone
+    def answer_nack(self, data, addr):
+        parts = data.decode(errors="ignore").split()
+        if len(parts) < 3 or parts[0] != NACK or parts[1] != self.session:
+            return
+        for value in parts[2:2 + MAX_NACK_SEQUENCES]:
+            try:
+                seq = int(value)
+            except ValueError:
+                continue
+            with self.lock:
+                datagram = self.history.get(seq) or f"{LOST} {self.session} {seq}".encode()
+            try:
+                self.sock.sendto(datagram, addr)
+            except OSError:
+                return
+
+    #function that stops the publisher, after answering NACKs for linger seconds
+    def close(self, linger=0):
+        if linger:
+            time.sleep(linger)
+        self.closed = True
+        self.sock.close()
+
+#student side: joins the group once, hands on events in sequence order and asks the tutor for any that went missing
+class MulticastSubscriber:
+    #initialization
+    def __init__(self, on_event, group=MULTICAST_GROUP, port=MULTICAST_PORT, interface=LOOPBACK, gap_timeout=GAP_TIMEOUT):
+        self.on_event = on_event #on_event(payload) for every event, in order (subscriber thread)
+        self.gap_timeout = gap_timeout
+        self.group_sock = open_group_socket(group, port, interface)
+        self.unicast_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM) #NACKs go out and resends come back here, not on the shared group port
+        self.unicast_sock.bind((interface, 0))
+        self.selector = selectors.DefaultSelector()
+        self.selector.register(self.group_sock, selectors.EVENT_READ)
+        self.selector.register(self.unicast_sock, selectors.EVENT_READ)
+        self.session = None
+        self.tutor = None  #address the events come from, NACKs are sent there
+        self.expected = None  #next sequence number to hand on, None until the first datagram
+        self.latest = 0  #newest sequence number the tutor has announced
+        self.pending = {}  #{seq: payload, or None for an event to skip} received ahead of a gap
+        self.gap_since = None
+        self.last_nack = 0.0
+        self.closed = False
+
+    #function that starts the listener thread
+    def start(self):
+        threading.Thread(target=self.run, daemon=True).start()
+
+    #function that leaves the group
+    def close(self):
+        self.closed = True
+
+    #listener thread: reads events, heartbeats and resends until closed
+    def run(self):
+        while not self.closed:
+            for key, _ in self.selector.select(timeout=NACK_INTERVAL):
+                try:
+                    data, addr = key.fileobj.recvfrom(65535)
+                except OSError:
+                    continue
+                self.handle(data, addr, key.fileobj is self.group_sock)
+            self.check_gap()
+        self.selector.close()
+        self.group_sock.close()
+        self.unicast_sock.close()
+
+    #function that applies one datagram
+    def handle(self, data, addr, from_group):
+        parsed = parse_datagram(data)
+        if parsed is None:
+            return
+        kind, session, seq, payload = parsed
+        if session != self.session:
+            if not from_group:
+                return #a late resend from an earlier tutor run
+            self.session, self.expected, self.latest = session, None, 0
+            self.pending.clear()
+        if from_group:
+            self.tutor = addr
+
+        #joining mid-session: events from before the first datagram are not recovered
+        if self.expected is None:
+            self.expected = seq if kind == EVT else seq + 1
+        self.latest = max(self.latest, seq)
+        if seq >= self.expected and kind != HB:
+            self.pending[seq] = payload if kind == EVT else None
+        self.deliver()
+
+    #function that hands on every event that is next in sequence
+    def deliver(self):
+        while self.expected in self.pending:
+            payload = self.pending.pop(self.expected)
+            self.expected += 1
+            if payload is not None:
+                try:
+                    self.on_event(payload)
+                except Exception as e:
+                    print(f"[Multicast] event handler failed: {e}")
+
+    #function that NACKs missing events, and skips them once they have been missing for gap_timeout
+    def check_gap(self):
+        if self.expected is None or self.latest < self.expected:
+            self.gap_since = None
+            return
+        missing = [seq for seq in range(self.expected, self.latest + 1) if seq not in self.pending][:MAX_NACK_SEQUENCES]
+        if not missing:
+            self.gap_since = None
+            return
+        now = time.monotonic()
+        if self.gap_since is None:
+            self.gap_since = now
+        if now - self.gap_since >= self.gap_timeout:
+            print(f"[Multicast] gave up on {len(missing)} lost event(s)")
+            for seq in missing:
+                self.pending[seq] = None
+            self.gap_since = None
+            self.deliver()
+            return
+        if self.tutor and now - self.last_nack >= NACK_INTERVAL:
+            self.last_nack = now
+            try:
+                self.unicast_sock.sendto(f"{NACK} {self.session} {' '.join(map(str, missing))}".encode(), self.tutor)
+            except OSError:
+                pass
@@ -1,364 +1,510 @@
-import threading #for polling (not freezing student's GUI)
-import time #for using session timers and delays
-import os #replaces the import sockets to make it raw and file checks
-import socket #for running raw sockets
-import struct  #for raw packet processing
-import tkinter as Tkinter #students GUI
-import tkinter.scrolledtext as ScrolledText #for scrolling
-from tkinter import messagebox, simpledialog #for dialog boxes, warnings, input
-
-#declaration of files
-CHECK_IN_REQUESTS_FILE = "check_in_requests.txt"
-ATTENDANCE_LIST_FILE = "attendance_list.txt"
-SESSION_STATUS_FILE = "session_status.txt"
-
-#student class
-class StudentClient:
-
-    #function initialization for attributes and student's windows
-    def __init__(self):
-        self.root = Tkinter.Tk()
-        self.root.title("Student Client")
-
-        #creates main window
-        self.is_checked_in = False
-        self.student_id = None
-        self.student_name = None
-        self.my_port = None
-
-        #stores session data
-        self.session_active = False
-        self.active_ports = set()
-
-        #tracks the session status and student's active ports
-        self.create_widgets()
-        self.root.protocol("WM_DELETE_WINDOW", self.exit_session)
-
-    #function for student's GUI
-    def create_widgets(self):
-        input_frame = Tkinter.Frame(self.root)
-        input_frame.pack(pady=10)
-
-        Tkinter.Label(input_frame, text="Student ID: *5 digits only").grid(row=0, column=0)
-        self.student_id_entry = Tkinter.Entry(input_frame)
-        self.student_id_entry.grid(row=0, column=1)
-
-        Tkinter.Label(input_frame, text="First Name:").grid(row=1, column=0)
-        self.first_name_entry = Tkinter.Entry(input_frame)
-        self.first_name_entry.grid(row=1, column=1)
-
-        Tkinter.Label(input_frame, text="Last Name:").grid(row=2, column=0)
-        self.last_name_entry = Tkinter.Entry(input_frame)
-        self.last_name_entry.grid(row=2, column=1)
-
-        Tkinter.Label(input_frame, text="Your Port: *5 digits only").grid(row=3, column=0)
-        self.port_entry = Tkinter.Entry(input_frame)
-        self.port_entry.grid(row=3, column=1)
-
-        self.check_in_button = Tkinter.Button(input_frame, text="Check In", command=self.check_in)
-        self.check_in_button.grid(row=4, columnspan=2)
-
-        self.timer_label = Tkinter.Label(self.root, text="Session Timer: Not Started")
-        self.timer_label.pack(pady=5)
-
-        Tkinter.Label(self.root, text="Attendance List:").pack()
-        self.attendance_list = ScrolledText.ScrolledText(self.root, width=60, height=8, state='disabled')
-        self.attendance_list.pack(pady=5)
-
-        Tkinter.Label(self.root, text="Messages & Info:").pack()
-        self.messages_box = ScrolledText.ScrolledText(self.root, width=60, height=8, state='disabled')
-        self.messages_box.pack(pady=5)
-
-        chat_frame = Tkinter.Frame(self.root)
-        chat_frame.pack(pady=10)
-
-        Tkinter.Label(chat_frame, text="Peer Port:").grid(row=0, column=0)
-        self.peer_port_entry = Tkinter.Entry(chat_frame)
-        self.peer_port_entry.grid(row=0, column=1)
-
-        self.send_button = Tkinter.Button(chat_frame, text="Send Message", command=self.send_message, state='disabled')
-        self.send_button.grid(row=1, columnspan=2)
-
-        self.exit_button = Tkinter.Button(chat_frame, text="Exit Session", command=self.exit_session, state='disabled')
-        self.exit_button.grid(row=2, columnspan=2)
-
-    #function for check-in system
-    def check_in(self):
-    
-        #checks if session is already full
-        if os.path.exists("student_count.txt"):
-            with open("student_count.txt", "r") as f:
-                count = int(f.read().strip())
-                if count >= 30:
-                    messagebox.showerror("Session Full", "Session is full! Maximum 30 students allowed.")
-                    return
-
-        if self.is_checked_in:
-            messagebox.showinfo("Already Checked In", "Cannot change ID/Name/Port after check-in.")
-            return
-
-        #gets the student details from the input of the student
-        student_id = self.student_id_entry.get()
-        first_name = self.first_name_entry.get()
-        last_name = self.last_name_entry.get()
-        port = self.port_entry.get()
-
-        #validates the student id and port number as it must be unique
-        if not self.validate_unique(student_id, port):
-            return
-
-        #validate student names, id, and port numbers
-        if len(student_id) != 5 or not student_id.isdigit():
-            messagebox.showwarning("Input Error", "Student ID must be exactly 5 digits.")
-            return
-        if not first_name.isalpha() or not last_name.isalpha():
-            messagebox.showwarning("Input Error", "Name fields must be alphabetic.")
-            return
-        if len(port) != 5 or not port.isdigit():
-            messagebox.showwarning("Input Error", "Port must be exactly 5 digits.")
-            return
-
-        self.student_id = student_id
-        self.student_name = f"{first_name} {last_name}"
-        self.my_port = port
-
-        #writes the attendance into a txt file
-        with open(ATTENDANCE_LIST_FILE, "a") as f:
-            f.write(f"{port}-{student_id}-{self.student_name}\n")
-
-        #starts background threading after students checked in successfully
-        self.append_message("Checked in successfully.")
-        self.is_checked_in = True
-        self.session_active = True
-        self.active_ports.add(port)
-
-        #start the listeners:
-        threading.Thread(target=self.poll_incoming_messages, daemon=True).start()
-        threading.Thread(target=self.poll_attendance_list, daemon=True).start()
-        threading.Thread(target=self.start_tcp_listener, daemon=True).start()
-        threading.Thread(target=self.listen_raw_socket, daemon=True).start() #raw listener
-
-        #disabled fields
-        self.student_id_entry.config(state='disabled')
-        self.first_name_entry.config(state='disabled')
-        self.last_name_entry.config(state='disabled')
-        self.port_entry.config(state='disabled')
-        self.check_in_button.config(state='disabled')
-
-        #enabled fields
-        self.send_button.config(state='normal')
-        self.exit_button.config(state='normal')
-
-    #function for validating student id and port number (ensures no duplicates are present)
-    def validate_unique(self, student_id, port):
-        if os.path.exists(ATTENDANCE_LIST_FILE):
-            with open(ATTENDANCE_LIST_FILE, "r") as f:
-                lines = f.readlines()
-                for line in lines:
-                    p, sid, _ = line.strip().split('-')
-                    if p == port:
-                        messagebox.showerror("Error", "Port already in use!")
-                        return False
-                    if sid == student_id:
-                        messagebox.showerror("Error", "Student ID already in use!")
-                        return False
-        return True
-
-    #TCP listener from tutor
-    def start_tcp_listener(self):
-        s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        s.bind(('127.0.0.1', int(self.my_port)))
-        s.listen(5)
-        print(f"[TCP] Listening on port {self.my_port}")
-
-        while self.session_active:
-            try:
-                client_socket, addr = s.accept()
-                data = client_socket.recv(1024).decode()
-                client_socket.close()
-                self.process_tutor_message(data)
-            except Exception:
-                continue
-
-        s.close()
-
-    #raw socket listener (ICMP)
-    def listen_raw_socket(self):
-        try:
-            sock = socket.socket(socket.AF_INET, socket.SOCK_RAW, socket.IPPROTO_ICMP)
-            print("[RAW] Listening for ICMP packets...")
-            while self.session_active:
-                packet, addr = sock.recvfrom(65535)
-                self.process_raw_packet(packet)
-        except PermissionError:
-            print("[Raw socket] Run as admin/root")
-        except Exception as e:
-            print(f"[Raw error] {e}")
-
-    #proccesses the raw packets from the tutor using ICMP, timer, 5 minute warning and end session
-    def process_raw_packet(self, packet):
-        icmp_header = packet[20:28]
-        icmp_type, code, checksum, p_id, sequence = struct.unpack('!BBHHH', icmp_header)
-
-        payload = packet[28:].decode(errors='ignore')
-
-        if payload.startswith("popup:5min-warning"):
-            self.root.after(0, self.show_5min_warning)
-        elif payload.startswith("popup:session-ended"):
-            self.root.after(0, self.show_session_end)
-        elif payload.startswith("timer:"):
-            timer_value = payload.split("timer:")[1]
-            self.root.after(0, lambda: self.update_timer_display(timer_value))
-        elif payload.startswith("msg:"):
-            message = payload.split("msg:")[1]
-            self.root.after(0, lambda: self.append_message(f"Tutor: {message}"))
-
-    #tutor messages processor
-    def process_tutor_message(self, msg):
-        if msg.startswith("popup:5min-warning"):
-            self.root.after(0, self.show_5min_warning)
-        elif msg.startswith("popup:session-ended"):
-            self.root.after(0, self.show_session_end)
-        elif msg.startswith("timer:"):
-            timer_value = msg.split("timer:")[1]
-            self.root.after(0, lambda: self.update_timer_display(timer_value))
-        elif msg.startswith("msg:"):
-            message = msg.split("msg:")[1]
-            self.root.after(0, lambda: self.append_message(f"Tutor: {message}"))
-
-    #displays the 5 minute warning message
-    def show_5min_warning(self):
-        messagebox.showwarning("5 Minute Warning", "Only 5 minutes remaining!")
-        self.append_message("5 minutes remaining in session!")
-
-    #displays the end session message
-    def show_session_end(self):
-        messagebox.showinfo("Session Ended", "Session has ended.")
-        self.append_message("Session ended.")
-        self.timer_label.config(text="Session Timer: Ended")
-        self.session_active = False
-
-    #updates the session timer on tutor's GUI
-    def update_timer_display(self, timer_value):
-        self.timer_label.config(text=f"Session Timer: {timer_value}")
-
-    #function that displays the attendance list and saves it into a file
-    def poll_attendance_list(self):
-        while self.session_active:
-            time.sleep(2)
-            
-            #clears the old attendance list and updates it with a new list
-            if os.path.exists(ATTENDANCE_LIST_FILE):
-                with open(ATTENDANCE_LIST_FILE, "r") as f:
-                    lines = f.readlines()
-                self.update_attendance_list(lines)
-
-    #function that updates and displays the attendance list in student's GUI
-    def update_attendance_list(self, lines):
-        self.active_ports.clear()
-        self.attendance_list.config(state='normal')
-        self.attendance_list.delete('1.0', 'end')
-        self.attendance_list.insert('end', f"{'PORT':<10} {'ID':<10} {'NAME':<30}\n")
-        self.attendance_list.insert('end', "-" * 50 + "\n")
-
-        for line in lines:
-            try:
-                port, sid, name = line.strip().split('-')
-                self.attendance_list.insert('end', f"{port:<10} {sid:<10} {name:<30}\n")
-                self.active_ports.add(port)
-                
-            #when the attendance is not updated and getting errors in the values being displayed to students
-            except ValueError:
-                continue
-
-        self.attendance_list.config(state='disabled')
-        self.attendance_list.yview('end')
-
-    #function that sends messages to other students and validates it
-    def send_message(self):
-        peer_port = self.peer_port_entry.get().strip()
-        
-        #if port number is not in integer
-        if not peer_port.isdigit():
-            messagebox.showerror("Invalid Input", "Enter valid port number.")
-            return
-            
-        #if port number you entered is your own port number
-        if peer_port == self.my_port:
-            messagebox.showerror("Invalid", "Cannot message yourself!")
-            return
-            
-        #if the port is no longer available(in the session)
-        if peer_port not in self.active_ports:
-            messagebox.showerror("Invalid", "Port does not exist in attendance!")
-            return
-
-        #enter the message after validation of port number
-        message = simpledialog.askstring("Send Message", "Enter message:")
-        if not message:
-            return
-
-        #displays the message for sender
-        self.append_message(f"You => {peer_port}: {message}")
-        
-        #displays the message to the receiver's message inbox
-        peer_file = f"student_{peer_port}.txt"
-        with open(peer_file, "a") as f:
-            f.write(f"From {self.my_port}: {message}\n")
-
-    #function that displays the incoming messages from other students
-    def poll_incoming_messages(self):
-        inbox_file = f"student_{self.my_port}.txt"
-        seen_lines = set()
-
-        #when path exists, opens the inbox file and receives new messages
-        while self.session_active:
-            time.sleep(1)
-            if os.path.exists(inbox_file):
-                with open(inbox_file, "r") as f:
-                    lines = f.readlines()
-                    
-                #appends the messages and avoids duplicate messages
-                for line in lines:
-                    if line not in seen_lines:
-                        seen_lines.add(line)
-                        self.append_message(f"{line.strip()}")
-
-    #function appends the message to the student's GUI message box
-    def append_message(self, message):
-        self.messages_box.config(state='normal')
-        self.messages_box.insert('end', message + '\n')
-        self.messages_box.config(state='disabled')
-        self.messages_box.yview('end')
-
-    #function that exists the session and exists the student's GUI
-    def exit_session(self):
-        if not self.is_checked_in:
-            self.root.destroy()
-            return
-
-        #remove student from attendance file
-        with open(ATTENDANCE_LIST_FILE, "r") as f:
-            lines = f.readlines()
-        with open(ATTENDANCE_LIST_FILE, "w") as f:
-            for line in lines:
-                if self.student_id not in line and self.my_port not in line:
-                    f.write(line)
-
-        #decrease the student count in student_count.txt
-        if os.path.exists("student_count.txt"):
-            with open("student_count.txt", "r") as f:
-                count = int(f.read().strip())
-            count = max(count - 1, 0) #prevent going negative
-            with open("student_count.txt", "w") as f:
-                f.write(str(count))
-
-        #appends the message of the updated session
-        self.append_message("Exited session. Attendance updated.")
-        self.session_active = False
-        self.root.destroy()
-
-#main function to run and compile the code
-if __name__ == "__main__":
-    client = StudentClient()
-    client.root.mainloop()
+import threading #for polling (not freezing student's GUI)
+import time #for using session timers and delays
+import os #replaces the import sockets to make it raw and file checks
+import socket #for running raw sockets
+import struct  #for raw packet processing
+import argparse #for the optional database backend and the legacy listeners
+import tkinter as Tkinter #students GUI
+import tkinter.scrolledtext as ScrolledText #for scrolling
+from tkinter import messagebox, simpledialog #for dialog boxes, warnings, input
+import CommonPath #puts ../Common (modules shared with the non-raw variant) on the import path
+from RosterView import RosterView, ROSTER_REFRESH_MS #attendance table that redraws only changed rows
+from FileWatcher import FileWatcher #wakes the pollers only when a file changes
+import AttendanceJournal #append-only join/leave journal behind attendance_list.txt
+import StudentInbox #tailed per-student message inboxes
+from collections import OrderedDict #recently seen tutor events, oldest first
+from SessionMulticast import MulticastSubscriber, GAP_TIMEOUT #session-wide events from the tutor's multicast group
+from AttendanceStore import AttendanceStore #optional SQLite roster and attendance history
+
+#declaration of files
+CHECK_IN_REQUESTS_FILE = "check_in_requests.txt"
+ATTENDANCE_LIST_FILE = "attendance_list.txt"
+SESSION_STATUS_FILE = "session_status.txt"
+SESSION_CAPACITY_FILE = "session_capacity.txt"
+DEFAULT_CAPACITY = 30 #used when the tutor has not written its seat limit
+MESSAGE_HISTORY_LIMIT = 500 #oldest lines are dropped from the messages box beyond this
+DUPLICATE_WINDOW = GAP_TIMEOUT + 1.0 #seconds within which the same event on another channel is a copy (multicast may resend late)
+
+#student class
+class StudentClient:
+
+    #function initialization for attributes and student's windows
+    def __init__(self, store=None, truncate_inbox=True, legacy_broadcast=False):
+        self.store = store #AttendanceStore when running with --db, None for the file-only mode
+        self.truncate_inbox = truncate_inbox #empties the inbox file once its messages are delivered
+        self.legacy_broadcast = legacy_broadcast #also listens over TCP and ICMP, for a tutor run with --legacy-broadcast
+        self.root = Tkinter.Tk()
+        self.root.title("Student Client")
+
+        #creates main window
+        self.is_checked_in = False
+        self.student_id = None
+        self.student_name = None
+        self.my_port = None
+
+        #stores session data
+        self.session_active = False
+        self.active_ports = set()
+
+        #roster read from the journal by the poll thread, drawn by the Tk main loop
+        self.roster = {}  #{student_id: (port, name)}
+        self.roster_changed = set()  #student ids whose rows are out of date
+        self.roster_lock = threading.Lock()
+
+        #last ICMP sequence number seen per tutor, so repeats (like the kernel's echo reply) are dropped
+        self.raw_last_sequence = {}
+
+        #joined once after check-in; the TCP and raw listeners are only started with --legacy-broadcast
+        self.multicast = None
+
+        #a legacy tutor sends every event over multicast, ICMP and TCP, so copies seen on a second channel are dropped
+        self.recent_events = OrderedDict()  #{event text: when first seen}
+        self.recent_events_lock = threading.Lock()
+
+        #local countdown driven by the tutor's deadline messages
+        self.timer_deadline = None
+        self.timer_paused_remaining = None
+        self.timer_after_id = None
+
+        #tracks the session status and student's active ports
+        self.create_widgets()
+        self.root.protocol("WM_DELETE_WINDOW", self.exit_session)
+        self.root.after(ROSTER_REFRESH_MS, self.refresh_attendance_list)
+
+    #function for student's GUI
+    def create_widgets(self):
+        input_frame = Tkinter.Frame(self.root)
+        input_frame.pack(pady=10)
+
+        Tkinter.Label(input_frame, text="Student ID: *5 digits only").grid(row=0, column=0)
+        self.student_id_entry = Tkinter.Entry(input_frame)
+        self.student_id_entry.grid(row=0, column=1)
+
+        Tkinter.Label(input_frame, text="First Name:").grid(row=1, column=0)
+        self.first_name_entry = Tkinter.Entry(input_frame)
+        self.first_name_entry.grid(row=1, column=1)
+
+        Tkinter.Label(input_frame, text="Last Name:").grid(row=2, column=0)
+        self.last_name_entry = Tkinter.Entry(input_frame)
+        self.last_name_entry.grid(row=2, column=1)
+
+        Tkinter.Label(input_frame, text="Your Port: *5 digits only").grid(row=3, column=0)
+        self.port_entry = Tkinter.Entry(input_frame)
+        self.port_entry.grid(row=3, column=1)
+
+        self.check_in_button = Tkinter.Button(input_frame, text="Check In", command=self.check_in)
+        self.check_in_button.grid(row=4, columnspan=2)
+
+        self.timer_label = Tkinter.Label(self.root, text="Session Timer: Not Started")
+        self.timer_label.pack(pady=5)
+
+        Tkinter.Label(self.root, text="Attendance List:").pack()
+        self.attendance_list = RosterView(self.root, height=8)
+        self.attendance_list.pack(pady=5, fill="both", expand=True)
+
+        Tkinter.Label(self.root, text="Messages & Info:").pack()
+        self.messages_box = ScrolledText.ScrolledText(self.root, width=60, height=8, state='disabled')
+        self.messages_box.pack(pady=5)
+
+        chat_frame = Tkinter.Frame(self.root)
+        chat_frame.pack(pady=10)
+
+        Tkinter.Label(chat_frame, text="Peer Port:").grid(row=0, column=0)
+        self.peer_port_entry = Tkinter.Entry(chat_frame)
+        self.peer_port_entry.grid(row=0, column=1)
+
+        self.send_button = Tkinter.Button(chat_frame, text="Send Message", command=self.send_message, state='disabled')
+        self.send_button.grid(row=1, columnspan=2)
+
+        self.exit_button = Tkinter.Button(chat_frame, text="Exit Session", command=self.exit_session, state='disabled')
+        self.exit_button.grid(row=2, columnspan=2)
+
+    #function for check-in system
+    def check_in(self):
+    
+        #checks if session is already full (before anything is parsed or written)
+        capacity = self.read_capacity()
+        if os.path.exists("student_count.txt"):
+            with open("student_count.txt", "r") as f:
+                count = int(f.read().strip())
+                if count >= capacity:
+                    messagebox.showerror("Session Full", f"Session is full! Maximum {capacity} students allowed.")
+                    return
+
+        if self.is_checked_in:
+            messagebox.showinfo("Already Checked In", "Cannot change ID/Name/Port after check-in.")
+            return
+
+        #gets the student details from the input of the student
+        student_id = self.student_id_entry.get()
+        first_name = self.first_name_entry.get()
+        last_name = self.last_name_entry.get()
+        port = self.port_entry.get()
+
+        #validates the student id and port number as it must be unique (the database checks this atomically at check-in)
+        if not self.store and not self.validate_unique(student_id, port):
+            return
+
+        #validate student names, id, and port numbers
+        if len(student_id) != 5 or not student_id.isdigit():
+            messagebox.showwarning("Input Error", "Student ID must be exactly 5 digits.")
+            return
+        if not first_name.isalpha() or not last_name.isalpha():
+            messagebox.showwarning("Input Error", "Name fields must be alphabetic.")
+            return
+        if len(port) != 5 or not port.isdigit():
+            messagebox.showwarning("Input Error", "Port must be exactly 5 digits.")
+            return
+
+        #claims the id and port in one transaction; the unique indexes refuse duplicates
+        if self.store:
+            reason = self.store.check_in(student_id, port, f"{first_name} {last_name}", limit=capacity)
+            if reason:
+                messagebox.showerror("Error", reason)
+                return
+
+        self.student_id = student_id
+        self.student_name = f"{first_name} {last_name}"
+        self.my_port = port
+
+        #appends the join record to the attendance journal
+        AttendanceJournal.record_join(ATTENDANCE_LIST_FILE, port, student_id, self.student_name)
+
+        #starts background threading after students checked in successfully
+        self.append_message("Checked in successfully.")
+        self.is_checked_in = True
+        self.session_active = True
+        self.active_ports.add(port)
+
+        #start the listeners:
+        threading.Thread(target=self.poll_incoming_messages, daemon=True).start()
+        threading.Thread(target=self.poll_attendance_list, daemon=True).start()
+        if self.legacy_broadcast:
+            threading.Thread(target=self.start_tcp_listener, daemon=True).start()
+            threading.Thread(target=self.listen_raw_socket, daemon=True).start() #raw listener
+        try:
+            self.multicast = MulticastSubscriber(self.process_tutor_message)
+            self.multicast.start()
+        except OSError as e:
+            if self.legacy_broadcast:
+                self.append_message(f"Multicast unavailable ({e}), waiting for TCP/ICMP events.")
+            else:
+                self.append_message(f"Multicast unavailable ({e}), run the tutor and this client with --legacy-broadcast.")
+
+        #disabled fields
+        self.student_id_entry.config(state='disabled')
+        self.first_name_entry.config(state='disabled')
+        self.last_name_entry.config(state='disabled')
+        self.port_entry.config(state='disabled')
+        self.check_in_button.config(state='disabled')
+
+        #enabled fields
+        self.send_button.config(state='normal')
+        self.exit_button.config(state='normal')
+
+    #function that returns the tutor's seat limit
+    def read_capacity(self):
+        try:
+            with open(SESSION_CAPACITY_FILE, "r") as f:
+                return int(f.read().strip())
+        except (OSError, ValueError):
+            return DEFAULT_CAPACITY
+
+    #function for validating student id and port number (ensures no duplicates are present)
+    def validate_unique(self, student_id, port):
+        reader = AttendanceJournal.JournalReader(ATTENDANCE_LIST_FILE)
+        reader.read_new()
+        for sid, (_, p) in reader.roster.items():
+            if p == port:
+                messagebox.showerror("Error", "Port already in use!")
+                return False
+            if sid == student_id:
+                messagebox.showerror("Error", "Student ID already in use!")
+                return False
+        return True
+
+    #TCP listener from tutor
+    def start_tcp_listener(self):
+        s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        s.bind(('127.0.0.1', int(self.my_port)))
+        s.listen(5)
+        print(f"[TCP] Listening on port {self.my_port}")
+
+        while self.session_active:
+            try:
+                client_socket, addr = s.accept()
+                threading.Thread(target=self.read_tutor_connection, args=(client_socket,), daemon=True).start()
+            except Exception:
+                continue
+
+        s.close()
+
+    #function that reads every newline-terminated message the tutor sends on one kept-open connection
+    def read_tutor_connection(self, client_socket):
+        buffer = b""
+        with client_socket:
+            while self.session_active:
+                try:
+                    data = client_socket.recv(4096)
+                except OSError:
+                    break
+                if not data:
+                    break
+                buffer += data
+                *lines, buffer = buffer.split(b"\n")
+                for line in lines:
+                    if line:
+                        self.process_tutor_message(line.decode(errors='ignore'))
+
+    #raw socket listener (ICMP)
+    def listen_raw_socket(self):
+        try:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_RAW, socket.IPPROTO_ICMP)
+            print("[RAW] Listening for ICMP packets...")
+            while self.session_active:
+                packet, addr = sock.recvfrom(65535)
+                self.process_raw_packet(packet)
+        except PermissionError:
+            print("[Raw socket] Run as admin/root")
+        except Exception as e:
+            print(f"[Raw error] {e}")
+
+    #proccesses the raw packets from the tutor using ICMP, timer, 5 minute warning and end session
+    def process_raw_packet(self, packet):
+        icmp_header = packet[20:28]
+        icmp_type, code, checksum, p_id, sequence = struct.unpack('!BBHHH', icmp_header)
+
+        #only packets newer than the last one from this tutor (sequence numbers wrap at 16 bits)
+        if icmp_type not in (0, 8):
+            return
+        last = self.raw_last_sequence.get(p_id)
+        if last is not None and not 0 < (sequence - last) & 0xFFFF < 0x8000:
+            return
+        self.raw_last_sequence[p_id] = sequence
+
+        self.process_tutor_message(packet[28:].decode(errors='ignore'))
+
+    #tutor messages processor (multicast, and TCP and ICMP with --legacy-broadcast)
+    def process_tutor_message(self, msg):
+        if self.legacy_broadcast and self.is_repeat(msg):
+            return
+        if msg.startswith("popup:5min-warning"):
+            self.root.after(0, self.show_5min_warning)
+        elif msg.startswith("popup:session-ended"):
+            self.root.after(0, self.show_session_end)
+        elif msg.startswith("deadline:"):
+            self.handle_deadline(msg.split("deadline:")[1])
+        elif msg.startswith("timer:"):
+            timer_value = msg.split("timer:")[1]
+            self.root.after(0, lambda: self.update_timer_display(timer_value))
+        elif msg.startswith("msg:"):
+            message = msg.split("msg:")[1]
+            self.root.after(0, lambda: self.append_message(f"Tutor: {message}"))
+
+    #function that reports whether the same event already arrived on another channel within DUPLICATE_WINDOW (any listener thread)
+    def is_repeat(self, msg):
+        now = time.monotonic()
+        with self.recent_events_lock:
+            while self.recent_events:
+                oldest, seen = next(iter(self.recent_events.items()))
+                if now - seen < DUPLICATE_WINDOW:
+                    break
+                del self.recent_events[oldest]
+            if msg in self.recent_events:
+                return True
+            self.recent_events[msg] = now
+            return False
+
+    #function that parses "remaining:running|paused" from the tutor and resyncs the local countdown
+    def handle_deadline(self, value):
+        remaining, _, state = value.partition(":")
+        try:
+            remaining = float(remaining)
+        except ValueError:
+            return #skips malformed updates
+        received = time.monotonic() #measured now, not when the GUI thread gets to it
+        self.root.after(0, lambda: self.sync_timer(remaining - (time.monotonic() - received), state.strip() == "paused"))
+
+    #function that resets the local countdown to the tutor's deadline
+    def sync_timer(self, remaining, paused):
+        self.timer_deadline = time.monotonic() + remaining
+        self.timer_paused_remaining = remaining if paused else None
+        if self.timer_after_id is not None:
+            self.root.after_cancel(self.timer_after_id)
+        self.tick_timer()
+
+    #function that redraws the countdown and schedules itself for the moment the displayed second changes
+    def tick_timer(self):
+        self.timer_after_id = None
+        if self.timer_paused_remaining is not None:
+            minutes, seconds = divmod(int(self.timer_paused_remaining), 60)
+            self.timer_label.config(text=f"Session Timer: {minutes:02}:{seconds:02} (paused)")
+            return
+        remaining = self.timer_deadline - time.monotonic()
+        if remaining <= 0:
+            self.timer_label.config(text="Session Timer: 00:00")
+            return
+        minutes, seconds = divmod(int(remaining), 60)
+        self.timer_label.config(text=f"Session Timer: {minutes:02}:{seconds:02}")
+        self.timer_after_id = self.root.after(int((remaining % 1) * 1000) + 1, self.tick_timer)
+
+    #displays the 5 minute warning message
+    def show_5min_warning(self):
+        messagebox.showwarning("5 Minute Warning", "Only 5 minutes remaining!")
+        self.append_message("5 minutes remaining in session!")
+
+    #displays the end session message
+    def show_session_end(self):
+        messagebox.showinfo("Session Ended", "Session has ended.")
+        self.append_message("Session ended.")
+        if self.timer_after_id is not None:
+            self.root.after_cancel(self.timer_after_id)
+            self.timer_after_id = None
+        self.timer_label.config(text="Session Timer: Ended")
+        self.session_active = False
+
+    #updates the session timer on tutor's GUI
+    def update_timer_display(self, timer_value):
+        self.timer_label.config(text=f"Session Timer: {timer_value}")
+
+    #function that displays the attendance list and saves it into a file
+    def poll_attendance_list(self):
+        watcher = FileWatcher(ATTENDANCE_LIST_FILE, poll_interval=2.0)
+        reader = AttendanceJournal.JournalReader(ATTENDANCE_LIST_FILE)
+        changed = True #shows the current list straight away
+        first_read = True
+        while self.session_active:
+            
+            #applies only the journal records appended since the last read
+            if changed:
+                reset, joined, left = reader.read_new()
+                if first_read or reset or joined or left:
+                    self.update_attendance_list(reader, reset or first_read, joined, left)
+                    first_read = False
+
+            #the timeout only lets the loop notice the session ending
+            changed = watcher.wait(timeout=2.0)
+        watcher.close()
+
+    #function that applies new journal records to the roster and marks the rows that changed (poll thread)
+    def update_attendance_list(self, reader, reset, joined, left):
+        with self.roster_lock:
+
+            #first read, or the journal was compacted or restarted: rebuild from the reader's roster
+            if reset:
+                self.roster_changed.update(self.roster)
+                self.roster = {}
+                self.active_ports.clear()
+                joined = [(sid, name, port) for sid, (name, port) in reader.roster.items()]
+                left = []
+
+            for sid, port in left:
+                self.roster.pop(sid, None)
+                self.roster_changed.add(sid)
+                self.active_ports.discard(port)
+
+            for sid, name, port in joined:
+                self.roster[sid] = (port, name)
+                self.roster_changed.add(sid)
+                self.active_ports.add(port)
+
+    #function that draws the rows changed since the last refresh, then runs again after ROSTER_REFRESH_MS (Tk main loop)
+    def refresh_attendance_list(self):
+        with self.roster_lock:
+            changed, self.roster_changed = self.roster_changed, set()
+            rows = {sid: self.roster[sid] for sid in changed if sid in self.roster}
+        if changed:
+            self.attendance_list.update_rows(rows, changed)
+        self.root.after(ROSTER_REFRESH_MS, self.refresh_attendance_list)
+
+    #function that sends messages to other students and validates it
+    def send_message(self):
+        peer_port = self.peer_port_entry.get().strip()
+        
+        #if port number is not in integer
+        if not peer_port.isdigit():
+            messagebox.showerror("Invalid Input", "Enter valid port number.")
+            return
+            
+        #if port number you entered is your own port number
+        if peer_port == self.my_port:
+            messagebox.showerror("Invalid", "Cannot message yourself!")
+            return
+            
+        #if the port is no longer available(in the session)
+        if peer_port not in self.active_ports:
+            messagebox.showerror("Invalid", "Port does not exist in attendance!")
+            return
+
+        #enter the message after validation of port number
+        message = simpledialog.askstring("Send Message", "Enter message:")
+        if not message:
+            return
+
+        #displays the message for sender
+        self.append_message(f"You => {peer_port}: {message}")
+        
+        #displays the message to the receiver's message inbox
+        StudentInbox.append_message(StudentInbox.inbox_path(peer_port), self.my_port, message)
+
+    #function that displays the incoming messages from other students
+    def poll_incoming_messages(self):
+        inbox_file = StudentInbox.inbox_path(self.my_port)
+        reader = StudentInbox.InboxReader(inbox_file, truncate_delivered=self.truncate_inbox)
+        watcher = FileWatcher(inbox_file, poll_interval=1.0)
+        changed = True #delivers anything already waiting in the inbox
+
+        #reads only what was appended since the last read (the offset survives restarts)
+        while self.session_active:
+            if changed:
+                for message_id, sender, text in reader.read_new():
+                    self.root.after(0, lambda sender=sender, text=text: self.append_message(f"From {sender}: {text}"))
+            changed = watcher.wait(timeout=1.0)
+        watcher.close()
+
+    #function appends the message to the student's GUI message box (keeps the last MESSAGE_HISTORY_LIMIT lines)
+    def append_message(self, message):
+        self.messages_box.config(state='normal')
+        self.messages_box.insert('end', message + '\n')
+        lines = int(self.messages_box.index('end-1c').split('.')[0]) - 1
+        if lines > MESSAGE_HISTORY_LIMIT:
+            self.messages_box.delete('1.0', f"{lines - MESSAGE_HISTORY_LIMIT + 1}.0")
+        self.messages_box.config(state='disabled')
+        self.messages_box.yview('end')
+
+    #function that exists the session and exists the student's GUI
+    def exit_session(self):
+        if not self.is_checked_in:
+            self.root.destroy()
+            return
+
+        #appends a leave record instead of rewriting the attendance file
+        if self.store:
+            self.store.check_out(self.student_id, self.my_port)
+        AttendanceJournal.record_leave(ATTENDANCE_LIST_FILE, self.my_port, self.student_id)
+
+        #decrease the student count in student_count.txt
+        if os.path.exists("student_count.txt"):
+            with open("student_count.txt", "r") as f:
+                count = int(f.read().strip())
+            count = max(count - 1, 0) #prevent going negative
+            with open("student_count.txt", "w") as f:
+                f.write(str(count))
+
+        #appends the message of the updated session
+        self.append_message("Exited session. Attendance updated.")
+        self.session_active = False
+        if self.multicast:
+            self.multicast.close()
+        self.root.destroy()
+
+#main function to run and compile the code
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Student client (raw sockets)")
+    parser.add_argument("--db", metavar="PATH", help="check in through this SQLite database (same path as the tutor's --db)")
+    parser.add_argument("--keep-inbox", action="store_true", help="never truncate the inbox file after its messages are delivered")
+    parser.add_argument("--legacy-broadcast", action="store_true", help="also listen for the tutor's ICMP and TCP events (tutor run with --legacy-broadcast)")
+    args = parser.parse_args()
+
+    client = StudentClient(store=AttendanceStore(args.db) if args.db else None, truncate_inbox=not args.keep_inbox, legacy_broadcast=args.legacy_broadcast)
+    client.root.mainloop()
@@ -0,0 +1,127 @@
+import os #for file checks, truncation and atomic replace
+import time #for message ids
+import itertools #per-process message counter
+from collections import deque #bounded memory of delivered message ids
+from AttendanceJournal import open_locked #same append lock as the attendance journal
+
+#each student's inbox (student_<port>.txt) is an append-only stream of records:
+#  MSG message_id from_port text
+#the owner tails it from a byte offset that survives restarts (student_<port>.txt.offset)
+MSG = "MSG"
+SEEN_IDS_LIMIT = 1024 #delivered ids remembered to drop a replayed record (e.g. after a crash before the offset was saved)
+TRUNCATE_AT = 64 * 1024 #once this much has been read and delivered, the inbox is emptied
+
+message_sequence = itertools.count() #makes ids unique within one process
+
+#function that returns the inbox file of the student listening on port
+def inbox_path(port):
+    return f"student_{port}.txt"
+
+#function that appends one message to a student's inbox; returns its id
+def append_message(path, from_port, text):
+    message_id = f"{from_port}-{time.time_ns()}-{next(message_sequence)}"
+    text = " ".join(str(text).splitlines()) #one record per line
+    with open_locked(path) as f:
+        f.write(f"{MSG} {message_id} {from_port} {text}\n")
+    return message_id
+
+#function that parses one record, returns (message_id, from_port, text); lines in the old "From port: text" format get no id
+def parse_message(line):
+    kind, _, body = line.rstrip("\n").partition(" ")
+    if kind == MSG:
+        parts = body.split(" ", 2)
+        if len(parts) >= 2:
+            return parts[0], parts[1], parts[2] if len(parts) == 3 else ""
+    if line.startswith("From ") and ": " in line:
+        sender, _, text = line[5:].rstrip("\n").partition(": ")
+        return None, sender, text
+    return None
+
+#incremental reader: only the records appended since the last read are parsed, and delivered records can be truncated away
+class InboxReader:
+    #initialization
+    def __init__(self, path, persist_offset=True, truncate_delivered=True):
+        self.path = path
+        self.offset_path = path + ".offset" if persist_offset else None
+        self.truncate_delivered = truncate_delivered
+        self.offset = 0
+        self.inode = None
+        self.partial = b""  #an unfinished last line, completed by the next read
+        self.seen_ids = deque(maxlen=SEEN_IDS_LIMIT)
+        self.seen_set = set()
+        self.load_offset()
+
+    #function that restores the offset saved by an earlier run (ignored if the inbox was replaced since)
+    def load_offset(self):
+        if not self.offset_path:
+            return
+        try:
+            with open(self.offset_path) as f:
+                inode, offset = (int(value) for value in f.read().split())
+        except (OSError, ValueError):
+            return
+        self.inode, self.offset = inode, offset
+
+    #function that saves the offset atomically so a restart does not deliver the same messages again
+    def save_offset(self):
+        if not self.offset_path or self.inode is None:
+            return
+        temp_path = self.offset_path + ".tmp"
+        try:
+            with open(temp_path, "w") as f:
+                f.write(f"{self.inode} {self.offset}")
+            os.replace(temp_path, self.offset_path)
+        except OSError:
+            pass
+
+    #function that reads the new tail; returns [(message_id, from_port, text)] for messages not delivered before
+    def read_new(self):
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return []
+
+        #a new inode or a shorter file means the inbox was replaced or emptied, so it is read from the start
+        if st.st_ino != self.inode or st.st_size < self.offset:
+            self.inode = st.st_ino
+            self.offset = 0
+            self.partial = b""
+        if st.st_size == self.offset:
+            return []
+
+        with open(self.path, "rb") as f:
+            f.seek(self.offset)
+            data = f.read()
+        self.offset += len(data)
+        *lines, self.partial = (self.partial + data).split(b"\n")
+
+        messages = []
+        for line in lines:
+            message = parse_message(line.decode("utf-8", errors="ignore"))
+            if message is None:
+                continue
+            message_id = message[0]
+            if message_id is not None:
+                if message_id in self.seen_set:
+                    continue
+                if len(self.seen_ids) == self.seen_ids.maxlen:
+                    self.seen_set.discard(self.seen_ids[0])
+                self.seen_ids.append(message_id)
+                self.seen_set.add(message_id)
+            messages.append(message)
+
+        if self.truncate_delivered and self.offset >= TRUNCATE_AT and not self.partial:
+            self.truncate()
+        self.save_offset()
+        return messages
+
+    #function that empties the inbox if nothing was appended after what was just delivered
+    def truncate(self):
+        try:
+            f = open_locked(self.path)
+        except FileNotFoundError:
+            return
+        with f:
+            if os.fstat(f.fileno()).st_size == self.offset:
+                f.truncate(0)
+                self.offset = 0
@@ -0,0 +1,132 @@
+import threading #lets the multicast publisher linger without holding up the window
+import time #for capping the roster refresh rate
+import tkinter as Tkinter #tutor's GUI
+from tkinter import messagebox #for dialog boxes, warnings, input
+import CommonPath #puts ../Common (modules shared with the non-raw variant) on the import path
+from RosterView import RosterView, ROSTER_REFRESH_MS #attendance table that redraws only changed rows
+from TutorTrace import tracer #times the roster redraws
+from SessionMulticast import LINGER #how long the tutor keeps answering NACKs after closing
+from TutorEvents import EventQueue, EVENT_ATTENDANCE, EVENT_SESSION_STARTED, EVENT_TIMER, EVENT_WARNING, EVENT_SESSION_ENDED #the server only publishes events, the window renders them
+
+EVENT_POLL_MS = 50 #how often the Tk main thread drains the server's events
+
+#class that holds the tutor's server GUI
+class TutorGUI:
+    #initialization of the tutor's GUI
+    def __init__(self, server):
+        self.server = server
+        self.root = Tkinter.Tk()
+        self.root.title("Tutor Server")
+
+        self.attendance_display = RosterView(self.root, height=10)
+        self.attendance_display.pack(pady=10, fill="both", expand=True)
+        self.pending_students = None  #latest roster snapshot not drawn yet
+        self.last_roster_refresh = 0.0
+
+        self.timer_label = Tkinter.Label(self.root, text="Session Timer: Not Started")
+        self.timer_label.pack(pady=10)
+
+        self.start_button = Tkinter.Button(self.root, text="Start Session", command=self.start_session)
+        self.start_button.pack(pady=5)
+
+        self.end_button = Tkinter.Button(self.root, text="End Session", command=self.end_session)
+        self.end_button.pack(pady=5)
+
+        self.pause_button = Tkinter.Button(self.root, text="Pause Session", command=self.toggle_pause)
+        self.pause_button.pack(pady=5)
+
+        self.extend_button = Tkinter.Button(self.root, text="Extend 5 Minutes", command=lambda: self.server.extend_session(5 * 60))
+        self.extend_button.pack(pady=5)
+
+        #Tk is not thread-safe, so server threads only queue events here and the main loop applies them
+        self.timer_after_id = None
+        self.events = EventQueue(self.server)
+        self.root.after(EVENT_POLL_MS, self.drain_events)
+
+        self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
+
+    #function that applies every queued server event on the Tk main thread
+    def drain_events(self):
+        for event, data in self.events.drain():
+            if event == EVENT_ATTENDANCE:
+                self.pending_students = data  #only the newest snapshot matters, older ones are skipped
+            elif event in (EVENT_SESSION_STARTED, EVENT_TIMER):
+                self.update_timer()
+            elif event == EVENT_WARNING:
+                self.show_warning_popup()
+            elif event == EVENT_SESSION_ENDED:
+                self.stop_timer()
+                self.timer_label.config(text="Session Timer: Ended")
+                self.show_end_popup()
+
+        #a burst of journal changes becomes one redraw, at most every ROSTER_REFRESH_MS
+        now = time.monotonic()
+        if self.pending_students is not None and now - self.last_roster_refresh >= ROSTER_REFRESH_MS / 1000:
+            self.update_attendance_display(self.pending_students)
+            self.pending_students = None
+            self.last_roster_refresh = now
+        self.root.after(EVENT_POLL_MS, self.drain_events)
+
+    #function that updates the attendance (only rows that changed are redrawn)
+    def update_attendance_display(self, students):
+        with tracer.span("roster_redraw", rows=len(students)):
+            self.attendance_display.show({sid: (port, name) for sid, (name, port) in students.items()})
+
+    #function that updates the session timer once a second from the server's deadline
+    def update_timer(self):
+        self.stop_timer()
+        if not self.server.session_active:
+            return
+        remaining_time, paused = self.server.remaining_time()
+
+        #displays the remaining time on tutor's GUI
+        if remaining_time > 0:
+            minutes, seconds = divmod(int(remaining_time), 60)
+            self.timer_label.config(text=f"Session Timer: {minutes:02}:{seconds:02}{' (paused)' if paused else ''}")
+            self.timer_after_id = self.root.after(1000, self.update_timer)
+
+        #when session ends, updates it on the tutor's GUI
+        else:
+            self.timer_label.config(text="Session Timer: Ended")
+
+    #function that cancels the pending timer refresh
+    def stop_timer(self):
+        if self.timer_after_id is not None:
+            self.root.after_cancel(self.timer_after_id)
+            self.timer_after_id = None
+
+    #function that validates that you sent the end of session message
+    def show_end_popup(self):
+        messagebox.showinfo("Session Ended", "Session has ended!")
+
+    #function that displays the warning message to tutor
+    def show_warning_popup(self):
+        messagebox.showinfo("5-Minute Warning", "5 minutes remaining in session!")
+
+    #function that starts the session timer
+    def start_session(self):
+        if not self.server.session_active:
+            self.server.start_session()
+
+    #function that pauses or resumes the session clock
+    def toggle_pause(self):
+        if not self.server.session_active:
+            return
+        if self.server.paused_remaining is None:
+            self.server.pause_session()
+            self.pause_button.config(text="Resume Session")
+        else:
+            self.server.resume_session()
+            self.pause_button.config(text="Pause Session")
+
+    #function that ends the session on time
+    def end_session(self):
+        if self.server.session_active:
+            self.server.end_session()
+
+    #function that ends the tutor's GUI when the tutor exits
+    def on_closing(self):
+        self.end_session()
+        #not a daemon, so the process keeps answering NACKs for the session end for LINGER seconds after the window is gone
+        threading.Thread(target=self.server.multicast.close, kwargs={"linger": LINGER}).start()
+        self.root.destroy()
@@ -1,290 +1,469 @@
-import threading #to run background tasks (not freezing tutor's GUI)
-import time #for using session timers and delays
-import struct #for raw packet processing
-import socket #for running raw sockets
-import os #replaces the import sockets to make it raw and file checks
-import tkinter as Tkinter #tutor's GUI
-import tkinter.scrolledtext as ScrolledText #for scrolling
-from tkinter import messagebox #for dialog boxes, warnings, input
-
-#declaration of files
-ATTENDANCE_LIST_FILE = "attendance_list.txt"
-SESSION_STATUS_FILE = "session_status.txt"
-
-#tutor server class
-class TutorServer:
-    #function initialization for attributes and tutor's windows
-    def __init__(self, gui):
-        self.gui = gui
-        self.students = {}  #{student_id: (student_name, port)}
-        self.student_limit = 30 #max of 30 students allowed
-        self.lock = threading.Lock()
-
-        #creates the main window
-        self.session_active = False
-        
-        #30 minutes session
-        self.session_duration = 30 * 60
-        self.session_end_time = None
-        self.warning_sent = False
-
-        #resets the student count file at start
-        with open("student_count.txt", "w") as f:
-            f.write("0")
-            
-        #creates a fresh start of the attendance and session file
-        open(ATTENDANCE_LIST_FILE, 'w').close()
-        open(SESSION_STATUS_FILE, 'w').close()
-
-        #starts the background threading
-        threading.Thread(target=self.poll_attendance_file, daemon=True).start()
-
-    #function that adds the attendance to the attendance file
-    def poll_attendance_file(self):
-    
-        #looks at the attendance list file for any updates
-        last_lines = []
-        while True:
-            time.sleep(1)
-            
-            #reads the attendance file if it exists
-            if os.path.exists(ATTENDANCE_LIST_FILE):
-                with open(ATTENDANCE_LIST_FILE, "r") as f:
-                    lines = f.readlines()
-                    
-                #if the attendance file has been updated then reloads the data into the tutor's GUI
-                if lines != last_lines:
-                    last_lines = lines
-                    self.reload_attendance(lines)
-
-    #reloads the attendance into the tutor's GUI with the student's port number, student id and name (internal student information)
-    def reload_attendance(self, lines):
-        with self.lock:
-            self.students.clear()
-            count = 0 #counts current students
-            
-            #reads each line from the file and splits the student info into port number, student id, and name
-            for line in lines:
-                try:
-                    port, sid, name = line.strip().split('-')
-                    if count < self.student_limit:
-                        self.students[sid] = (name, port)
-                        count += 1
-                except ValueError:
-                
-                    #skips the extra students beyond limit
-                    continue
-            self.gui.update_attendance_display()
-            
-            #saves the current student count to a file (students will check this)
-            with open("student_count.txt", "w") as count_file:
-                count_file.write(str(count))
-
-    #function to start the session and begins the threading
-    def start_session(self):
-        self.session_active = True
-        self.session_end_time = time.time() + self.session_duration
-        self.warning_sent = False
-
-        #activates the session and monitors when it would end
-        threading.Thread(target=self.session_timer, daemon=True).start()
-        threading.Thread(target=self.gui.update_timer, daemon=True).start()
-
-    #function that times the session and warns students for 5 minutes remaining
-    def session_timer(self):
-        while self.session_active:
-            remaining = self.session_end_time - time.time()
-
-            #when timer hits zero then ends the session
-            if remaining <= 0:
-                self.end_session()
-                break
-
-            #sends 5 min warning once
-            if remaining <= 5 * 60 and not self.warning_sent:
-                self.warning_sent = True
-                self.write_session_status("WARNING_5_MINUTES")
-                self.gui.show_warning_popup()
-
-                #broadcasts the 5 minute warning message to students
-                self.broadcast_raw_socket(b"popup:5min-warning")
-                self.broadcast_tcp("popup:5min-warning")
-                print("Sent 5-minute warning to students!")
-
-            #real-time session timer
-            minutes, seconds = divmod(int(remaining), 60)
-            timer_display = f"{minutes:02}:{seconds:02}"
-            self.write_session_status(f"TIMER:{timer_display}")
-
-            #broadcasts the session timer to all students
-            self.broadcast_raw_socket(f"timer:{timer_display}".encode())
-            self.broadcast_tcp(f"timer:{timer_display}")
-            
-            #wait for a second before looping - real-time
-            time.sleep(1)
-
-    #function that ends the session and saves the attendance
-    def end_session(self):
-        self.session_active = False
-        self.write_session_status("SESSION_ENDED")
-        self.gui.timer_label.config(text="Session Timer: Ended")
-        self.gui.update_attendance_display()
-
-        #saves the final attendance
-        with open("final_attendance_log.txt", "w") as f:
-            for sid, (name, port) in self.students.items():
-                f.write(f"Port: {port}, ID: {sid}, Name: {name}\n")
-
-        #broadcasts the session end message
-        self.broadcast_raw_socket(b"popup:session-ended")
-        self.broadcast_tcp("popup:session-ended")
-        print("Session ended, notified students.")
-
-        #sends the popup message to students that the session has ended
-        self.gui.show_end_popup()
-
-    #functions that write the session status to a file
-    def write_session_status(self, status_message):
-        with open(SESSION_STATUS_FILE, 'w') as f:
-            f.write(status_message)
-
-    #ICMP raw broadcast (existing)
-    def broadcast_raw_socket(self, payload_msg):
-        try:
-            s = socket.socket(socket.AF_INET, socket.SOCK_RAW, socket.IPPROTO_ICMP)
-            icmp_type = 8
-            code = 0
-            checksum = 0
-            packet_id = os.getpid() & 0xFFFF
-            sequence = 1
-
-            header = struct.pack('!BBHHH', icmp_type, code, checksum, packet_id, sequence)
-            data = payload_msg
-
-            checksum = self.calculate_checksum(header + data)
-            header = struct.pack('!BBHHH', icmp_type, code, checksum, packet_id, sequence)
-            packet = header + data
-
-            s.sendto(packet, ('127.0.0.1', 1))
-            s.close()
-        except PermissionError:
-            print("[Error] Run tutor script as admin/root to use raw sockets.")
-        except Exception as e:
-            print(f"[Raw socket error] {e}")
-
-    #TCP broadcast
-    def broadcast_tcp(self, message):
-        for sid, (name, port) in self.students.items():
-            try:
-                student_port = int(port)
-                s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                s.settimeout(1)
-                s.connect(('127.0.0.1', student_port))
-                s.sendall(message.encode())
-                s.close()
-            except Exception:
-                continue  #skips unreachable students
-
-    def calculate_checksum(self, source_string):
-        countTo = (int(len(source_string) / 2)) * 2
-        sum = 0
-        count = 0
-
-        while count < countTo:
-            thisVal = source_string[count + 1] * 256 + source_string[count]
-            sum = sum + thisVal
-            sum = sum & 0xffffffff
-            count = count + 2
-
-        if countTo < len(source_string):
-            sum = sum + source_string[len(source_string) - 1]
-            sum = sum & 0xffffffff
-
-        sum = (sum >> 16) + (sum & 0xffff)
-        sum = sum + (sum >> 16)
-        answer = ~sum
-        answer = answer & 0xffff
-        answer = answer >> 8 | (answer << 8 & 0xff00)
-        return answer
-
-#class that holds the tutor's server GUI
-class TutorGUI:
-    #initialization of the tutor's GUI
-    def __init__(self, server):
-        self.server = server
-        self.root = Tkinter.Tk()
-        self.root.title("Tutor Server")
-
-        self.attendance_display = ScrolledText.ScrolledText(self.root, width=50, height=10)
-        self.attendance_display.pack(pady=10)
-
-        self.timer_label = Tkinter.Label(self.root, text="Session Timer: Not Started")
-        self.timer_label.pack(pady=10)
-
-        self.start_button = Tkinter.Button(self.root, text="Start Session", command=self.start_session)
-        self.start_button.pack(pady=5)
-
-        self.end_button = Tkinter.Button(self.root, text="End Session", command=self.end_session)
-        self.end_button.pack(pady=5)
-
-        self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
-
-    #function that updates the attendance
-    def update_attendance_display(self):
-        attendance_message = "Current Attendance:\n"
-        for sid, (name, port) in self.server.students.items():
-            attendance_message += f"Port: {port}, ID: {sid}, Name: {name}\n"
-
-        #clears and displays the updated attendance list
-        self.attendance_display.config(state='normal')
-        self.attendance_display.delete('1.0', Tkinter.END)
-        self.attendance_display.insert(Tkinter.END, attendance_message)
-        self.attendance_display.config(state='disabled')
-
-    #function that updates the session timer
-    def update_timer(self):
-    
-        #runs the timer while the session is active
-        while self.server.session_active:
-            remaining_time = self.server.session_end_time - time.time()
-            
-            #displays the remaining time on tutor's GUI
-            if remaining_time > 0:
-                minutes, seconds = divmod(int(remaining_time), 60)
-                self.timer_label.config(text=f"Session Timer: {minutes:02}:{seconds:02}")
-                
-            #when session ends, updates it on the tutor;s GUI
-            else:
-                self.timer_label.config(text="Session Timer: Ended")
-                break
-            time.sleep(1)
-
-    #function that validates that you sent the end of session message
-    def show_end_popup(self):
-        messagebox.showinfo("Session Ended", "Session has ended!")
-
-    #function that displays the warning message to tutor
-    def show_warning_popup(self):
-        messagebox.showinfo("5-Minute Warning", "5 minutes remaining in session!")
-
-    #function that starts the session timer
-    def start_session(self):
-        if not self.server.session_active:
-            self.server.start_session()
-
-    #function that ends the session on time
-    def end_session(self):
-        if self.server.session_active:
-            self.server.end_session()
-
-    #function that ends the tutor's GUI when the tutor exits
-    def on_closing(self):
-        self.end_session()
-        self.root.destroy()
-
-#main function to run and compile the code
-if __name__ == "__main__":
-    gui = TutorGUI(None)
-    server = TutorServer(gui)
-    gui.server = server
-    gui.root.mainloop()
+import threading #to run background tasks (not freezing tutor's GUI)
+import time #for using session timers and delays
+import socket #for running raw sockets
+import os #replaces the import sockets to make it raw and file checks
+import argparse #for the optional database backend
+import signal #stops the headless daemon cleanly on SIGTERM
+import CommonPath #puts ../Common (modules shared with the non-raw variant) on the import path
+from TutorEvents import EVENT_ATTENDANCE, EVENT_SESSION_STARTED, EVENT_TIMER, EVENT_WARNING, EVENT_SESSION_ENDED, print_event #events published to the GUI and the headless console
+from FileWatcher import FileWatcher #wakes the pollers only when a file changes
+import AttendanceJournal #append-only join/leave journal behind attendance_list.txt
+from AttendanceStore import AttendanceStore #optional SQLite roster and attendance history
+from RawBroadcaster import RawBroadcaster #one raw socket and prebuilt ICMP headers for the whole session
+from SessionMulticast import MulticastPublisher, LINGER #one UDP datagram per session-wide event reaches every student
+from TutorMetrics import Metrics, MetricsServer, JITTER_BUCKETS #counters and histograms for the opt-in metrics endpoint
+from TutorTrace import tracer, install_trace_signals #spans of the hot paths and the profiling toggle
+
+#declaration of files
+ATTENDANCE_LIST_FILE = "attendance_list.txt"
+SESSION_STATUS_FILE = "session_status.txt"
+SESSION_CAPACITY_FILE = "session_capacity.txt" #students read the seat limit from here
+COMPACT_THRESHOLD = 64 #rewrites the journal once this many dead records have piled up
+COMPACT_INTERVAL = 30 #seconds between compaction checks
+
+#long-lived TCP connections to the students' listeners, keyed by student port
+class StudentConnectionPool:
+    #initialization
+    def __init__(self, host='127.0.0.1', connect_timeout=0.2, send_timeout=0.2, idle_timeout=60, retry_interval=5, on_sent=None):
+        self.host = host
+        self.on_sent = on_sent #on_sent(seconds) after every successful send
+        self.connect_timeout = connect_timeout #short so one dead student cannot stall the tick
+        self.send_timeout = send_timeout
+        self.idle_timeout = idle_timeout #closes connections nobody has used for this long
+        self.retry_interval = retry_interval #waits this long before reconnecting to a student that failed
+        self.connections = {}  #{port: socket}
+        self.last_used = {}  #{port: time of last successful send}
+        self.retry_after = {}  #{port: time when a failed student may be tried again}
+        self.latency = {}  #{port: [last, total, count, max] send latency in seconds}
+        self.lock = threading.Lock()
+
+    #function that sends one message to a student, connecting lazily; returns False if the student is unreachable
+    def send(self, port, data):
+        with self.lock:
+            now = time.time()
+            if self.retry_after.get(port, 0) > now:
+                return False
+            start = time.perf_counter()
+            try:
+                conn = self.connections.get(port)
+                if conn is None:
+                    conn = socket.create_connection((self.host, port), timeout=self.connect_timeout)
+                    conn.settimeout(self.send_timeout)
+                    conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                    self.connections[port] = conn
+                conn.sendall(data)
+            except OSError:
+                self.evict(port)
+                self.retry_after[port] = now + self.retry_interval
+                return False
+            elapsed = time.perf_counter() - start
+            self.last_used[port] = now
+            stats = self.latency.setdefault(port, [0.0, 0.0, 0, 0.0])
+            stats[0] = elapsed
+            stats[1] += elapsed
+            stats[2] += 1
+            stats[3] = max(stats[3], elapsed)
+            if self.on_sent:
+                self.on_sent(elapsed)
+            return True
+
+    #function that closes and forgets one student's connection (caller holds self.lock)
+    def evict(self, port):
+        conn = self.connections.pop(port, None)
+        self.last_used.pop(port, None)
+        if conn:
+            try:
+                conn.close()
+            except OSError:
+                pass
+
+    #function that drops connections to students who left the roster or have been idle too long
+    def evict_stale(self, active_ports):
+        with self.lock:
+            cutoff = time.time() - self.idle_timeout
+            for port in list(self.connections):
+                if port not in active_ports or self.last_used.get(port, 0) < cutoff:
+                    self.evict(port)
+            for port in list(self.retry_after):
+                if port not in active_ports:
+                    del self.retry_after[port]
+
+    #function that returns {port: (last ms, average ms, max ms)} for every student we have sent to
+    def latency_report(self):
+        with self.lock:
+            return {port: (last * 1000, total / count * 1000, worst * 1000)
+                    for port, (last, total, count, worst) in self.latency.items() if count}
+
+    #function that closes every pooled connection
+    def close_all(self):
+        with self.lock:
+            for port in list(self.connections):
+                self.evict(port)
+
+#tutor server class
+class TutorServer:
+    #function initialization for attributes
+    def __init__(self, store=None, student_limit=30, legacy_broadcast=False):
+        self.subscribers = []  #callbacks(event, data) called from whichever server thread changed the state
+        self.store = store #AttendanceStore when running with --db, None for the file-only mode
+        self.students = {}  #{student_id: (student_name, port)}
+        self.student_limit = student_limit #max of 30 students allowed by default
+        self.lock = threading.Lock()
+
+        #creates the main window
+        self.session_active = False
+        
+        #30 minutes session
+        self.session_duration = 30 * 60
+        self.session_end_time = None
+        self.warning_sent = False
+
+        #students count down on their own; the deadline is resent on pause/resume/extend and every minute
+        self.timer_resync_interval = 60
+        self.paused_remaining = None #seconds left while the session is paused, None while running
+        self.timer_wakeup = threading.Event() #wakes the timer thread early after a pause, resume, extend or end
+
+        #session-wide events go to the multicast group, which replaces the per-student ICMP and TCP fan-out
+        self.multicast = MulticastPublisher()
+
+        #legacy_broadcast also sends every event the old way, for students that cannot join the group; otherwise neither channel is opened
+        self.legacy_broadcast = legacy_broadcast
+        self.raw_broadcaster = RawBroadcaster() if legacy_broadcast else None #one raw socket, packets carry increasing sequence numbers
+
+        #always collected (a dict update per event), only exposed once serve_metrics is called
+        self.metrics = Metrics()
+        self.metrics_server = None
+
+        #persistent TCP connections used by broadcast_tcp (legacy_broadcast only)
+        self.connection_pool = StudentConnectionPool(on_sent=lambda seconds: self.metrics.observe("tutor_send_latency_seconds", seconds)) if legacy_broadcast else None
+        self.register_metrics()
+
+        #resets the student count file at start and publishes the seat limit
+        with open("student_count.txt", "w") as f:
+            f.write("0")
+        with open(SESSION_CAPACITY_FILE, "w") as f:
+            f.write(str(student_limit))
+            
+        #creates a fresh start of the attendance and session file
+        open(ATTENDANCE_LIST_FILE, 'w').close()
+        open(SESSION_STATUS_FILE, 'w').close()
+
+        #opens a new session in the database; check-ins are refused until one is open
+        if self.store:
+            self.session_id = self.store.start_session()
+
+        #reads only the journal records appended since the last read
+        self.journal_reader = AttendanceJournal.JournalReader(ATTENDANCE_LIST_FILE)
+
+        #starts the background threading
+        threading.Thread(target=self.poll_attendance_file, daemon=True).start()
+        threading.Thread(target=self.compact_attendance_journal, daemon=True).start()
+
+    #function that declares every metric the server reports
+    def register_metrics(self):
+        metrics = self.metrics
+        metrics.gauge("tutor_connected_students", "Students holding a seat.", lambda: len(self.students))
+        metrics.gauge("tutor_waiting_students", "Students in the journal beyond the seat limit.", lambda: max(len(self.journal_reader.roster) - len(self.students), 0))
+        metrics.gauge("tutor_threads", "Threads alive in the server process.", threading.active_count)
+        metrics.gauge("tutor_session_active", "1 while a session is running.", lambda: int(self.session_active))
+        metrics.counter("tutor_check_ins_total", "Students given a seat from the journal.")
+        metrics.counter("tutor_check_in_rejects_total", "Journal check-ins left without a seat, by reason.")
+        metrics.counter("tutor_broadcasts_total", "Broadcasts sent, by channel and message type.")
+        metrics.counter("tutor_broadcast_bytes_total", "Bytes sent by broadcasts, by channel and message type.")
+        metrics.histogram("tutor_timer_jitter_seconds", "How late the session timer woke up for a scheduled event.", JITTER_BUCKETS)
+        if self.connection_pool:
+            metrics.gauge("tutor_pooled_connections", "Open TCP connections to student listeners.", lambda: len(self.connection_pool.connections))
+            metrics.counter("tutor_broadcast_failures_total", "TCP broadcast sends skipped because the student was unreachable.")
+            metrics.histogram("tutor_send_latency_seconds", "Time of one TCP send to a student, including a reconnect.")
+
+    #function that exposes the metrics on a loopback HTTP port in the Prometheus text format
+    def serve_metrics(self, port):
+        self.metrics_server = MetricsServer(self.metrics, port, tracer=tracer)
+        self.metrics_server.start()
+
+    #function that registers callback(event, data) for every state change; callbacks run on server threads and must not block
+    def subscribe(self, callback):
+        self.subscribers.append(callback)
+
+    #function that hands one event to every subscriber
+    def publish(self, event, data=None):
+        for callback in self.subscribers:
+            try:
+                callback(event, data)
+            except Exception as e:
+                print(f"Event subscriber failed on {event}: {e}")
+
+    #function that adds the attendance to the attendance file
+    def poll_attendance_file(self):
+    
+        #looks at the attendance list file for any updates (inotify, or a 1 s stat check as fallback)
+        watcher = FileWatcher(ATTENDANCE_LIST_FILE, poll_interval=1.0)
+        while True:
+            watcher.wait()
+            
+            #applies the new tail of the journal to the tutor's GUI
+            with tracer.span("journal_read"):
+                reset, joined, left = self.journal_reader.read_new()
+            if reset or joined or left:
+                with tracer.span("roster_reload", joined=len(joined), left=len(left)):
+                    self.reload_attendance(reset, joined, left)
+
+    #applies new journal records to the tutor's GUI with the student's port number, student id and name (internal student information)
+    def reload_attendance(self, reset, joined, left):
+        new_ids = set() if reset else {sid for sid, name, port in joined} #a reset replays the whole journal, nothing in it is new
+        checked_in = rejected = 0
+        with self.lock:
+            if reset:
+                self.students.clear()
+                joined = [(sid, name, port) for sid, (name, port) in self.journal_reader.roster.items()]
+
+            for sid, port in left:
+                self.students.pop(sid, None)
+
+            #students beyond the limit are skipped, and move up when a seat frees
+            if left and len(self.journal_reader.roster) > len(self.students):
+                joined = [(sid, name, port) for sid, (name, port) in self.journal_reader.roster.items() if sid not in self.students]
+            for sid, name, port in joined:
+                if len(self.students) < self.student_limit:
+                    if not reset and sid not in self.students:
+                        checked_in += 1
+                    self.students[sid] = (name, port)
+                elif sid in new_ids:
+                    rejected += 1
+            count = len(self.students) #counts current students
+            self.publish(EVENT_ATTENDANCE, dict(self.students))
+            
+            #saves the current student count to a file (students will check this)
+            with open("student_count.txt", "w") as count_file:
+                count_file.write(str(count))
+        if checked_in:
+            self.metrics.inc("tutor_check_ins_total", checked_in)
+        if rejected:
+            self.metrics.inc("tutor_check_in_rejects_total", rejected, reason="session_full")
+
+    #function that drops leave records (and the joins they cancel) from the journal in the background
+    def compact_attendance_journal(self):
+        while True:
+            time.sleep(COMPACT_INTERVAL)
+            if self.journal_reader.dead_records >= COMPACT_THRESHOLD:
+                with tracer.span("journal_compact"):
+                    removed = AttendanceJournal.compact(ATTENDANCE_LIST_FILE)
+                print(f"Compacted attendance journal, dropped {removed} records.")
+
+    #function to start the session and begins the threading
+    def start_session(self):
+        self.session_active = True
+        self.session_end_time = time.time() + self.session_duration
+        self.paused_remaining = None
+        self.warning_sent = False
+
+        #activates the session and monitors when it would end
+        self.publish(EVENT_SESSION_STARTED)
+        threading.Thread(target=self.session_timer, daemon=True).start()
+
+    #function that returns (seconds remaining, paused)
+    def remaining_time(self):
+        paused_remaining = self.paused_remaining
+        if paused_remaining is not None:
+            return paused_remaining, True
+        return self.session_end_time - time.time(), False
+
+    #function that sends the deadline to every student (they count down on their own until the next one)
+    def broadcast_deadline(self):
+        remaining, paused = self.remaining_time()
+        state = "paused" if paused else "running"
+        message = f"deadline:{max(remaining, 0):.3f}:{state}"
+        self.write_session_status(f"DEADLINE:{max(remaining, 0):.3f}:{state.upper()}")
+        self.broadcast_event(message)
+        self.publish(EVENT_TIMER, (remaining, paused))
+
+    #function that pauses the session clock
+    def pause_session(self):
+        if self.session_active and self.paused_remaining is None:
+            self.paused_remaining = max(self.session_end_time - time.time(), 0)
+            self.broadcast_deadline()
+            self.timer_wakeup.set()
+
+    #function that resumes a paused session clock
+    def resume_session(self):
+        if self.session_active and self.paused_remaining is not None:
+            self.session_end_time = time.time() + self.paused_remaining
+            self.paused_remaining = None
+            self.broadcast_deadline()
+            self.timer_wakeup.set()
+
+    #function that adds time to the session
+    def extend_session(self, seconds):
+        if not self.session_active:
+            return
+        if self.paused_remaining is not None:
+            self.paused_remaining += seconds
+        else:
+            self.session_end_time += seconds
+        if self.remaining_time()[0] > 5 * 60:
+            self.warning_sent = False #the 5-minute warning is due again
+        self.broadcast_deadline()
+        self.timer_wakeup.set()
+
+    #function that times the session and warns students for 5 minutes remaining
+    #sleeps until the next event (warning, end, resync) instead of ticking every second
+    def session_timer(self):
+        self.broadcast_deadline()
+        next_resync = time.monotonic() + self.timer_resync_interval
+        previous_remaining = None  #the warning goes out when the clock crosses 5:00, never for a session that starts shorter
+        while self.session_active:
+            self.timer_wakeup.clear()
+            remaining, paused = self.remaining_time()
+            crossed_warning = previous_remaining is not None and previous_remaining > 5 * 60 >= remaining
+            previous_remaining = remaining
+
+            #when timer hits zero then ends the session
+            if not paused and remaining <= 0:
+                self.end_session()
+                break
+
+            #sends 5 min warning once
+            if not paused and crossed_warning and not self.warning_sent:
+                self.warning_sent = True
+                self.write_session_status("WARNING_5_MINUTES")
+                self.publish(EVENT_WARNING)
+
+                #broadcasts the 5 minute warning message to students
+                self.broadcast_event("popup:5min-warning")
+                print("Sent 5-minute warning to students!")
+
+            #occasional resync so students that drifted or missed an event catch up
+            now = time.monotonic()
+            if now >= next_resync:
+                self.broadcast_deadline()
+                next_resync = now + self.timer_resync_interval
+
+            #sleeps until the resync, the warning or the end, whichever is first
+            wait = next_resync - now
+            if not paused:
+                wait = min(wait, remaining - 5 * 60 if remaining > 5 * 60 and not self.warning_sent else remaining)
+            wait = max(wait, 0)
+            if not self.timer_wakeup.wait(wait):
+                self.metrics.observe("tutor_timer_jitter_seconds", max(time.monotonic() - now - wait, 0))
+
+    #function that ends the session and saves the attendance
+    def end_session(self):
+        self.session_active = False
+        self.paused_remaining = None
+        self.timer_wakeup.set()
+        self.write_session_status("SESSION_ENDED")
+        with self.lock:
+            self.publish(EVENT_ATTENDANCE, dict(self.students))
+
+        #saves the final attendance (the database keeps every session, the file only the last one)
+        if self.store:
+            present = [(sid, name, port) for sid, name, port, joined_at, left_at in self.store.end_session()]
+        else:
+            present = [(sid, name, port) for sid, (name, port) in self.students.items()]
+        with open("final_attendance_log.txt", "w") as f:
+            for sid, name, port in present:
+                f.write(f"Port: {port}, ID: {sid}, Name: {name}\n")
+
+        #broadcasts the session end message
+        self.broadcast_event("popup:session-ended")
+        print("Session ended, notified students.")
+        if self.connection_pool:
+            self.print_send_latency()
+            self.connection_pool.close_all()
+
+        #lets the tutor's GUI (or console) know the session has ended
+        self.publish(EVENT_SESSION_ENDED)
+
+    #functions that write the session status to a file
+    def write_session_status(self, status_message):
+        with open(SESSION_STATUS_FILE, 'w') as f:
+            f.write(status_message)
+
+    #function that sends one session-wide event: a single multicast datagram, whatever the number of students
+    def broadcast_event(self, message):
+        with tracer.span("broadcast_multicast"):
+            sent = self.multicast.publish(message)
+        if sent:
+            message_type = message_type_of(message)
+            self.metrics.inc("tutor_broadcasts_total", channel="multicast", type=message_type)
+            self.metrics.inc("tutor_broadcast_bytes_total", sent, channel="multicast", type=message_type)
+        if self.legacy_broadcast:
+            self.broadcast_raw_socket(message.encode())
+            self.broadcast_tcp(message)
+
+    #ICMP raw broadcast through the session's long-lived raw socket
+    def broadcast_raw_socket(self, *payloads):
+        with tracer.span("broadcast_icmp", packets=len(payloads)):
+            sent = self.raw_broadcaster.send_batch(payloads)
+        if sent:
+            for payload in payloads:
+                message_type = message_type_of(payload.decode(errors="ignore"))
+                self.metrics.inc("tutor_broadcasts_total", channel="icmp", type=message_type)
+                self.metrics.inc("tutor_broadcast_bytes_total", len(payload), channel="icmp", type=message_type)
+
+    #TCP broadcast over the pooled connections, one newline-terminated message per line
+    def broadcast_tcp(self, message):
+        data = (message + "\n").encode()
+        with self.lock:
+            ports = set()
+            for sid, (name, port) in self.students.items():
+                try:
+                    ports.add(int(port))
+                except ValueError:
+                    continue
+        with tracer.span("broadcast_tcp", students=len(ports)):
+            self.connection_pool.evict_stale(ports)
+            delivered = 0
+            for student_port in ports:
+                delivered += self.connection_pool.send(student_port, data)  #skips unreachable students
+        message_type = message_type_of(message)
+        self.metrics.inc("tutor_broadcasts_total", channel="tcp", type=message_type)
+        self.metrics.inc("tutor_broadcast_bytes_total", len(data) * delivered, channel="tcp", type=message_type)
+        if delivered < len(ports):
+            self.metrics.inc("tutor_broadcast_failures_total", len(ports) - delivered)
+
+    #function that prints the per-student TCP send latency
+    def print_send_latency(self):
+        for port, (last, average, worst) in sorted(self.connection_pool.latency_report().items()):
+            print(f"[TCP] port {port}: last {last:.2f} ms, avg {average:.2f} ms, max {worst:.2f} ms")
+
+#function that returns the metric label of a broadcast ("deadline", "popup:5min-warning", ...)
+def message_type_of(message):
+    return "deadline" if message.startswith("deadline:") else message
+
+#function that runs a session without a window: starts it at once and ends it on time, on SIGTERM or on Ctrl+C
+def run_headless(server):
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda signum, frame: stop.set())
+    server.subscribe(print_event)
+    server.subscribe(lambda event, data: stop.set() if event == EVENT_SESSION_ENDED else None)
+    server.start_session()
+    try:
+        while not stop.wait(1.0):
+            pass
+    except KeyboardInterrupt:
+        pass
+    if server.session_active:
+        server.end_session()
+    server.multicast.close(linger=LINGER) #students that missed the session end can still NACK it
+
+#main function to run and compile the code
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Tutor server (raw sockets)")
+    parser.add_argument("--db", metavar="PATH", help="keep the roster and attendance history in this SQLite database")
+    parser.add_argument("--capacity", type=int, default=30, help="students allowed in a session")
+    parser.add_argument("--headless", action="store_true", help="run the session as a daemon without a window (tkinter is never imported)")
+    parser.add_argument("--legacy-broadcast", action="store_true", help="also send session events over ICMP and per-student TCP (students without multicast)")
+    parser.add_argument("--metrics-port", type=int, default=None, help="serve Prometheus metrics on 127.0.0.1 at this port")
+    args = parser.parse_args()
+    install_trace_signals() #SIGUSR1 starts/stops profiling, SIGUSR2 dumps the trace
+
+    server = TutorServer(store=AttendanceStore(args.db) if args.db else None, student_limit=args.capacity, legacy_broadcast=args.legacy_broadcast)
+    if args.metrics_port:
+        server.serve_metrics(args.metrics_port)
+    if args.headless:
+        run_headless(server)
+    else:
+        from TutorGUI import TutorGUI #only the windowed mode loads tkinter
+        gui = TutorGUI(server)  #subscribes to the server's events
+        gui.root.mainloop()